@@ -2,4 +2,9 @@ from django.apps import AppConfig
 
 class Gene2PhenotypeAppConfig(AppConfig):
     default_auto_field = 'django.db.models.AutoField'
-    name = 'gene2phenotype_app'
\ No newline at end of file
+    name = 'gene2phenotype_app'
+
+    def ready(self):
+        # Connect the signals that clear the gene names and catalogues caches
+        from . import gene_resolver  # noqa: F401
+        from . import catalogues  # noqa: F401
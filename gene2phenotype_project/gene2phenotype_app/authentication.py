@@ -1,15 +1,139 @@
+import copy
+import threading
+import time
+
 from rest_framework.exceptions import AuthenticationFailed
 from rest_framework_simplejwt.authentication import JWTAuthentication
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken, UntypedToken
 from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
 from django.conf import settings
+from django.utils import timezone
+
+
+class BlacklistCache:
+    """
+    Process-local cache of the blacklisted refresh tokens (jti -> expiry date).
+    The new blacklisted tokens are fetched at most once every AUTH_BLACKLIST_CACHE_SECONDS,
+    the tokens blacklisted by this process (logout, rotation) are added straight away.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        self.tokens = {}
+        self.last_id = 0
+        self.refreshed_at = None
+
+    def refresh(self):
+        # Only fetch the tokens blacklisted since the last refresh
+        blacklisted_tokens = BlacklistedToken.objects.filter(
+            id__gt=self.last_id
+        ).values_list("id", "token__jti", "token__expires_at")
+
+        for blacklist_id, jti, expires_at in blacklisted_tokens:
+            self.tokens[jti] = expires_at
+            self.last_id = max(self.last_id, blacklist_id)
+
+        # Expired tokens cannot be used anyway
+        now = timezone.now()
+        self.tokens = {
+            jti: expires_at
+            for jti, expires_at in self.tokens.items()
+            if expires_at is None or expires_at > now
+        }
+        self.refreshed_at = time.monotonic()
+
+    def contains(self, jti):
+        with self.lock:
+            if (
+                self.refreshed_at is None
+                or time.monotonic() - self.refreshed_at
+                >= settings.AUTH_BLACKLIST_CACHE_SECONDS
+            ):
+                self.refresh()
+
+            return jti in self.tokens
+
+    def add(self, jti, expires_at=None):
+        with self.lock:
+            self.tokens[jti] = expires_at
+
+
+class UserCache:
+    """
+    Process-local cache of the authenticated users, by user id and token issue date (iat).
+    A user is kept for AUTH_USER_CACHE_SECONDS.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = {}
+
+    def clear(self):
+        with self.lock:
+            self.users = {}
+
+    def get(self, key):
+        with self.lock:
+            cached = self.users.get(key)
+
+            if cached is None:
+                return None
+
+            user, cached_at = cached
+            if time.monotonic() - cached_at >= settings.AUTH_USER_CACHE_SECONDS:
+                del self.users[key]
+                return None
+
+            # Each request gets its own copy of the user
+            return copy.copy(user)
+
+    def set(self, key, user):
+        with self.lock:
+            # Remove the expired users
+            now = time.monotonic()
+            self.users = {
+                cached_key: cached
+                for cached_key, cached in self.users.items()
+                if now - cached[1] < settings.AUTH_USER_CACHE_SECONDS
+            }
+            self.users[key] = (copy.copy(user), now)
+
+    def remove_user(self, user_id):
+        with self.lock:
+            self.users = {
+                key: cached for key, cached in self.users.items() if key[0] != user_id
+            }
+
+
+blacklist_cache = BlacklistCache()
+user_cache = UserCache()
+
+
+def add_blacklisted_token(token):
+    """
+    Add a refresh token that has just been blacklisted (logout or rotation) to the cache.
+    The cached users of the token owner are removed.
+    """
+    blacklist_cache.add(token["jti"], datetime_from_epoch(token["exp"]))
+    user_cache.remove_user(token.get(api_settings.USER_ID_CLAIM))
+
+
+def clear_authentication_cache():
+    with blacklist_cache.lock:
+        blacklist_cache.clear()
+    user_cache.clear()
 
 
 class CustomAuthentication(JWTAuthentication):
 
     def authenticate(self, request):
         header = self.get_header(request)
-        
+
         if header is None:
             # getting authentication details from cookies
             refresh_token = request.COOKIES.get(settings.SIMPLE_JWT['REFRESH_COOKIE'])
@@ -20,7 +144,7 @@ class CustomAuthentication(JWTAuthentication):
         else:
             #just giving the option from headers but no longer being implemented
             raw_token = self.get_raw_token(header)
-        
+
         if not raw_token:
             return None
 
@@ -30,14 +154,39 @@ class CustomAuthentication(JWTAuthentication):
             raise AuthenticationFailed(str(e))
         return self.get_user(validated_token), validated_token
 
+    def get_user(self, validated_token):
+        """
+        Returns the user of the token.
+        The user is cached for AUTH_USER_CACHE_SECONDS (0 disables the cache).
+        """
+        if not settings.AUTH_USER_CACHE_SECONDS:
+            return super().get_user(validated_token)
+
+        key = (validated_token.get(api_settings.USER_ID_CLAIM), validated_token.get("iat"))
+        user = user_cache.get(key)
+
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(key, user)
+
+        return user
 
     @staticmethod
     def is_token_blacklisted(token_string):
+        """
+        Check if the refresh token has been blacklisted.
+        The blacklisted tokens are cached for AUTH_BLACKLIST_CACHE_SECONDS (0 disables the cache).
+        """
         try:
-            token = RefreshToken(token_string)
-            if BlacklistedToken.objects.filter(token__jti=token['jti']).exists():
-                return True
+            if not settings.AUTH_BLACKLIST_CACHE_SECONDS:
+                token = RefreshToken(token_string)
+                return BlacklistedToken.objects.filter(token__jti=token['jti']).exists()
+
+            # RefreshToken() queries the blacklist, UntypedToken() only validates the token
+            token = UntypedToken(token_string)
+            if token.get(api_settings.TOKEN_TYPE_CLAIM) != RefreshToken.token_type:
+                raise AuthenticationFailed("Token has wrong type")
         except Exception as e:
             raise AuthenticationFailed(f"Token blacklist check failed: {str(e)}")
 
-        return False
\ No newline at end of file
+        return blacklist_cache.contains(token['jti'])
@@ -0,0 +1,132 @@
+import hashlib
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .local_cache import LocalCache
+from .models import Attrib, CVMolecularMechanism, OntologyTerm
+from .renderers import FastJSONRenderer
+
+
+def build_molecular_mechanisms():
+    """
+    Returns the molecular mechanisms terms by type and subtype (if applicable).
+    Returns a dictionary where the key is the type the value is a list.
+    """
+    queryset = (
+        CVMolecularMechanism.objects.all()
+        .values("type", "subtype", "value", "description")
+        .order_by("type", "value")
+    )
+    result = {}
+    for mechanism in queryset:
+        mechanismtype = mechanism["type"]
+        subtype = mechanism["subtype"]
+        value = mechanism["value"]
+        description = mechanism["description"]
+
+        if mechanismtype not in result:
+            result[mechanismtype] = {}
+            # evidence has subtypes
+            if mechanismtype == "evidence":
+                result[mechanismtype][subtype] = [{value: description}]
+            else:
+                result[mechanismtype] = [{value: description}]
+        else:
+            if mechanismtype == "evidence":
+                if subtype not in result[mechanismtype]:
+                    result[mechanismtype][subtype] = [{value: description}]
+                else:
+                    result[mechanismtype][subtype].append({value: description})
+            else:
+                result[mechanismtype].append({value: description})
+
+    return result
+
+
+def build_variant_types():
+    """
+    Returns all variant types by group.
+    Returns a dictionary where the key is the variant group and the value is a list of terms.
+    """
+    queryset = (
+        OntologyTerm.objects.filter(
+            group_type__value="variant_type",
+            group_type__type__code="ontology_term_group",
+        )
+        .values("term", "accession")
+        .order_by("id")
+    )
+
+    list_nmd = []
+    list_splice = []
+    list_regulatory = []
+    list_protein = []
+    list = []
+
+    for obj in queryset:
+        term = obj["term"]
+        variant_type = {"term": term, "accession": obj["accession"]}
+        if "NMD" in term:
+            list_nmd.append(variant_type)
+        elif "splice_" in term:
+            list_splice.append(variant_type)
+        elif "regulatory" in term or "UTR" in term:
+            list_regulatory.append(variant_type)
+        elif "missense" in term or "frame" in term or "start" in term or "stop" in term:
+            list_protein.append(variant_type)
+        else:
+            list.append(variant_type)
+
+    return {
+        "NMD_variants": list_nmd,
+        "splice_variants": list_splice,
+        "regulatory_variants": list_regulatory,
+        "protein_changing_variants": list_protein,
+        "other_variants": list,
+    }
+
+
+class Catalogue(LocalCache):
+    """
+    Static list of terms (e.g. molecular mechanisms) used by the curation forms.
+
+    The catalogue is built and encoded as JSON once, the JSON and its ETag are kept
+    in memory for CATALOGUE_CACHE_SECONDS (see local_cache.py). All the processes
+    build the catalogue again when the data used by the catalogue is saved or deleted.
+    If CATALOGUE_CACHE_SECONDS is 0 the catalogue is built by each request.
+    """
+
+    def __init__(self, name, build):
+        self.build = build
+        super().__init__(name, self.encode, "CATALOGUE_CACHE_SECONDS")
+
+    def encode(self):
+        """
+        Returns the JSON (bytes) and the ETag of the catalogue.
+        """
+        content = FastJSONRenderer().render(self.build())
+        etag = f'"{hashlib.md5(content).hexdigest()}"'
+        return content, etag
+
+
+molecular_mechanisms = Catalogue("molecular_mechanisms", build_molecular_mechanisms)
+variant_types = Catalogue("variant_types", build_variant_types)
+
+
+@receiver(post_save, sender=CVMolecularMechanism)
+@receiver(post_delete, sender=CVMolecularMechanism)
+def invalidate_molecular_mechanisms(sender, **kwargs):
+    molecular_mechanisms.invalidate()
+
+
+@receiver(post_save, sender=OntologyTerm)
+@receiver(post_delete, sender=OntologyTerm)
+def invalidate_variant_types(sender, **kwargs):
+    # Only the variant types are in the catalogue
+    if Attrib.objects.filter(
+        id=kwargs["instance"].group_type_id,
+        value="variant_type",
+        type__code="ontology_term_group",
+    ).exists():
+        variant_types.invalidate()
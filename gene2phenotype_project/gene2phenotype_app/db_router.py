@@ -0,0 +1,105 @@
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+"""
+Database router to send the public reads to a read replica.
+
+The router sends the reads to the replica (setting REPLICA_DATABASE) only while a request
+is marked to use the replica (see ReplicaRoutingMiddleware), all the other reads and all
+the writes go to the 'default' database.
+"""
+
+# Set by ReplicaRoutingMiddleware for the requests that can read from the replica
+use_replica = ContextVar("use_replica", default=False)
+
+_lag_lock = threading.Lock()
+# Last replica lag check: (time of the check, lag in seconds)
+_last_lag_check = (None, None)
+
+
+def get_lag_from_replica_status(replica_status):
+    """
+    Returns the lag in seconds from a row of 'SHOW REPLICA STATUS' (dictionary).
+    MySQL 8.0.22+ returns the column 'Seconds_Behind_Source', MariaDB and the older
+    versions of MySQL return 'Seconds_Behind_Master'.
+    """
+    for column in ("Seconds_Behind_Source", "Seconds_Behind_Master"):
+        if column in replica_status:
+            return replica_status[column]
+
+    logger.warning(
+        "Cannot check the replica lag: the replica status has no column "
+        "'Seconds_Behind_Source' or 'Seconds_Behind_Master'"
+    )
+    return None
+
+
+def get_replica_lag():
+    """
+    Returns the replication lag of the replica in seconds.
+    Returns None if the replica is not replicating or the lag cannot be checked.
+    The lag is checked at most once every REPLICA_LAG_CHECK_INTERVAL seconds.
+    """
+    global _last_lag_check
+
+    with _lag_lock:
+        checked_at, lag = _last_lag_check
+        if (
+            checked_at is not None
+            and time.monotonic() - checked_at < settings.REPLICA_LAG_CHECK_INTERVAL
+        ):
+            return lag
+
+        connection = connections[settings.REPLICA_DATABASE]
+
+        if connection.vendor != "mysql":
+            # Test databases (SQLite) do not replicate
+            lag = 0
+        else:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute("SHOW REPLICA STATUS")
+                    row = cursor.fetchone()
+                    columns = [column[0] for column in cursor.description or []]
+            except Exception as e:
+                logger.warning(f"Cannot check the replica lag: {e}")
+                row = None
+
+            lag = None
+            if row:
+                lag = get_lag_from_replica_status(dict(zip(columns, row)))
+
+        _last_lag_check = (time.monotonic(), lag)
+
+        return lag
+
+
+def replica_is_available():
+    """
+    Returns True if the replica lag is below REPLICA_MAX_LAG.
+    """
+    lag = get_replica_lag()
+
+    return lag is not None and lag <= settings.REPLICA_MAX_LAG
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if use_replica.get():
+            return settings.REPLICA_DATABASE
+
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica has the same data as the default database
+        return True
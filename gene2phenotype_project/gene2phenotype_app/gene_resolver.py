@@ -0,0 +1,112 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .local_cache import LocalCache
+from .models import Locus, LocusAttrib, LocusIdentifier
+
+
+class GeneResolver:
+    """
+    Resolves a gene name (gene symbol, gene synonym or HGNC ID) to the locus id.
+
+    The dictionaries of the gene names (key: name in lower case, value: locus id) are
+    loaded with one query per type of name and kept in memory for GENE_RESOLVER_CACHE_SECONDS
+    (see local_cache.py). All the processes load them again when a Locus, LocusAttrib or
+    LocusIdentifier is saved or deleted, or when the command 'clear_caches' is run after
+    loading genes in bulk. If GENE_RESOLVER_CACHE_SECONDS is 0 each name is fetched from
+    the database.
+    """
+
+    SYMBOL = "symbol"
+    SYNONYM = "synonym"
+    HGNC = "hgnc"
+
+    # Fields of the name and the locus id for each type of name
+    NAME_FIELDS = {
+        SYMBOL: ("name", "id"),
+        SYNONYM: ("value", "locus_id"),
+        HGNC: ("identifier", "locus_id"),
+    }
+
+    def __init__(self):
+        self.names = LocalCache(
+            "gene_names", self.load, "GENE_RESOLVER_CACHE_SECONDS"
+        )
+
+    def invalidate(self):
+        self.names.invalidate()
+
+    def clear(self):
+        self.names.clear()
+
+    @staticmethod
+    def get_queryset(name_type):
+        if name_type == GeneResolver.SYMBOL:
+            return Locus.objects.filter(
+                type__type__code="locus_type", type__value="gene"
+            )
+        elif name_type == GeneResolver.SYNONYM:
+            return LocusAttrib.objects.filter(
+                attrib_type__code="gene_synonym", is_deleted=0
+            )
+        else:
+            return LocusIdentifier.objects.filter(
+                source__name="HGNC", identifier__startswith="HGNC:"
+            )
+
+    def load(self):
+        names = {}
+        for name_type, fields in self.NAME_FIELDS.items():
+            names[name_type] = {}
+            # The same synonym can be linked to several genes, keep the first one
+            for name, locus_id in (
+                self.get_queryset(name_type).order_by("id").values_list(*fields)
+            ):
+                names[name_type].setdefault(name.lower(), locus_id)
+
+        return names
+
+    def get_locus_id(self, name, name_types=(SYMBOL, SYNONYM, HGNC)):
+        """
+        Returns the locus id of the gene name or None if the name is not found.
+        The types of names are checked in order: by default gene symbol, gene synonym
+        and HGNC ID.
+        """
+        if not name:
+            return None
+
+        if settings.GENE_RESOLVER_CACHE_SECONDS == 0:
+            for name_type in name_types:
+                name_field, locus_field = self.NAME_FIELDS[name_type]
+                locus_id = (
+                    self.get_queryset(name_type)
+                    .filter(**{name_field: name})
+                    .order_by("id")
+                    .values_list(locus_field, flat=True)
+                    .first()
+                )
+                if locus_id is not None:
+                    return locus_id
+            return None
+
+        names = self.names.get()
+        for name_type in name_types:
+            locus_id = names[name_type].get(name.lower())
+            if locus_id is not None:
+                return locus_id
+
+        return None
+
+
+gene_resolver = GeneResolver()
+
+
+@receiver(post_save, sender=Locus)
+@receiver(post_delete, sender=Locus)
+@receiver(post_save, sender=LocusAttrib)
+@receiver(post_delete, sender=LocusAttrib)
+@receiver(post_save, sender=LocusIdentifier)
+@receiver(post_delete, sender=LocusIdentifier)
+def invalidate_gene_resolver(sender, **kwargs):
+    gene_resolver.invalidate()
@@ -0,0 +1,102 @@
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+"""
+In-memory caches of data that rarely changes (e.g. the gene names).
+
+Each process keeps its own copy of the data. The version of the data is stored in
+Django's cache (setting CACHES), which is shared by all the processes: the web server
+workers and the commands. When the data changes the version is replaced and each
+process loads the data again the next time it is used. To avoid reading the shared
+cache on each call (the default cache is a database table), each process reads the
+version at most once every LOCAL_CACHE_VERSION_CHECK_SECONDS seconds.
+
+The models send a signal when a row is saved or deleted, bulk inserts and updates
+(bulk_create(), update()) do not send signals. The commands or scripts that load
+data in bulk have to run the command 'clear_caches'.
+"""
+
+# Caches indexed by name
+LOCAL_CACHES = {}
+
+
+class LocalCache:
+    """
+    In-memory cache of the value returned by 'load'.
+
+    The value is kept for the number of seconds set in the setting 'timeout_setting'
+    or until the shared version changes (see invalidate()). If the setting is 0 the
+    value is loaded each time.
+    A change of the version made by another process is seen after at most
+    LOCAL_CACHE_VERSION_CHECK_SECONDS seconds.
+    """
+
+    def __init__(self, name, load, timeout_setting):
+        self.name = name
+        self.load = load
+        self.timeout_setting = timeout_setting
+        self.version_key = f"local_cache_version:{name}"
+        self.lock = threading.Lock()
+        # (value, version, time)
+        self.cached = None
+        # Last read of the shared version: (time of the read, version)
+        self.version_check = (None, None)
+
+        LOCAL_CACHES[name] = self
+
+    def invalidate(self):
+        """
+        Replace the shared version, all the processes load the value again.
+        """
+        cache.set(self.version_key, uuid.uuid4().hex, timeout=None)
+        # This process sees the new version in the next call
+        self.clear()
+
+    def clear(self):
+        """
+        Remove the value from the memory of this process.
+        """
+        with self.lock:
+            self.cached = None
+            self.version_check = (None, None)
+
+    def get_version(self):
+        """
+        Returns the shared version.
+        The version is read from the shared cache at most once every
+        LOCAL_CACHE_VERSION_CHECK_SECONDS seconds.
+        """
+        checked_at, version = self.version_check
+        if (
+            checked_at is None
+            or time.monotonic() - checked_at
+            >= settings.LOCAL_CACHE_VERSION_CHECK_SECONDS
+        ):
+            version = cache.get(self.version_key)
+            self.version_check = (time.monotonic(), version)
+
+        return version
+
+    def get(self):
+        timeout = getattr(settings, self.timeout_setting)
+        if timeout == 0:
+            return self.load()
+
+        # The version is read before loading the value, a change made while
+        # the value is loaded is seen by the next call
+        version = self.get_version()
+
+        with self.lock:
+            if (
+                self.cached is None
+                or self.cached[1] != version
+                or time.monotonic() - self.cached[2] >= timeout
+            ):
+                self.cached = (self.load(), version, time.monotonic())
+
+            return self.cached[0]
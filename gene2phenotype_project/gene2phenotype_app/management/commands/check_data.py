@@ -1,20 +1,27 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from concurrent.futures import ThreadPoolExecutor
+import xml.etree.ElementTree as ET
+import json
 import logging
+import time
 
-from .datachecks import (
-    check_publication_families,
-    check_ar_constraint,
-    check_ar_publications,
-    mutation_consequence_constraint,
-    check_mined_publication_status,
-    check_cross_references,
-    check_disease_name,
-    get_similar_records,
-)
+from .datachecks import DataCheckSnapshot, get_checks
 
 logger = logging.getLogger(__name__)
 
 
+"""
+Command to run the data checks.
+The checks are registered in datachecks/Registry.py and they can run in parallel (--jobs),
+each thread uses its own database connection.
+
+How to run the command:
+python manage.py check_data [--include_warnings] [--only <check names>] [--skip <check names>]
+                            [--jobs <number of threads>] [--json_report <file>] [--junit_report <file>]
+"""
+
+
 class Command(BaseCommand):
     help = "Check for issues in the data"
 
@@ -25,49 +32,213 @@ class Command(BaseCommand):
             action='store_true',
             help="Include non-critical data checks",
         )
+        parser.add_argument(
+            "--only",
+            required=False,
+            nargs="+",
+            help="Names of the data checks to run (critical or non-critical)",
+        )
+        parser.add_argument(
+            "--skip",
+            required=False,
+            nargs="+",
+            help="Names of the data checks to skip",
+        )
+        parser.add_argument(
+            "--jobs",
+            required=False,
+            type=int,
+            default=1,
+            help="Number of data checks to run in parallel (default: 1)",
+        )
+        parser.add_argument(
+            "--json_report",
+            required=False,
+            type=str,
+            help="Output file to write the results in JSON format",
+        )
+        parser.add_argument(
+            "--junit_report",
+            required=False,
+            type=str,
+            help="Output file to write the results in JUnit XML format",
+        )
 
     def handle(self, *args, **options):
         include_warnings = options["include_warnings"]
+        jobs = options["jobs"]
 
-        print("Running data checks...")
-
-        publication_families_errors = check_publication_families()
-        for error in publication_families_errors:
-            logger.error(error)
+        try:
+            checks = get_checks(include_warnings, options["only"], options["skip"])
+        except ValueError as e:
+            raise CommandError(str(e))
 
-        allelic_requirement_errors = check_ar_constraint()
-        for error in allelic_requirement_errors:
-            logger.error(error)
+        if jobs < 1:
+            raise CommandError(f"Invalid number of jobs {jobs}")
 
-        allelic_requirement_errors_2 = check_ar_publications()
-        for error in allelic_requirement_errors_2:
-            logger.error(error)
-
-        mc_errors = mutation_consequence_constraint()
-        for error in mc_errors:
-            logger.error(error)
-
-        mined_publication_status = check_mined_publication_status()
-        for error in mined_publication_status:
-            logger.error(error)
-
-        # Check if the locus is in the disease name
-        disease_name_errors = check_disease_name()
-        for error in disease_name_errors:
-            logger.error(error)
+        # Data shared by the checks - each table is only queried once
+        snapshot = DataCheckSnapshot()
+        if any(check["uses_snapshot"] for check in checks):
+            snapshot.load()
 
+        print("Running data checks...")
+        start = time.perf_counter()
+
+        if jobs > 1:
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                results = list(
+                    executor.map(
+                        lambda check: self.run_check_in_thread(check, snapshot),
+                        checks,
+                    )
+                )
+        else:
+            results = [self.run_check(check, snapshot) for check in checks]
+
+        total_duration = time.perf_counter() - start
         print("Running data checks... done")
 
-        ### The following checks are non critical: level = WARNING ###
-        if include_warnings:
-            print("\nRunning non-critical data checks...")
-            # Check for similar records
-            similar_records = get_similar_records()
-            for error in similar_records:
-                logger.warning(error)
-
-            # Run the disease cross references check
-            disease_cr_errors = check_cross_references()
-            for error in disease_cr_errors:
-                logger.warning(error)
-            print("Running non-critical data checks... done")
+        # The issues are logged in the order the checks were registered
+        for result in results:
+            if result["exception"]:
+                logger.error(
+                    f"Data check '{result['name']}' failed: {result['exception']}"
+                )
+            for error in result["errors"]:
+                logger.log(result["level"], error)
+
+        print("\nTiming report:")
+        for result in results:
+            print(
+                f"  {result['name']}: {len(result['errors'])} issue(s) in {result['duration']:.2f}s"
+            )
+        print(f"  total: {total_duration:.2f}s")
+
+        if options["json_report"]:
+            self.write_json_report(options["json_report"], results, total_duration)
+
+        if options["junit_report"]:
+            self.write_junit_report(options["junit_report"], results, total_duration)
+
+        # The reports are written before exiting with an error
+        failed_checks = [result["name"] for result in results if result["exception"]]
+        if failed_checks:
+            raise CommandError(
+                f"Data check(s) failed to run: {', '.join(failed_checks)}"
+            )
+
+    def run_check(self, check, snapshot):
+        """
+        Run a data check and return the issues found and the time it took to run.
+        """
+        errors = []
+        exception = None
+
+        start = time.perf_counter()
+        try:
+            if check["uses_snapshot"]:
+                errors = check["function"](snapshot=snapshot)
+            else:
+                errors = check["function"]()
+        except Exception as e:
+            exception = str(e)
+        duration = time.perf_counter() - start
+
+        if exception:
+            status = "error"
+        elif not errors:
+            status = "passed"
+        elif check["level"] >= logging.ERROR:
+            status = "failed"
+        else:
+            status = "warning"
+
+        return {
+            "name": check["name"],
+            "level": check["level"],
+            "status": status,
+            "errors": errors,
+            "exception": exception,
+            "duration": duration,
+        }
+
+    def run_check_in_thread(self, check, snapshot):
+        """
+        Run a data check in a worker thread.
+        Django opens one database connection per thread, the connection is closed
+        when the check finishes.
+        """
+        try:
+            return self.run_check(check, snapshot)
+        finally:
+            connections.close_all()
+
+    def write_json_report(self, output_file, results, total_duration):
+        report = {
+            "total_duration": round(total_duration, 3),
+            "checks": [
+                {
+                    "name": result["name"],
+                    "level": logging.getLevelName(result["level"]),
+                    "status": result["status"],
+                    "issues": len(result["errors"]),
+                    "duration": round(result["duration"], 3),
+                    "exception": result["exception"],
+                    "errors": [
+                        {"id": error.id, "message": error.msg, "hint": error.hint}
+                        for error in result["errors"]
+                    ],
+                }
+                for result in results
+            ],
+        }
+
+        with open(output_file, "w") as wr:
+            json.dump(report, wr, indent=2)
+
+    def write_junit_report(self, output_file, results, total_duration):
+        """
+        Write the results in JUnit XML format.
+        Critical checks with issues are reported as failures, the issues found
+        by non-critical checks are reported in 'system-out'.
+        """
+        testsuite = ET.Element(
+            "testsuite",
+            name="check_data",
+            tests=str(len(results)),
+            failures=str(sum(1 for r in results if r["status"] == "failed")),
+            errors=str(sum(1 for r in results if r["status"] == "error")),
+            skipped="0",
+            time=f"{total_duration:.3f}",
+        )
+
+        for result in results:
+            testcase = ET.SubElement(
+                testsuite,
+                "testcase",
+                classname="gene2phenotype_app.check_data",
+                name=result["name"],
+                time=f"{result['duration']:.3f}",
+            )
+            messages = "\n".join(error.msg for error in result["errors"])
+
+            if result["status"] == "error":
+                error_element = ET.SubElement(
+                    testcase, "error", message=result["exception"]
+                )
+                error_element.text = result["exception"]
+            elif result["status"] == "failed":
+                failure = ET.SubElement(
+                    testcase,
+                    "failure",
+                    message=f"{len(result['errors'])} issue(s)",
+                    type=logging.getLevelName(result["level"]),
+                )
+                failure.text = messages
+            elif result["status"] == "warning":
+                system_out = ET.SubElement(testcase, "system-out")
+                system_out.text = messages
+
+        tree = ET.ElementTree(testsuite)
+        ET.indent(tree)
+        tree.write(output_file, encoding="utf-8", xml_declaration=True)
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from gene2phenotype_app.local_cache import LOCAL_CACHES
+
+
+"""
+Command to clear the in-memory caches of all the processes (see local_cache.py).
+It has to run after loading data in bulk (e.g. genes), the bulk inserts and updates
+do not clear the caches.
+
+How to run the command:
+python manage.py clear_caches [--only <cache names>]
+"""
+
+
+class Command(BaseCommand):
+    help = "Clear the in-memory caches of all the processes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--only",
+            required=False,
+            nargs="+",
+            help="Names of the caches to clear (default: all)",
+        )
+
+    def handle(self, *args, **options):
+        names = options["only"] or list(LOCAL_CACHES)
+
+        unknown_caches = [name for name in names if name not in LOCAL_CACHES]
+        if unknown_caches:
+            raise CommandError(
+                f"Unknown cache(s): {', '.join(unknown_caches)}. "
+                f"Available caches are: {', '.join(LOCAL_CACHES)}"
+            )
+
+        for name in names:
+            LOCAL_CACHES[name].invalidate()
+
+        self.stdout.write(f"Cleared cache(s): {', '.join(names)}")
@@ -1,20 +1,19 @@
-from gene2phenotype_app.models import LocusGenotypeDisease, LGDPanel, LGDPublication
+from gene2phenotype_app.models import LocusGenotypeDisease
 from django.core.checks import Error
 from django.db.models import Q, F
+import logging
 
+from .Snapshot import DataCheckSnapshot
+from .Registry import register_check
 
-# helper function to skip checks for anything in panel Demo
-def should_process(obj):
-    lgd_panels = LGDPanel.objects.filter(lgd_id=obj, is_deleted=0).annotate(
-        panel_name=F("panel__name")
-    )
 
-    for lgd_panel in lgd_panels:
-        return lgd_panel.panel_name != "Demo"
+@register_check(level=logging.ERROR, uses_snapshot=True)
+def check_ar_constraint(snapshot=None):
+    errors = []
 
+    if snapshot is None:
+        snapshot = DataCheckSnapshot()
 
-def check_ar_constraint():
-    errors = []
     locus_genotype_check = (
         LocusGenotypeDisease.objects.filter(is_deleted=0)
         .select_related("genotype", "locus")
@@ -26,7 +25,7 @@ def check_ar_constraint():
     )
 
     for obj in locus_genotype_check:
-        if not should_process(obj.id):
+        if not snapshot.should_process(obj.id):
             continue
         if "autosomal" in obj.genotype_value.lower() and not (
             1 <= int(obj.locus_sequence) <= 22
@@ -80,8 +79,13 @@ def check_ar_constraint():
     return errors
 
 
-def check_ar_publications():
+@register_check(level=logging.ERROR, uses_snapshot=True)
+def check_ar_publications(snapshot=None):
     errors = []
+
+    if snapshot is None:
+        snapshot = DataCheckSnapshot()
+
     locus_genotype_check = (
         LocusGenotypeDisease.objects.filter(
             Q(confidence__value="definitive") | Q(confidence__value="strong"),
@@ -93,16 +97,13 @@ def check_ar_publications():
             confidence_value=F("confidence__value"),
             g2p_id=F("stable_id__stable_id"),
         )
-        .prefetch_related()
     )
 
     for obj in locus_genotype_check:
-        if not should_process(obj.obj_id):
+        if not snapshot.should_process(obj.obj_id):
             continue
 
-        lgd_publications = LGDPublication.objects.filter(lgd=obj, is_deleted=0)
-
-        number_publications = len(lgd_publications)
+        number_publications = snapshot.lgd_publication_counts.get(obj.obj_id, 0)
         if number_publications < 2:
             errors.append(
                 Error(
@@ -1,6 +1,6 @@
 from django.core.checks import Error
 from django.db.models import F
-from difflib import SequenceMatcher
+import logging
 import re
 
 from gene2phenotype_app.models import DiseaseOntologyTerm, LocusGenotypeDisease
@@ -11,56 +11,86 @@ from gene2phenotype_app.utils import (
     check_synonyms_disease,
 )
 
+from .Registry import register_check
+from .Similarity import similarity_below
 
-def check_cross_references():
-    errors = []
 
-    # Select disease with ontology terms that are linked to visible panels
-    disease_ontology_list = (
-        DiseaseOntologyTerm.objects.select_related("disease", "ontology_term")
-        .annotate(
-            disease_name=F("disease__name"),
-            term=F("ontology_term__term"),
-            accession=F("ontology_term__accession"),
-        )
-        .filter(
-            disease__id__in=LocusGenotypeDisease.objects.filter(
-                lgdpanel__panel__is_visible=1, is_deleted=0
-            ).values("disease")
-        )
+def _normalise_g2p_disease(disease_name: str) -> tuple[str, str, str]:
+    """
+    Returns the G2P disease name without 'gene-related', the same name in lower case
+    and the cleaned version used to calculate the similarity.
+    """
+    new_disease_name = re.sub(r".*\-related\s*", "", disease_name).strip()
+
+    return (
+        new_disease_name,
+        new_disease_name.lower(),
+        clean_string(new_disease_name).lower(),
+    )
+
+
+def _normalise_ontology_term(term: str) -> tuple[str, str, str]:
+    """
+    Returns the ontology term without the subtype, the cleaned version used
+    to calculate the similarity and the G2P synonym (if available).
+    """
+    term_without_type = clean_omim_disease(term)
+
+    return (
+        term_without_type,
+        clean_string(term_without_type).lower(),
+        check_synonyms_disease(term.lower()),
     )
 
-    for obj in disease_ontology_list:
-        new_disease_name = re.sub(r".*\-related\s*", "", obj.disease_name).strip()
-        clean_disease_name = clean_string(new_disease_name)
-        term_without_type = clean_omim_disease(obj.term)
-        clean_term = clean_string(term_without_type)
 
-        # Get the synonym name from our internal list of synonyms
-        synonyms_g2p_name = check_synonyms_disease(obj.term.lower())
+@register_check(level=logging.WARNING)
+def check_cross_references():
+    errors = []
 
-        if synonyms_g2p_name and synonyms_g2p_name == new_disease_name.lower():
+    # Select disease with ontology terms that are linked to visible panels
+    disease_ontology_list = DiseaseOntologyTerm.objects.filter(
+        disease__id__in=LocusGenotypeDisease.objects.filter(
+            lgdpanel__panel__is_visible=1, is_deleted=0
+        ).values("disease")
+    ).values_list("disease__name", "ontology_term__term", "ontology_term__accession")
+
+    # The same disease and ontology term can be linked to several records
+    # Cache the normalised strings to clean each name only once
+    normalised_diseases = {}
+    normalised_terms = {}
+
+    for disease_name, term, accession in disease_ontology_list:
+        if disease_name not in normalised_diseases:
+            normalised_diseases[disease_name] = _normalise_g2p_disease(disease_name)
+        if term not in normalised_terms:
+            normalised_terms[term] = _normalise_ontology_term(term)
+
+        new_disease_name, lower_disease_name, clean_disease_name = normalised_diseases[
+            disease_name
+        ]
+        term_without_type, clean_term, synonyms_g2p_name = normalised_terms[term]
+
+        # Check the synonym name from our internal list of synonyms
+        if synonyms_g2p_name and synonyms_g2p_name == lower_disease_name:
             continue
 
         # Check for deafness
         if "deafness" in new_disease_name and "hearing loss" in term_without_type:
             continue
 
-        # Calculate the string similarity
-        score = SequenceMatcher(
-            None, clean_disease_name.lower(), clean_term.lower()
-        ).ratio()
-
         if (
-            score < 0.3
-            and new_disease_name.lower() not in term_without_type
-            and term_without_type not in new_disease_name.lower()
+            lower_disease_name in term_without_type
+            or term_without_type in lower_disease_name
         ):
+            continue
+
+        # Calculate the string similarity
+        if similarity_below(clean_disease_name, clean_term, 0.3):
             # Add the error message to the list
             # Do not add a hint as the messages are already long and self explanatory
             errors.append(
                 Error(
-                    f"Disease '{obj.disease_name}' associated with suspicious ontology disease '{obj.term}' ({obj.accession})",
+                    f"Disease '{disease_name}' associated with suspicious ontology disease '{term}' ({accession})",
                     id="gene2phenotype_app.E401",
                 )
             )
@@ -68,6 +98,7 @@ def check_cross_references():
     return errors
 
 
+@register_check(level=logging.ERROR)
 def check_disease_name():
     errors = []
 
@@ -1,5 +1,6 @@
 from django.core.checks import Error
 from django.db.models import F, OuterRef, Exists, Subquery
+import logging
 
 from gene2phenotype_app.models import (
     MinedPublication,
@@ -7,7 +8,10 @@ from gene2phenotype_app.models import (
     LGDPublication,
 )
 
+from .Registry import register_check
 
+
+@register_check(level=logging.ERROR)
 def check_mined_publication_status():
     errors = []
 
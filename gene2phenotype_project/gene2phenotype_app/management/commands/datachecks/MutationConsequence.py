@@ -3,23 +3,32 @@ from gene2phenotype_app.models import (
     LGDMolecularMechanismSynopsis,
 )
 from django.core.checks import Error
-from .AllelicRequirement import should_process
 from django.db.models import Q, Count
+import logging
 
+from .Snapshot import DataCheckSnapshot
+from .Registry import register_check
 
-def mutation_consequence_constraint():
+
+@register_check(level=logging.ERROR, uses_snapshot=True)
+def mutation_consequence_constraint(snapshot=None):
     errors = []
 
+    if snapshot is None:
+        snapshot = DataCheckSnapshot()
+
+    # The G2P ID and synopsis are fetched in the same query (select_related)
     undertimed_lof_check = (
         LGDMolecularMechanismSynopsis.objects.filter(
             lgd__mechanism__value="undetermined non-loss of function", is_deleted=0
         )
         .exclude(synopsis__value=None)
         .exclude(synopsis_support__value=None)
+        .select_related("lgd__stable_id", "synopsis")
     )
 
     for obj in undertimed_lof_check:
-        if not should_process(obj.lgd_id):
+        if not snapshot.should_process(obj.lgd_id):
             continue
         errors.append(
             Error(
@@ -29,11 +38,15 @@ def mutation_consequence_constraint():
             )
         )
 
-    loss_of_function_check = LGDMolecularMechanismSynopsis.objects.filter(
-        lgd__mechanism__value="loss of function", is_deleted=0
-    ).exclude(synopsis__value__icontains="LOF")
+    loss_of_function_check = (
+        LGDMolecularMechanismSynopsis.objects.filter(
+            lgd__mechanism__value="loss of function", is_deleted=0
+        )
+        .exclude(synopsis__value__icontains="LOF")
+        .select_related("lgd__stable_id", "synopsis")
+    )
     for obj in loss_of_function_check:
-        if not should_process(obj.lgd_id):
+        if not snapshot.should_process(obj.lgd_id):
             continue
         errors.append(
             Error(
@@ -43,11 +56,15 @@ def mutation_consequence_constraint():
             )
         )
 
-    dominant_negative_check = LGDMolecularMechanismSynopsis.objects.filter(
-        lgd__mechanism__value="dominant negative", is_deleted=0
-    ).exclude(synopsis__value__icontains="dominant")
+    dominant_negative_check = (
+        LGDMolecularMechanismSynopsis.objects.filter(
+            lgd__mechanism__value="dominant negative", is_deleted=0
+        )
+        .exclude(synopsis__value__icontains="dominant")
+        .select_related("lgd__stable_id", "synopsis")
+    )
     for obj in dominant_negative_check:
-        if not should_process(obj.lgd_id):
+        if not snapshot.should_process(obj.lgd_id):
             continue
         errors.append(
             Error(
@@ -63,9 +80,10 @@ def mutation_consequence_constraint():
         )
         .exclude(synopsis__value__icontains="GOF")
         .exclude(synopsis__value="aggregation")
+        .select_related("lgd__stable_id", "synopsis")
     )
     for obj in gain_of_function_check:
-        if not should_process(obj.lgd_id):
+        if not snapshot.should_process(obj.lgd_id):
             continue
         errors.append(
             Error(
@@ -88,7 +106,7 @@ def mutation_consequence_constraint():
         .filter(mono_count__gt=0, bi_count__gt=0)
     )
     for entry in monoallelic_biallelic_counts:
-        if not should_process(entry.id):
+        if not snapshot.should_process(entry["id"]):
             continue
         errors.append(
             Error(
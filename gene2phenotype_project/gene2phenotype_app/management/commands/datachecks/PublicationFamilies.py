@@ -1,8 +1,12 @@
 from django.core.checks import Error
 from gene2phenotype_app.models import LGDPublication
 from django.db.models import F
+import logging
 
+from .Registry import register_check
 
+
+@register_check(level=logging.ERROR)
 def check_publication_families():
     errors = []
 
@@ -0,0 +1,75 @@
+import logging
+
+
+"""
+Registry of the data checks run by the command 'check_data'.
+To add a new check, decorate the function with @register_check. The function has to return
+a list of django.core.checks.Error and it is run in the order it was registered.
+
+Example:
+    @register_check(level=logging.WARNING, uses_snapshot=True)
+    def check_something(snapshot=None):
+        ...
+"""
+
+# Registered checks indexed by name (function name)
+CHECKS = {}
+
+
+def register_check(level=logging.ERROR, uses_snapshot=False):
+    """
+    Decorator to register a data check.
+
+    Args:
+        level (int): log level of the issues found by the check.
+                     Critical checks use logging.ERROR, non-critical checks use logging.WARNING
+        uses_snapshot (bool): if True, the shared DataCheckSnapshot is sent to the check
+    """
+
+    def decorator(function):
+        CHECKS[function.__name__] = {
+            "name": function.__name__,
+            "function": function,
+            "level": level,
+            "uses_snapshot": uses_snapshot,
+        }
+        return function
+
+    return decorator
+
+
+def get_checks(include_warnings=False, only=None, skip=None):
+    """
+    Returns the list of registered checks to run.
+
+    Args:
+        include_warnings (bool): include the non-critical checks (level WARNING)
+        only (list): names of the checks to run, they run even if they are non-critical
+        skip (list): names of the checks to skip
+
+    Raises:
+        ValueError: if one of the check names is not registered
+    """
+    unknown_checks = [
+        name for name in (only or []) + (skip or []) if name not in CHECKS
+    ]
+    if unknown_checks:
+        raise ValueError(
+            f"Unknown data check(s): {', '.join(unknown_checks)}. "
+            f"Available checks are: {', '.join(CHECKS)}"
+        )
+
+    checks = []
+    for name, check in CHECKS.items():
+        if only:
+            if name not in only:
+                continue
+        elif check["level"] < logging.ERROR and not include_warnings:
+            continue
+
+        if skip and name in skip:
+            continue
+
+        checks.append(check)
+
+    return checks
@@ -1,39 +1,68 @@
 from django.core.checks import Error
 from django.db.models import F
+from collections import defaultdict
+from itertools import combinations
+import logging
+import json
+import re
 
-from gene2phenotype_app.models import LocusGenotypeDisease
+from gene2phenotype_app.models import (
+    DiseaseOntologyTerm,
+    LGDPanel,
+    LocusGenotypeDisease,
+)
 
+from gene2phenotype_app.utils import clean_string
+
+from .Registry import register_check
+from .Similarity import jaccard, trigrams
+
+
+# Minimum score of two records to be reported as possible duplicates
+NEAR_DUPLICATE_THRESHOLD = 0.5
 
-def get_similar_records():
-    errors = []
-    list_of_records = {}
 
-    lgd_records = (
-        LocusGenotypeDisease.objects.annotate(
+def get_visible_records():
+    """
+    Returns the records linked to visible panels.
+    The panels are filtered in a subquery to avoid one row per panel.
+    """
+    return (
+        LocusGenotypeDisease.objects.filter(
+            id__in=LGDPanel.objects.filter(panel__is_visible=1).values("lgd_id"),
+            is_deleted=0,
+        )
+        .annotate(
             g2p_id=F("stable_id__stable_id"),
             disease_name=F("disease__name"),
             locus_name=F("locus__name"),
             genotype_value=F("genotype__value"),
             mechanism_value=F("mechanism__value"),
         )
-        .filter(lgdpanel__panel__is_visible=1, is_deleted=0)
         .values(
-            "g2p_id", "disease_name", "locus_name", "genotype_value", "mechanism_value"
+            "g2p_id",
+            "disease_id",
+            "disease_name",
+            "locus_id",
+            "locus_name",
+            "genotype_id",
+            "genotype_value",
+            "mechanism_value",
         )
-        .distinct()
+        .order_by("g2p_id")
     )
 
-    for obj in lgd_records:
-        key = f"{obj['locus_name']}---{obj['disease_name']}---{obj['genotype_value']}"
 
-        if key not in list_of_records:
-            list_of_records[key] = [
-                {"g2p_id": obj["g2p_id"], "mechanism": obj["mechanism_value"]}
-            ]
-        elif obj["g2p_id"] not in list_of_records[key]:
-            list_of_records[key].append(
-                {"g2p_id": obj["g2p_id"], "mechanism": obj["mechanism_value"]}
-            )
+@register_check(level=logging.WARNING)
+def get_similar_records():
+    errors = []
+    list_of_records = {}
+
+    for obj in get_visible_records():
+        key = f"{obj['locus_name']}---{obj['disease_name']}---{obj['genotype_value']}"
+        list_of_records.setdefault(key, []).append(
+            {"g2p_id": obj["g2p_id"], "mechanism": obj["mechanism_value"]}
+        )
 
     for key, items in list_of_records.items():
         if len(items) > 1:
@@ -50,3 +79,129 @@ def get_similar_records():
                 )
 
     return errors
+
+
+def _get_disease_signature(disease_name: str) -> tuple[set[str], set[str]]:
+    """
+    Returns the trigrams of the normalised disease name (without 'gene-related')
+    and the subtype numbers found in the name.
+    """
+    new_disease_name = re.sub(r".*\-related\s*", "", disease_name).strip()
+    clean_disease_name = clean_string(new_disease_name)
+    subtypes = {token for token in clean_disease_name.split() if token.isdigit()}
+
+    return trigrams(clean_disease_name), subtypes
+
+
+def find_merge_candidates(threshold: float = NEAR_DUPLICATE_THRESHOLD) -> list[dict]:
+    """
+    Find visible records that could be duplicates and could be merged.
+
+    Records can only be merged if they have the same locus and genotype (see MergeRecords),
+    the records are grouped by locus and genotype and only records in the same group are compared.
+    Records with the same disease are not compared - they have different mechanisms
+    (see get_similar_records).
+
+    The score of two records is the Jaccard similarity of the disease name trigrams.
+    If the diseases share an ontology accession (OMIM, Mondo) the score moves halfway to 1.
+    Diseases with different subtype numbers are skipped unless they share an ontology accession.
+
+    Returns:
+        list: candidate pairs sorted by score (highest first), the format of
+              'final_g2p_id' and 'g2p_ids' is the input format of MergeRecords
+    """
+    records_by_block = defaultdict(list)
+    for obj in get_visible_records():
+        records_by_block[(obj["locus_id"], obj["genotype_id"])].append(obj)
+
+    # Only blocks with more than one record can have duplicates
+    records_to_compare = [
+        records for records in records_by_block.values() if len(records) > 1
+    ]
+    disease_ids = {
+        obj["disease_id"] for records in records_to_compare for obj in records
+    }
+
+    disease_accessions = defaultdict(set)
+    for disease_id, accession in DiseaseOntologyTerm.objects.filter(
+        disease_id__in=disease_ids
+    ).values_list("disease_id", "ontology_term__accession"):
+        disease_accessions[disease_id].add(accession)
+
+    signatures = {}
+    candidates = []
+
+    for records in records_to_compare:
+        for record_a, record_b in combinations(records, 2):
+            if record_a["disease_id"] == record_b["disease_id"]:
+                continue
+
+            # Records with different mechanisms are not duplicates
+            # A record with undetermined mechanism is merged into the other record
+            mechanisms = (record_a["mechanism_value"], record_b["mechanism_value"])
+            if mechanisms[0] != mechanisms[1] and "undetermined" not in mechanisms:
+                continue
+            if mechanisms[0] == "undetermined" and mechanisms[1] != "undetermined":
+                record_a, record_b = record_b, record_a
+
+            for record in (record_a, record_b):
+                if record["disease_name"] not in signatures:
+                    signatures[record["disease_name"]] = _get_disease_signature(
+                        record["disease_name"]
+                    )
+
+            trigrams_a, subtypes_a = signatures[record_a["disease_name"]]
+            trigrams_b, subtypes_b = signatures[record_b["disease_name"]]
+            shared_accessions = (
+                disease_accessions[record_a["disease_id"]]
+                & disease_accessions[record_b["disease_id"]]
+            )
+
+            if not shared_accessions and subtypes_a != subtypes_b:
+                continue
+
+            score = jaccard(trigrams_a, trigrams_b)
+            if shared_accessions:
+                score = (1 + score) / 2
+
+            if score >= threshold:
+                candidates.append(
+                    {
+                        "final_g2p_id": record_a["g2p_id"],
+                        "g2p_ids": [record_b["g2p_id"]],
+                        "score": round(score, 2),
+                        "diseases": [
+                            record_a["disease_name"],
+                            record_b["disease_name"],
+                        ],
+                        "shared_accessions": sorted(shared_accessions),
+                    }
+                )
+
+    return sorted(candidates, key=lambda candidate: -candidate["score"])
+
+
+@register_check(level=logging.WARNING)
+def check_near_duplicate_records():
+    errors = []
+
+    for candidate in find_merge_candidates():
+        message = (
+            f"Records {candidate['final_g2p_id']} and {candidate['g2p_ids'][0]} "
+            f"with same locus and genotype have similar diseases (score {candidate['score']}): "
+            f"'{candidate['diseases'][0]}', '{candidate['diseases'][1]}'"
+        )
+        if candidate["shared_accessions"]:
+            message += (
+                f" sharing ontology term(s) {', '.join(candidate['shared_accessions'])}"
+            )
+
+        errors.append(
+            Error(
+                message,
+                hint=f"Merge data: {json.dumps({key: candidate[key] for key in ('g2p_ids', 'final_g2p_id')})}",
+                id="gene2phenotype_app.E602",
+            )
+        )
+
+    return errors
@@ -0,0 +1,79 @@
+from difflib import SequenceMatcher
+
+
+"""
+String similarity helpers used by the data checks.
+similarity_below: difflib.SequenceMatcher is expensive, it uses cheaper bounds of the
+SequenceMatcher ratio to decide most pairs and only compute the full ratio for
+borderline pairs. The result is always the same as comparing the full ratio.
+trigrams/jaccard: cheap signatures used to compare disease names of similar records.
+"""
+
+# SequenceMatcher ignores popular characters when the second string has at least 200
+# characters (autojunk), the token lower bound is only valid for shorter strings
+AUTOJUNK_MIN_LENGTH = 200
+
+
+def similarity_below(string_a: str, string_b: str, threshold: float) -> bool:
+    """
+    Returns True if SequenceMatcher(None, string_a, string_b).ratio() is below the threshold.
+
+    The ratio is 2*M/T where M is the number of matching characters and T the total
+    number of characters. The following bounds are checked before computing the ratio:
+        - upper bound: M is at most the length of the shortest string
+        - lower bound: M is at least the length of the longest shared token,
+          clean_string() returns space separated tokens
+        - upper bound: SequenceMatcher.quick_ratio() (character multiset intersection)
+
+    Args:
+        string_a (str): first string
+        string_b (str): second string
+        threshold (float): similarity threshold
+
+    Returns:
+        bool: True if the similarity ratio is below the threshold
+    """
+    total_length = len(string_a) + len(string_b)
+
+    # Two empty strings are identical (ratio 1.0)
+    if not total_length:
+        return False
+
+    if 2.0 * min(len(string_a), len(string_b)) / total_length < threshold:
+        return True
+
+    if len(string_b) < AUTOJUNK_MIN_LENGTH:
+        shared_tokens = set(string_a.split()) & set(string_b.split())
+        if (
+            shared_tokens
+            and 2.0 * max(len(token) for token in shared_tokens) / total_length
+            >= threshold
+        ):
+            return False
+
+    matcher = SequenceMatcher(None, string_a, string_b)
+
+    if matcher.quick_ratio() < threshold:
+        return True
+
+    return matcher.ratio() < threshold
+
+
+def trigrams(string: str) -> set[str]:
+    """
+    Returns the set of character trigrams of a string.
+    The string is padded to include the start and the end of the first and last words.
+    """
+    padded_string = f"  {string} "
+
+    return {padded_string[i : i + 3] for i in range(len(padded_string) - 2)}
+
+
+def jaccard(set_a: set, set_b: set) -> float:
+    """
+    Returns the Jaccard similarity of two sets.
+    """
+    if not set_a and not set_b:
+        return 1.0
+
+    return len(set_a & set_b) / len(set_a | set_b)
@@ -0,0 +1,69 @@
+from functools import cached_property
+from django.db.models import Count
+
+from gene2phenotype_app.models import LGDPanel, LGDPublication
+
+
+class DataCheckSnapshot:
+    """
+    In-memory snapshot of the data shared by the data checks.
+    Each table is fetched with one query the first time it is used and indexed by lgd_id,
+    this way the checks do not have to run one query per record.
+    """
+
+    @cached_property
+    def lgd_first_panel(self) -> dict[int, str]:
+        """
+        Returns the name of the first panel (lowest lgd_panel id) of each record.
+        Only non-deleted lgd-panels are considered.
+        """
+        lgd_panels = {}
+
+        for lgd_id, panel_name in (
+            LGDPanel.objects.filter(is_deleted=0)
+            .order_by("id")
+            .values_list("lgd_id", "panel__name")
+        ):
+            if lgd_id not in lgd_panels:
+                lgd_panels[lgd_id] = panel_name
+
+        return lgd_panels
+
+    @cached_property
+    def processable_lgd_ids(self) -> set[int]:
+        """
+        Returns the set of records that should be checked.
+        Records in panel Demo and records without panels are skipped.
+        """
+        return {
+            lgd_id
+            for lgd_id, panel_name in self.lgd_first_panel.items()
+            if panel_name != "Demo"
+        }
+
+    @cached_property
+    def lgd_publication_counts(self) -> dict[int, int]:
+        """
+        Returns the number of non-deleted publications of each record.
+        Records without publications are not included.
+        """
+        return dict(
+            LGDPublication.objects.filter(is_deleted=0)
+            .values("lgd_id")
+            .annotate(number_publications=Count("id"))
+            .values_list("lgd_id", "number_publications")
+        )
+
+    def load(self) -> None:
+        """
+        Fetch all the data of the snapshot.
+        This method should be called before the snapshot is shared by parallel checks.
+        """
+        self.processable_lgd_ids
+        self.lgd_publication_counts
+
+    def should_process(self, lgd_id: int) -> bool:
+        """
+        Returns True if the record should be checked.
+        """
+        return lgd_id in self.processable_lgd_ids
@@ -1,11 +1,19 @@
+from .Snapshot import DataCheckSnapshot
+
+from .Registry import CHECKS, register_check, get_checks
+
 from .PublicationFamilies import check_publication_families
 
 from .AllelicRequirement import check_ar_constraint, check_ar_publications
 
 from .MutationConsequence import mutation_consequence_constraint
 
-from .Disease import check_cross_references, check_disease_name
-
 from .MinedPublications import check_mined_publication_status
 
-from .SimilarRecords import get_similar_records
+from .Disease import check_cross_references, check_disease_name
+
+from .SimilarRecords import (
+    get_similar_records,
+    find_merge_candidates,
+    check_near_duplicate_records,
+)
@@ -0,0 +1,120 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+from django.db.backends.signals import connection_created
+from django.test import Client
+
+
+"""
+Command to measure the effect of persistent database connections on the latency of the endpoints.
+Each endpoint is called --requests times for each value of --conn_max_age. The database
+connections are handled the same way as in the web server: old connections are closed
+at the start and at the end of each request.
+
+The command uses the database configured in config.ini, for example a local MySQL/MariaDB container:
+docker run -d -p 3306:3306 -e MARIADB_ROOT_PASSWORD=root -e MARIADB_DATABASE=g2p mariadb:11
+
+How to run the command:
+python manage.py db_load_test [--endpoints <url> <url>] [--requests <number of requests>]
+                              [--conn_max_age <seconds> <seconds>]
+"""
+
+
+class Command(BaseCommand):
+    help = "Measure the latency of the endpoints with and without persistent database connections"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--endpoints",
+            required=False,
+            nargs="+",
+            default=[
+                "/gene2phenotype/api/panels/",
+                "/gene2phenotype/api/search/?query=CEP290",
+                "/gene2phenotype/api/panel/DD/download/",
+            ],
+            help="URLs to call",
+        )
+        parser.add_argument(
+            "--requests",
+            required=False,
+            type=int,
+            default=200,
+            help="Number of requests to each URL (default: 200)",
+        )
+        parser.add_argument(
+            "--conn_max_age",
+            required=False,
+            type=int,
+            nargs="+",
+            default=[0, 60],
+            help="Values of CONN_MAX_AGE to compare (default: 0 60)",
+        )
+
+    def handle(self, *args, **options):
+        n_requests = options["requests"]
+
+        if n_requests < 1:
+            raise CommandError(f"Invalid number of requests {n_requests}")
+
+        allowed_hosts = [
+            host.lstrip(".") for host in settings.ALLOWED_HOSTS if host != "*"
+        ]
+        client = Client(HTTP_HOST=allowed_hosts[0] if allowed_hosts else "localhost")
+        connection = connections["default"]
+        original_max_age = connection.settings_dict["CONN_MAX_AGE"]
+
+        new_connections = []
+        connection_created.connect(
+            lambda sender, connection, **kwargs: new_connections.append(1),
+            weak=False,
+            dispatch_uid="db_load_test",
+        )
+
+        try:
+            for conn_max_age in options["conn_max_age"]:
+                connection.settings_dict["CONN_MAX_AGE"] = conn_max_age
+                connection.close()
+
+                self.stdout.write(f"\nCONN_MAX_AGE={conn_max_age}")
+
+                for url in options["endpoints"]:
+                    new_connections.clear()
+                    durations = []
+
+                    for _ in range(n_requests):
+                        start = time.perf_counter()
+                        # Same as the request_started/request_finished signals of the web server
+                        close_old_connections()
+                        response = client.get(url)
+                        close_old_connections()
+                        durations.append(time.perf_counter() - start)
+
+                        if response.status_code >= 400:
+                            raise CommandError(
+                                f"{url} returned status {response.status_code}"
+                            )
+
+                    self.stdout.write(
+                        f"  {url}: {self.format_durations(durations)}, "
+                        f"new connections: {len(new_connections)}/{n_requests}"
+                    )
+        finally:
+            connection_created.disconnect(dispatch_uid="db_load_test")
+            connection.settings_dict["CONN_MAX_AGE"] = original_max_age
+            connection.close()
+
+    def format_durations(self, durations):
+        """
+        Returns the p50, p95 and p99 latencies (ms).
+        """
+        durations = sorted(durations)
+        percentiles = []
+
+        for percentile in [50, 95, 99]:
+            index = min(len(durations) - 1, int(len(durations) * percentile / 100))
+            percentiles.append(f"p{percentile} {durations[index] * 1000:.1f}ms")
+
+        return ", ".join(percentiles)
@@ -1,7 +1,6 @@
-import csv
 from datetime import datetime
 
-from django.core.management.base import BaseCommand, CommandError
+from django.core.management.base import CommandError
 from django.utils import timezone
 
 from gene2phenotype_app.models import (
@@ -12,16 +11,24 @@ from gene2phenotype_app.models import (
     User,
 )
 
+from .importer import BaseImportCommand
 
 """
 Command to import the record publication comments from a csv file.
 File format is the following:
     g2p id,lgd_id,pmid,publication_id,comment,user_id,username,date,id_deleted
+
+The rows are imported in batches and the import can be resumed (see importer/BaseImportCommand.py).
+
+How to run the command:
+python manage.py import_publication_comments --data_file <csv data file> --email <user account email>
+                                             [--batch_size <rows>] [--resume] [--dry_run]
 """
 
 
-class Command(BaseCommand):
+class Command(BaseImportCommand):
     def add_arguments(self, parser):
+        super().add_arguments(parser)
         parser.add_argument(
             "--data_file",
             required=True,
@@ -45,68 +52,70 @@ class Command(BaseCommand):
         except Exception as e:
             raise CommandError(str(e))
 
-        with open(data_file, newline="") as fh_file:
-            data_reader = csv.DictReader(fh_file)
-            for row in data_reader:
-                # Format date
-                date_formatted = datetime.strptime(
-                    row["date"].strip(), "%d/%m/%Y %H:%M"
-                )
-                date_aware = timezone.make_aware(date_formatted)
-
-                # Get publication object
-                pmid_value = row["pmid"].strip()
-                try:
-                    publication_obj = Publication.objects.get(pmid=pmid_value)
-                except Publication.DoesNotExist:
-                    raise CommandError(f"Invalid PMID '{pmid_value}'")
-
-                # Get record object
-                lgd_id = row["lgd_id"].strip()
-                try:
-                    lgd_obj = LocusGenotypeDisease.objects.get(id=lgd_id)
-                except LocusGenotypeDisease.DoesNotExist:
-                    raise CommandError(f"Invalid record ID '{lgd_id}'")
-
-                # Get the LGDPublication obj
-                try:
-                    lgd_publication_obj = LGDPublication.objects.get(
-                        lgd=lgd_obj, publication=publication_obj
-                    )
-                except LGDPublication.DoesNotExist:
-                    raise CommandError(
-                        f"Cannot fetch lgd-publication {lgd_id}-{publication_obj.id}"
-                    )
-
-                # Get user who wrote the comment
-                try:
-                    user_comment_obj = User.objects.get(id=row["user_id"].strip())
-                except Exception as e:
-                    raise CommandError(str(e))
-
-                # Create comment for the LGDPublication
-                try:
-                    comment_obj = LGDPublicationComment.objects.get(
-                        lgd_publication=lgd_publication_obj,
-                        comment=row["comment"].strip(),
-                        is_public=0,
-                        is_deleted=0,
-                        date=date_aware,
-                        user=user_comment_obj,
-                    )
-                except LGDPublicationComment.DoesNotExist:
-                    comment_obj = LGDPublicationComment(
-                        lgd_publication=lgd_publication_obj,
-                        comment=row["comment"].strip(),
-                        is_public=0,
-                        is_deleted=0,
-                        date=date_aware,
-                        user=user_comment_obj,
-                    )
-                    comment_obj._history_user = user_obj
-                    comment_obj.save()
-                    self.stdout.write("LGDPublicationComment created successfully")
-                else:
-                    raise CommandError(
-                        f"Duplicate LGDPublicationComment: PMID {pmid_value} for {row['g2p id']}"
-                    )
+        self.user_obj = user_obj
+
+        rows = self.read_data_file(data_file)
+        self.run_import(rows, data_file, options)
+
+    def import_row(self, row):
+        # Format date
+        date_formatted = datetime.strptime(row["date"].strip(), "%d/%m/%Y %H:%M")
+        date_aware = timezone.make_aware(date_formatted)
+
+        # Get publication object
+        pmid_value = row["pmid"].strip()
+        try:
+            publication_obj = Publication.objects.get(pmid=pmid_value)
+        except Publication.DoesNotExist:
+            raise CommandError(f"Invalid PMID '{pmid_value}'")
+
+        # Get record object
+        lgd_id = row["lgd_id"].strip()
+        try:
+            lgd_obj = LocusGenotypeDisease.objects.get(id=lgd_id)
+        except LocusGenotypeDisease.DoesNotExist:
+            raise CommandError(f"Invalid record ID '{lgd_id}'")
+
+        # Get the LGDPublication obj
+        try:
+            lgd_publication_obj = LGDPublication.objects.get(
+                lgd=lgd_obj, publication=publication_obj
+            )
+        except LGDPublication.DoesNotExist:
+            raise CommandError(
+                f"Cannot fetch lgd-publication {lgd_id}-{publication_obj.id}"
+            )
+
+        # Get user who wrote the comment
+        try:
+            user_comment_obj = User.objects.get(id=row["user_id"].strip())
+        except Exception as e:
+            raise CommandError(str(e))
+
+        # Create comment for the LGDPublication
+        try:
+            comment_obj = LGDPublicationComment.objects.get(
+                lgd_publication=lgd_publication_obj,
+                comment=row["comment"].strip(),
+                is_public=0,
+                is_deleted=0,
+                date=date_aware,
+                user=user_comment_obj,
+            )
+        except LGDPublicationComment.DoesNotExist:
+            comment_obj = LGDPublicationComment(
+                lgd_publication=lgd_publication_obj,
+                comment=row["comment"].strip(),
+                is_public=0,
+                is_deleted=0,
+                date=date_aware,
+                user=user_comment_obj,
+            )
+            comment_obj._history_user = self.user_obj
+            comment_obj.save()
+        else:
+            raise CommandError(
+                f"Duplicate LGDPublicationComment: PMID {pmid_value} for {row['g2p id']}"
+            )
+
+        return "created"
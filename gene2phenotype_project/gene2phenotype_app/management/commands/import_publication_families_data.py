@@ -1,6 +1,4 @@
-import csv
-
-from django.core.management.base import BaseCommand, CommandError
+from django.core.management.base import CommandError
 from gene2phenotype_app.models import (
     Attrib,
     Publication,
@@ -9,14 +7,24 @@ from gene2phenotype_app.models import (
     User,
 )
 
+from .importer import BaseImportCommand
+
 """
 Command to import publication family information from a csv file.
 File format is the following:
     g2p id,lgd_id,pmid,publication_id,number of families,affected individuals,ancestries,consanguinity
+
+The rows are imported in batches and the import can be resumed (see importer/BaseImportCommand.py).
+
+How to run the command:
+python manage.py import_publication_families_data --data_file <csv data file> --email <user account email>
+                                                  [--batch_size <rows>] [--resume] [--dry_run]
 """
 
-class Command(BaseCommand):
+
+class Command(BaseImportCommand):
     def add_arguments(self, parser):
+        super().add_arguments(parser)
         parser.add_argument(
             "--data_file",
             required=True,
@@ -40,66 +48,67 @@ class Command(BaseCommand):
         except Exception as e:
             raise CommandError(str(e))
 
-        with open(data_file, newline="") as fh_file:
-            data_reader = csv.DictReader(fh_file)
-            for row in data_reader:
-                # Get consanguinity object
-                consanguinity_value = row["consanguinity"].strip()
-                try:
-                    consanguinity_obj = Attrib.objects.get(
-                        value=consanguinity_value, type__code="consanguinity"
-                    )
-                except Attrib.DoesNotExist:
-                    raise CommandError(f"Invalid consanguinity '{consanguinity_value}'")
-
-                # Get publication object
-                pmid_value = row["pmid"].strip()
-                try:
-                    publication_obj = Publication.objects.get(pmid=pmid_value)
-                except Publication.DoesNotExist:
-                    raise CommandError(f"Invalid PMID '{pmid_value}'")
-
-                # Get record object
-                lgd_id = row["lgd_id"].strip()
-                try:
-                    lgd_obj = LocusGenotypeDisease.objects.get(id=lgd_id)
-                except LocusGenotypeDisease.DoesNotExist:
-                    raise CommandError(f"Invalid record ID '{lgd_id}'")
-
-                # Get the LGDPublication obj to be updated
-                try:
-                    lgd_publication_obj = LGDPublication.objects.get(
-                        lgd=lgd_obj, publication=publication_obj
-                    )
-                except LGDPublication.DoesNotExist:
-                    raise CommandError(
-                        f"Cannot fetch lgd-publication {lgd_id}-{publication_obj.id}"
-                    )
-
-                # Checking if lgd-publication already has families counts
-                if lgd_publication_obj.number_of_families:
-                    raise CommandError(
-                        f"Cannot update lgd-publication {lgd_id}-{publication_obj.id} as it already has families data"
-                    )
-
-                try:
-                    lgd_publication_obj.number_of_families = row[
-                        "number of families"
-                    ].strip()
-                    lgd_publication_obj.consanguinity = consanguinity_obj
-                    lgd_publication_obj.affected_individuals = row[
-                        "affected individuals"
-                    ].strip()
-                    ancestry_value = row["ancestries"].strip()
-                    if ancestry_value == "":
-                        ancestry_value = None
-                    lgd_publication_obj.ancestry = ancestry_value
-                    lgd_publication_obj._history_user = user_obj
-                    lgd_publication_obj.save()
-                except Exception as e:
-                    raise CommandError(
-                        f"Cannot save data for PMID '{pmid_value}' for record '{lgd_id}'",
-                        str(e),
-                    )
-                else:
-                    self.stdout.write("Data updated successfully")
+        self.user_obj = user_obj
+
+        rows = self.read_data_file(data_file)
+        self.run_import(rows, data_file, options)
+
+    def import_row(self, row):
+        # Get consanguinity object
+        consanguinity_value = row["consanguinity"].strip()
+        try:
+            consanguinity_obj = Attrib.objects.get(
+                value=consanguinity_value, type__code="consanguinity"
+            )
+        except Attrib.DoesNotExist:
+            raise CommandError(f"Invalid consanguinity '{consanguinity_value}'")
+
+        # Get publication object
+        pmid_value = row["pmid"].strip()
+        try:
+            publication_obj = Publication.objects.get(pmid=pmid_value)
+        except Publication.DoesNotExist:
+            raise CommandError(f"Invalid PMID '{pmid_value}'")
+
+        # Get record object
+        lgd_id = row["lgd_id"].strip()
+        try:
+            lgd_obj = LocusGenotypeDisease.objects.get(id=lgd_id)
+        except LocusGenotypeDisease.DoesNotExist:
+            raise CommandError(f"Invalid record ID '{lgd_id}'")
+
+        # Get the LGDPublication obj to be updated
+        try:
+            lgd_publication_obj = LGDPublication.objects.get(
+                lgd=lgd_obj, publication=publication_obj
+            )
+        except LGDPublication.DoesNotExist:
+            raise CommandError(
+                f"Cannot fetch lgd-publication {lgd_id}-{publication_obj.id}"
+            )
+
+        # Checking if lgd-publication already has families counts
+        if lgd_publication_obj.number_of_families:
+            raise CommandError(
+                f"Cannot update lgd-publication {lgd_id}-{publication_obj.id} as it already has families data"
+            )
+
+        try:
+            lgd_publication_obj.number_of_families = row["number of families"].strip()
+            lgd_publication_obj.consanguinity = consanguinity_obj
+            lgd_publication_obj.affected_individuals = row[
+                "affected individuals"
+            ].strip()
+            ancestry_value = row["ancestries"].strip()
+            if ancestry_value == "":
+                ancestry_value = None
+            lgd_publication_obj.ancestry = ancestry_value
+            lgd_publication_obj._history_user = self.user_obj
+            lgd_publication_obj.save()
+        except Exception as e:
+            raise CommandError(
+                f"Cannot save data for PMID '{pmid_value}' for record '{lgd_id}'",
+                str(e),
+            )
+
+        return "updated"
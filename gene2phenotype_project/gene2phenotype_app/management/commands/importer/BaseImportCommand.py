@@ -0,0 +1,183 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from collections import Counter
+import csv
+import time
+
+from .Checkpoint import ImportCheckpoint
+
+"""
+Base class of the commands that import data from a csv file.
+
+The rows are imported in batches, each batch runs in one transaction. After each batch
+a checkpoint file stores the number of rows already imported. If the import fails the
+command can be run again with --resume to continue from the last imported batch.
+
+Commands have to implement import_row() (or import_batch() to import several rows at once).
+import_row() returns the status of the row (example: 'created', 'updated', 'skipped'),
+the status is used to report the summary counts.
+
+Options:
+    --batch_size: number of rows imported in each transaction (default: 500)
+    --resume: continue the import from the checkpoint file
+    --checkpoint_file: checkpoint file (default: <data file>.checkpoint)
+    --dry_run: run the import without saving the data, reports the summary counts
+"""
+
+
+class BaseImportCommand(BaseCommand):
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch_size",
+            required=False,
+            type=int,
+            default=500,
+            help="Number of rows imported in each transaction (default: 500)",
+        )
+        parser.add_argument(
+            "--resume",
+            required=False,
+            action="store_true",
+            help="Resume the import from the last checkpoint",
+        )
+        parser.add_argument(
+            "--checkpoint_file",
+            required=False,
+            type=str,
+            help="Checkpoint file (default: <data file>.checkpoint)",
+        )
+        parser.add_argument(
+            "--dry_run",
+            required=False,
+            action="store_true",
+            help="Run the import without saving the data",
+        )
+
+    def read_data_file(self, data_file, mandatory_headers=None):
+        """
+        Read the input csv file.
+        Returns the list of rows.
+        """
+        with open(data_file, newline="") as fh:
+            data_reader = csv.DictReader(fh)
+
+            # Check headers
+            if mandatory_headers and not all(
+                column in (data_reader.fieldnames or []) for column in mandatory_headers
+            ):
+                raise CommandError(
+                    f"Missing data. Mandatory fields are: {mandatory_headers}"
+                )
+
+            return list(data_reader)
+
+    def import_row(self, row):
+        """
+        Import one row. Returns the status of the row.
+        """
+        raise NotImplementedError(
+            "subclasses of BaseImportCommand must provide an import_row() method"
+        )
+
+    def import_batch(self, rows):
+        """
+        Import a batch of rows. Returns the summary counts of the batch.
+        """
+        counts = Counter()
+
+        for row in rows:
+            counts[self.import_row(row)] += 1
+
+        return counts
+
+    def replay_row(self, row):
+        """
+        Called for the rows already imported when the import is resumed.
+        Commands that keep data in memory between rows can use it to rebuild their state.
+        """
+        pass
+
+    def run_import(self, rows, data_file, options):
+        """
+        Import the rows in batches and save a checkpoint after each batch.
+        Returns the summary counts.
+        """
+        batch_size = options["batch_size"]
+        dry_run = options["dry_run"]
+        checkpoint = ImportCheckpoint(
+            options["checkpoint_file"] or f"{data_file}.checkpoint",
+            data_file,
+            len(rows),
+        )
+
+        if batch_size < 1:
+            raise CommandError(f"Invalid batch size {batch_size}")
+
+        start_row = 0
+        counts = Counter()
+
+        if options["resume"]:
+            if checkpoint.exists():
+                try:
+                    start_row, previous_counts = checkpoint.load()
+                except ValueError as e:
+                    raise CommandError(str(e))
+                counts.update(previous_counts)
+                self.stdout.write(f"Resuming import from row {start_row + 1}")
+
+                for row in rows[:start_row]:
+                    self.replay_row(row)
+            else:
+                self.stdout.write(
+                    f"Checkpoint '{checkpoint.checkpoint_file}' not found, starting from the first row"
+                )
+        elif checkpoint.exists() and not dry_run:
+            raise CommandError(
+                f"Checkpoint '{checkpoint.checkpoint_file}' found. Use --resume to continue the previous import"
+            )
+
+        start = time.perf_counter()
+
+        for batch_start in range(start_row, len(rows), batch_size):
+            batch = rows[batch_start : batch_start + batch_size]
+
+            try:
+                with transaction.atomic():
+                    batch_counts = self.import_batch(batch)
+
+                    if dry_run:
+                        transaction.set_rollback(True)
+            except (Exception, KeyboardInterrupt, SystemExit) as e:
+                if not dry_run and batch_start > 0:
+                    self.stderr.write(
+                        f"Import stopped between rows {batch_start + 1} and {batch_start + len(batch)}. "
+                        f"Rows 1-{batch_start} were imported, run the command with --resume to continue."
+                    )
+                # get_publication() calls sys.exit() when the API is not available
+                if isinstance(e, SystemExit):
+                    raise CommandError(
+                        f"Import stopped between rows {batch_start + 1} and {batch_start + len(batch)}: cannot fetch data from external API"
+                    )
+                raise
+
+            counts.update(batch_counts)
+            imported_rows = batch_start + len(batch)
+
+            if not dry_run:
+                checkpoint.save(imported_rows, counts)
+
+            duration = time.perf_counter() - start
+            self.stdout.write(
+                f"Processed {imported_rows}/{len(rows)} rows "
+                f"({(imported_rows - start_row) / duration if duration else 0:.1f} rows/s)"
+            )
+
+        # The import is complete - the checkpoint is not needed
+        if not dry_run:
+            checkpoint.delete()
+
+        self.stdout.write("\nSummary (dry run):" if dry_run else "\nSummary:")
+        for status, count in sorted(counts.items()):
+            self.stdout.write(f"  {status}: {count}")
+
+        return counts
@@ -0,0 +1,65 @@
+import json
+import os
+
+
+class ImportCheckpoint:
+    """
+    Checkpoint file of an import.
+    It stores the number of rows already committed to the database and the summary
+    counts, this way an import can be resumed after a failure.
+
+    Format of the checkpoint file (json):
+        {"data_file": "mined_publications.csv", "total_rows": 50000, "row": 12000, "counts": {"created": 11000}}
+    """
+
+    def __init__(self, checkpoint_file: str, data_file: str, total_rows: int):
+        self.checkpoint_file = checkpoint_file
+        self.data_file = data_file
+        self.total_rows = total_rows
+
+    def exists(self) -> bool:
+        return os.path.isfile(self.checkpoint_file)
+
+    def load(self) -> tuple[int, dict]:
+        """
+        Returns the number of rows already imported and the summary counts.
+
+        Raises:
+            ValueError: if the checkpoint was created for a different file
+        """
+        with open(self.checkpoint_file) as fh:
+            checkpoint = json.load(fh)
+
+        if (
+            checkpoint["data_file"] != os.path.basename(self.data_file)
+            or checkpoint["total_rows"] != self.total_rows
+        ):
+            raise ValueError(
+                f"Checkpoint '{self.checkpoint_file}' does not match input file '{self.data_file}'"
+            )
+
+        return checkpoint["row"], checkpoint["counts"]
+
+    def save(self, row: int, counts: dict) -> None:
+        """
+        Save the number of rows already imported.
+        The file is replaced atomically so a crash cannot leave a partial checkpoint.
+        """
+        tmp_file = f"{self.checkpoint_file}.tmp"
+
+        with open(tmp_file, "w") as wr:
+            json.dump(
+                {
+                    "data_file": os.path.basename(self.data_file),
+                    "total_rows": self.total_rows,
+                    "row": row,
+                    "counts": counts,
+                },
+                wr,
+            )
+
+        os.replace(tmp_file, self.checkpoint_file)
+
+    def delete(self) -> None:
+        if self.exists():
+            os.remove(self.checkpoint_file)
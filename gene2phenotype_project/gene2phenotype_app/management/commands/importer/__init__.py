@@ -0,0 +1,3 @@
+from .Checkpoint import ImportCheckpoint
+
+from .BaseImportCommand import BaseImportCommand
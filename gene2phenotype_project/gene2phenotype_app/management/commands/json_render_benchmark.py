@@ -0,0 +1,99 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from rest_framework.renderers import JSONRenderer
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from gene2phenotype_app.models import User
+from gene2phenotype_app.renderers import FastJSONRenderer, orjson
+
+
+"""
+Command to compare the encoding time and size of the JSON responses
+of the default DRF JSONRenderer and the orjson renderer (FastJSONRenderer).
+Each endpoint is called once, the data of the response is then encoded --iterations times
+by each renderer.
+
+The command uses the database configured in config.ini. To benchmark the fixtures load
+them into a local database first, for example:
+python manage.py loaddata gene2phenotype_app/fixtures/*.json
+
+How to run the command:
+python manage.py json_render_benchmark [--endpoints <url> <url>] [--iterations <number>]
+                                       [--user <email>]
+"""
+
+
+class Command(BaseCommand):
+    help = "Compare the encoding time of the default JSON renderer and the orjson renderer"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--endpoints",
+            required=False,
+            nargs="+",
+            default=[
+                "/gene2phenotype/api/panel/DD/summary/",
+                "/gene2phenotype/api/lgd/G2P00001/",
+                "/gene2phenotype/api/molecular_mechanisms/",
+                "/gene2phenotype/api/activity_logs/",
+            ],
+            help="URLs to benchmark",
+        )
+        parser.add_argument(
+            "--iterations",
+            required=False,
+            type=int,
+            default=100,
+            help="Number of times each response is encoded (default: 100)",
+        )
+        parser.add_argument(
+            "--user",
+            required=False,
+            type=str,
+            help="Email of the user to call the endpoints that require authentication",
+        )
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+
+        if iterations < 1:
+            raise CommandError(f"Invalid number of iterations {iterations}")
+
+        if orjson is None:
+            raise CommandError("orjson is not installed")
+
+        allowed_hosts = [
+            host.lstrip(".") for host in settings.ALLOWED_HOSTS if host != "*"
+        ]
+        client = Client(HTTP_HOST=allowed_hosts[0] if allowed_hosts else "localhost")
+
+        if options["user"]:
+            try:
+                user = User.objects.get(email=options["user"], is_active=1)
+            except User.DoesNotExist:
+                raise CommandError(f"Invalid user {options['user']}")
+            client.cookies[settings.SIMPLE_JWT["AUTH_COOKIE"]] = str(
+                RefreshToken.for_user(user).access_token
+            )
+
+        renderers = {"json": JSONRenderer(), "orjson": FastJSONRenderer()}
+
+        for url in options["endpoints"]:
+            response = client.get(url)
+
+            if response.status_code >= 400 or not hasattr(response, "data"):
+                self.stdout.write(f"{url}: skipped (status {response.status_code})")
+                continue
+
+            results = []
+            for name, renderer in renderers.items():
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    content = renderer.render(response.data)
+                duration = (time.perf_counter() - start) / iterations
+                results.append(f"{name} {duration * 1000:.2f}ms {len(content)} bytes")
+
+            self.stdout.write(f"{url}: {', '.join(results)}")
@@ -1,11 +1,11 @@
-import csv
 import logging
 import os.path
+from collections import Counter, defaultdict
 
-from django.core.management.base import BaseCommand, CommandError
-from django.db.models import F
+from django.core.management.base import CommandError
+from simple_history.utils import bulk_create_with_history
 
-from ...utils import get_ontology, get_ontology_source
+from ...utils import get_ontologies, get_ontology_source, read_mondo_file
 
 from gene2phenotype_app.models import (
     Disease,
@@ -17,21 +17,35 @@ from gene2phenotype_app.models import (
     Attrib,
 )
 
+from .importer import BaseImportCommand
 
 """
 Command to load Mondo disease ontologies into G2P database.
 
 Supported input file: csv
 
+The rows are imported in batches and the import can be resumed (see importer/BaseImportCommand.py).
+The records, diseases and ontology terms are loaded once before the import.
+Each batch is imported in two steps:
+    1. the new Mondo IDs of the batch are fetched from OLS in parallel (--workers),
+       or from a local Mondo file (--mondo_file) if provided
+    2. the new ontology terms and disease ontologies are inserted in bulk
+
+Mondo files can be downloaded from https://mondo.monarchinitiative.org/pages/download/
+Supported Mondo files: mondo.obo, mondo.json
+
 How to run the command:
 python manage.py load_disease_ontologies --data_file <csv data file> --email <user account email>
+                                         [--mondo_file <mondo.obo>] [--workers <number of threads>]
+                                         [--batch_size <rows>] [--resume] [--dry_run]
 """
 
 logger = logging.getLogger(__name__)
 
 
-class Command(BaseCommand):
+class Command(BaseImportCommand):
     def add_arguments(self, parser):
+        super().add_arguments(parser)
         parser.add_argument(
             "--data_file",
             required=True,
@@ -44,11 +58,25 @@ class Command(BaseCommand):
             type=str,
             help="User email to store in the history table",
         )
+        parser.add_argument(
+            "--mondo_file",
+            required=False,
+            type=str,
+            help="Local Mondo file used instead of OLS (supported format: obo, json)",
+        )
+        parser.add_argument(
+            "--workers",
+            required=False,
+            type=int,
+            default=8,
+            help="Number of parallel queries to OLS (default: 8)",
+        )
 
     def handle(self, *args, **options):
         data_file = options["data_file"]
         input_email = options["email"]
-        unique_diseases = {}
+        mondo_file = options["mondo_file"]
+        self.unique_diseases = {}
 
         if not os.path.isfile(data_file):
             raise CommandError(f"Invalid file {data_file}")
@@ -56,6 +84,12 @@ class Command(BaseCommand):
         if not data_file.endswith(".csv"):
             raise CommandError(f"Unsupported file format {data_file}")
 
+        if mondo_file and not os.path.isfile(mondo_file):
+            raise CommandError(f"Invalid Mondo file {mondo_file}")
+
+        if options["workers"] < 1:
+            raise CommandError(f"Invalid number of workers {options['workers']}")
+
         # Define the mandatory input headers
         mandatory_headers = [
             "g2p id",
@@ -97,143 +131,292 @@ class Command(BaseCommand):
         for source_obj in source_list:
             g2p_sources[source_obj.name] = source_obj
 
-        with open(data_file, newline="") as fh_file:
-            data_reader = csv.DictReader(fh_file)
+        self.user_obj = user_obj
+        self.attrib_obj = attrib_obj
+        self.attrib_mapping_obj = attrib_mapping_obj
+        self.g2p_sources = g2p_sources
+        self.workers = options["workers"]
+        self.dry_run = options["dry_run"]
+
+        # Ontologies fetched from OLS or from the Mondo file
+        self.ontologies = {}
+        self.local_ontologies = None
+        if mondo_file:
+            self.local_ontologies = read_mondo_file(mondo_file)
+            self.stdout.write(
+                f"Read {len(self.local_ontologies)} Mondo terms from {mondo_file}"
+            )
 
-            # Check headers
-            if not all(
-                column in data_reader.fieldnames for column in mandatory_headers
-            ):
-                raise CommandError(
-                    f"Missing data. Mandatory fields are: {mandatory_headers}"
+        rows = self.read_data_file(data_file, mandatory_headers)
+        self.load_data(rows)
+        self.run_import(rows, data_file, options)
+
+    def load_data(self, rows):
+        """
+        Load the data used to validate the rows:
+            - records by G2P ID
+            - disease names (lower case)
+            - ontology accessions linked to each disease
+            - ontology terms of the Mondo IDs in the file
+        """
+        self.records = {
+            lgd_obj.stable_id.stable_id: lgd_obj
+            for lgd_obj in LocusGenotypeDisease.objects.select_related(
+                "stable_id", "disease"
+            )
+        }
+
+        # The lookup by name is case insensitive in MySQL
+        self.disease_names = {
+            name.lower() for name in Disease.objects.values_list("name", flat=True)
+        }
+
+        self.disease_ontologies = defaultdict(set)
+        for disease_id, accession in DiseaseOntologyTerm.objects.values_list(
+            "disease_id", "ontology_term__accession"
+        ):
+            self.disease_ontologies[disease_id].add(accession)
+
+        mondo_ids = set()
+        for row in rows:
+            parsed_row = self.parse_row(row)
+            if parsed_row:
+                mondo_ids.add(parsed_row[3])
+
+        self.ontology_terms = {
+            ontology_obj.accession: ontology_obj
+            for ontology_obj in OntologyTerm.objects.filter(accession__in=mondo_ids)
+        }
+
+    def get_ontologies(self, ontology_ids):
+        """
+        Fetch the Mondo IDs that are not in G2P yet.
+        The results are kept in memory for the next batches.
+        """
+        new_ids = [
+            ontology_id
+            for ontology_id in dict.fromkeys(ontology_ids)
+            if ontology_id not in self.ontology_terms
+            and ontology_id not in self.ontologies
+        ]
+
+        if self.local_ontologies is not None:
+            for ontology_id in new_ids:
+                self.ontologies[ontology_id] = self.local_ontologies.get(ontology_id)
+            return
+
+        for ontology_id, ontology in get_ontologies(
+            new_ids, "Mondo", self.workers
+        ).items():
+            if ontology == "query failed":
+                raise CommandError(f"Cannot query Mondo ID '{ontology_id}' from OLS")
+
+            self.ontologies[ontology_id] = ontology
+
+    def parse_row(self, row):
+        """
+        Returns the data of the row to import.
+        Returns None if the row does not have a Mondo ID to import.
+        """
+        g2p_id = row["g2p id"].strip()
+        disease_name = row["G2P disease name"].strip()
+        omim_id = row["OMIM"].strip()
+        ontology_to_add = row["exact match MONDO"].strip()
+        status = row["status"].strip()
+
+        if status == "DIFFERENT" or not ontology_to_add.startswith("MONDO"):
+            return None
+
+        source = get_ontology_source(ontology_to_add)
+
+        # Make sure Mondo always uses the same ID format
+        if source == "Mondo":
+            ontology_to_add = ontology_to_add.replace("_", ":")
+
+        return g2p_id, disease_name, omim_id, ontology_to_add, source
+
+    def replay_row(self, row):
+        # Rebuild the list of diseases already imported
+        parsed_row = self.parse_row(row)
+
+        if parsed_row:
+            disease_name, ontology_to_add = parsed_row[1], parsed_row[3]
+            if disease_name not in self.unique_diseases:
+                self.unique_diseases[disease_name] = {
+                    "ontology_to_add": ontology_to_add
+                }
+
+    def validate_row(self, row):
+        """
+        Validate one row against the data loaded before the import.
+        Returns the status of the row if it cannot be imported, or the data to import.
+        """
+        parsed_row = self.parse_row(row)
+
+        if not parsed_row:
+            return "skipped"
+
+        g2p_id, disease_name, omim_id, ontology_to_add, source = parsed_row
+
+        print(f"\n{g2p_id} -> to add {ontology_to_add}")
+
+        if disease_name in self.unique_diseases:
+            if ontology_to_add != self.unique_diseases[disease_name]["ontology_to_add"]:
+                logger.warning(
+                    f"Trying to add different ontology to same disease: {disease_name}"
                 )
+            # Skip this import - it was already imported
+            return "skipped"
+        else:
+            self.unique_diseases[disease_name] = {}
+            self.unique_diseases[disease_name]["ontology_to_add"] = ontology_to_add
+
+        # Save the disease name associated with the g2p id
+        record_disease = None
+        record_disease_obj = None
+        try:
+            record_obj = self.records[g2p_id]
+        except KeyError:
+            logger.warning(f"Cannot find record '{g2p_id}'")
+        else:
+            record_disease = record_obj.disease.name
+            record_disease_obj = record_obj.disease
+
+        if disease_name.lower() not in self.disease_names and record_disease:
+            # The disease from the file could be missing commas or small characters
+            record_disease_tmp = (
+                record_disease.replace(",", "").replace(".", "").lower()
+            )
+            if disease_name.lower() != record_disease_tmp:
+                logger.warning(
+                    f"Cannot find disease '{disease_name}'. Do you mean '{record_disease}'? Skipping '{ontology_to_add}'"
+                )
+                return "skipped"
+
+        current_disease_ontologies = (
+            self.disease_ontologies[record_disease_obj.id]
+            if record_disease_obj
+            else set()
+        )
 
-            for row in data_reader:
-                g2p_id = row["g2p id"].strip()
-                disease_name = row["G2P disease name"].strip()
-                omim_id = row["OMIM"].strip()
-                ontology_to_add = row["exact match MONDO"].strip()
-                status = row["status"].strip()
-
-                if status == "DIFFERENT" or not ontology_to_add.startswith("MONDO"):
-                    continue
-
-                print(f"\n{g2p_id} -> to add {ontology_to_add}")
-
-                source = get_ontology_source(ontology_to_add)
-                # Get the source ID in G2P
-                source_ontology_obj = g2p_sources[source]
-
-                # Make sure Mondo always uses the same ID format
-                if source == "Mondo":
-                    ontology_to_add = ontology_to_add.replace("_", ":")
-
-                if disease_name in unique_diseases:
-                    if (
-                        ontology_to_add
-                        != unique_diseases[disease_name]["ontology_to_add"]
-                    ):
-                        logger.warning(
-                            f"Trying to add different ontology to same disease: {disease_name}"
-                        )
-                    # Skip this import - it was already imported
-                    continue
-                else:
-                    unique_diseases[disease_name] = {}
-                    unique_diseases[disease_name]["ontology_to_add"] = ontology_to_add
-
-                # Save the disease name associated with the g2p id
-                record_disease = None
-                record_disease_obj = None
-                try:
-                    record_obj = LocusGenotypeDisease.objects.get(
-                        stable_id__stable_id=g2p_id
-                    )
-                except LocusGenotypeDisease.DoesNotExist:
-                    logger.warning(f"Cannot find record '{g2p_id}'")
-                else:
-                    record_disease = record_obj.disease.name
-                    record_disease_obj = record_obj.disease
-
-                try:
-                    Disease.objects.get(name=disease_name)
-                except Disease.DoesNotExist:
-                    if record_disease:
-                        # The disease from the file could be missing commas or small characters
-                        record_disease_tmp = (
-                            record_disease.replace(",", "").replace(".", "").lower()
-                        )
-                        if disease_name.lower() != record_disease_tmp:
-                            logger.warning(
-                                f"Cannot find disease '{disease_name}'. Do you mean '{record_disease}'? Skipping '{ontology_to_add}'"
-                            )
-                            continue
-
-                current_disease_ontologies = (
-                    DiseaseOntologyTerm.objects.filter(disease__name=record_disease)
-                    .annotate(ontology_accession_tmp=F("ontology_term__accession"))
-                    .values_list("ontology_accession_tmp", flat=True)
+        if omim_id not in current_disease_ontologies:
+            logger.warning(
+                f"{omim_id} not found associated with disease '{disease_name}'. Skipping '{ontology_to_add}'\n"
+            )
+            return "skipped"
+
+        return ontology_to_add, source, record_disease_obj
+
+    def get_ontology_term(self, ontology_to_add, source):
+        """
+        Returns the ontology term of the Mondo ID.
+        If the term is not in G2P, returns a new (unsaved) OntologyTerm with the data from OLS.
+        Returns None if the Mondo ID is invalid.
+        """
+        if ontology_to_add in self.ontology_terms:
+            return self.ontology_terms[ontology_to_add]
+
+        ontology = self.ontologies.get(ontology_to_add)
+
+        if not ontology:
+            logger.warning(f"Invalid ontology {ontology_to_add}")
+            return None
+
+        ontology_term = ontology["label"]
+        ontology_id = ontology["obo_id"]
+        ontology_description = None
+
+        if "description" in ontology and len(ontology["description"]):
+            ontology_description = ontology["description"][0]
+
+        if not ontology_description:
+            ontology_description = ontology_term
+
+        if ontology_id != ontology_to_add:
+            logger.warning(f"Cannot find ontology '{ontology_to_add}' in {source}")
+
+        return OntologyTerm(
+            accession=ontology_to_add,
+            term=ontology_term,
+            description=ontology_description,
+            source=self.g2p_sources[source],
+            group_type=self.attrib_obj,
+        )
+
+    def import_batch(self, rows):
+        """
+        Import a batch of rows.
+        The Mondo IDs of the valid rows are fetched first, then the new ontology terms
+        and disease ontologies are inserted in bulk.
+        """
+        counts = Counter()
+        valid_rows = []
+
+        for row in rows:
+            validated_row = self.validate_row(row)
+
+            if isinstance(validated_row, str):
+                counts[validated_row] += 1
+            else:
+                valid_rows.append(validated_row)
+
+        self.get_ontologies([ontology_to_add for ontology_to_add, *_ in valid_rows])
+
+        # Ontology terms to insert (by accession)
+        new_ontology_terms = {}
+        rows_to_import = []
+
+        for ontology_to_add, source, disease_obj in valid_rows:
+            ontology_obj = new_ontology_terms.get(
+                ontology_to_add
+            ) or self.get_ontology_term(ontology_to_add, source)
+
+            if not ontology_obj:
+                counts["skipped"] += 1
+                continue
+
+            if ontology_obj.pk is None:
+                new_ontology_terms[ontology_to_add] = ontology_obj
+
+            rows_to_import.append((ontology_to_add, disease_obj))
+
+        batch_ontology_terms = {
+            ontology_obj.accession: ontology_obj
+            for ontology_obj in bulk_create_with_history(
+                list(new_ontology_terms.values()),
+                OntologyTerm,
+                default_user=self.user_obj,
+            )
+        }
+        # In a dry run the new terms are removed at the end of the batch
+        if not self.dry_run:
+            self.ontology_terms.update(batch_ontology_terms)
+
+        new_disease_ontologies = []
+
+        for ontology_to_add, disease_obj in rows_to_import:
+            if ontology_to_add in self.disease_ontologies[disease_obj.id]:
+                print(
+                    f"Ontology '{ontology_to_add}' already associated with disease '{disease_obj.name}'"
                 )
+                counts["already exists"] += 1
+                continue
+
+            # Add the disease ontology
+            new_disease_ontologies.append(
+                DiseaseOntologyTerm(
+                    ontology_term=self.ontology_terms.get(ontology_to_add)
+                    or batch_ontology_terms[ontology_to_add],
+                    disease=disease_obj,
+                    mapped_by_attrib=self.attrib_mapping_obj,
+                )
+            )
+            self.disease_ontologies[disease_obj.id].add(ontology_to_add)
+            print(f"Added ontology '{ontology_to_add}' to disease '{disease_obj.name}'")
+            counts["created"] += 1
+
+        bulk_create_with_history(
+            new_disease_ontologies, DiseaseOntologyTerm, default_user=self.user_obj
+        )
 
-                if omim_id not in current_disease_ontologies:
-                    logger.warning(
-                        f"{omim_id} not found associated with disease '{disease_name}'. Skipping '{ontology_to_add}'\n"
-                    )
-                    continue
-
-                # Get the ontology data from the source
-                ontology = get_ontology(ontology_to_add, source)
-
-                if not ontology:
-                    logger.warning(f"Invalid ontology {ontology_to_add}")
-                    continue
-
-                ontology_term = ontology["label"]
-                ontology_id = ontology["obo_id"]
-                ontology_description = None
-
-                if "description" in ontology and len(ontology["description"]):
-                    ontology_description = ontology["description"][0]
-
-                if not ontology_description:
-                    ontology_description = ontology_term
-
-                if ontology_id != ontology_to_add:
-                    logger.warning(
-                        f"Cannot find ontology '{ontology_to_add}' in {source}"
-                    )
-
-                try:
-                    ontology_obj = OntologyTerm.objects.get(accession=ontology_to_add)
-                except OntologyTerm.DoesNotExist:
-                    ontology_obj = OntologyTerm(
-                        accession=ontology_to_add,
-                        term=ontology_term,
-                        description=ontology_description,
-                        source=source_ontology_obj,
-                        group_type=attrib_obj,
-                    )
-                    ontology_obj._history_user = user_obj
-                    ontology_obj.save()
-
-                try:
-                    DiseaseOntologyTerm.objects.get(
-                        ontology_term=ontology_obj,
-                        disease=record_disease_obj,
-                    )
-                except DiseaseOntologyTerm.DoesNotExist:
-                    # Add the disease ontology
-                    disease_ontology_obj = DiseaseOntologyTerm(
-                        ontology_term=ontology_obj,
-                        disease=record_disease_obj,
-                        mapped_by_attrib=attrib_mapping_obj,
-                    )
-                    disease_ontology_obj._history_user = user_obj
-                    disease_ontology_obj.save()
-                    print(
-                        f"Added ontology '{ontology_to_add}' to disease '{record_disease}'"
-                    )
-                else:
-                    print(
-                        f"Ontology '{ontology_to_add}' already associated with disease '{record_disease}'"
-                    )
+        return counts
@@ -0,0 +1,185 @@
+import csv
+import os.path
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from gene2phenotype_app.models import (
+    GeneReference,
+    GeneReferenceSynonym,
+    GeneReferenceMim,
+)
+
+
+"""
+Command to load the reference genes used to validate the genes (see utils/locus_utils.py).
+The existing reference genes are replaced by the genes in the input files.
+
+Input files:
+    --hgnc_file: HGNC complete set (tab-separated)
+                 https://storage.googleapis.com/public-download-files/hgnc/tsv/tsv/hgnc_complete_set.txt
+                 Mandatory columns: hgnc_id, symbol, name, status, prev_symbol, alias_symbol, ensembl_gene_id
+    --mim_file: OMIM morbidmap.txt (optional)
+                Columns: Phenotype, Gene/Locus And Other Related Symbols, MIM Number, Cyto Location
+
+How to run the command:
+python manage.py load_gene_reference --hgnc_file <hgnc_complete_set.txt> [--mim_file <morbidmap.txt>]
+"""
+
+
+class Command(BaseCommand):
+    help = "Load the reference genes from HGNC and OMIM"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hgnc_file",
+            required=True,
+            type=str,
+            help="HGNC complete set (tab-separated)",
+        )
+        parser.add_argument(
+            "--mim_file",
+            required=False,
+            type=str,
+            help="OMIM morbidmap file",
+        )
+        parser.add_argument(
+            "--batch_size",
+            required=False,
+            type=int,
+            default=5000,
+            help="Number of rows inserted in each query (default: 5000)",
+        )
+
+    def handle(self, *args, **options):
+        hgnc_file = options["hgnc_file"]
+        mim_file = options["mim_file"]
+        batch_size = options["batch_size"]
+
+        for input_file in [hgnc_file, mim_file]:
+            if input_file and not os.path.isfile(input_file):
+                raise CommandError(f"Invalid file {input_file}")
+
+        genes, synonyms = self.read_hgnc_file(hgnc_file)
+        mim_diseases = self.read_mim_file(mim_file) if mim_file else []
+
+        with transaction.atomic():
+            GeneReferenceMim.objects.all().delete()
+            GeneReferenceSynonym.objects.all().delete()
+            GeneReference.objects.all().delete()
+
+            GeneReference.objects.bulk_create(genes, batch_size=batch_size)
+
+            # bulk_create does not set the primary keys in MySQL
+            gene_ids = dict(GeneReference.objects.values_list("symbol", "id"))
+
+            GeneReferenceSynonym.objects.bulk_create(
+                [
+                    GeneReferenceSynonym(
+                        gene_id=gene_ids[symbol], synonym=synonym, type=synonym_type
+                    )
+                    for symbol, synonym, synonym_type in synonyms
+                ],
+                batch_size=batch_size,
+            )
+
+            gene_mim = {}
+            for symbols, mim_id, disease in mim_diseases:
+                # The first symbol of the locus that is a reference gene
+                symbol = next((s for s in symbols if s in gene_ids), None)
+                if symbol and (symbol, mim_id) not in gene_mim:
+                    gene_mim[(symbol, mim_id)] = GeneReferenceMim(
+                        gene_id=gene_ids[symbol], mim_id=mim_id, disease=disease
+                    )
+
+            GeneReferenceMim.objects.bulk_create(
+                gene_mim.values(), batch_size=batch_size
+            )
+
+        self.stdout.write(
+            f"Loaded {len(genes)} genes, {len(synonyms)} synonyms and {len(gene_mim)} MIM morbid diseases"
+        )
+
+    def read_hgnc_file(self, hgnc_file):
+        """
+        Read the HGNC file. Only the approved genes are imported.
+        Returns the list of genes (GeneReference) and the list of synonyms (symbol, synonym, type).
+        """
+        mandatory_headers = [
+            "hgnc_id",
+            "symbol",
+            "name",
+            "status",
+            "prev_symbol",
+            "alias_symbol",
+            "ensembl_gene_id",
+        ]
+        genes = []
+        synonyms = []
+
+        with open(hgnc_file, newline="") as fh:
+            data_reader = csv.DictReader(fh, delimiter="\t")
+
+            if not all(
+                column in (data_reader.fieldnames or []) for column in mandatory_headers
+            ):
+                raise CommandError(
+                    f"Missing data. Mandatory fields are: {mandatory_headers}"
+                )
+
+            for row in data_reader:
+                if row["status"] != "Approved":
+                    continue
+
+                symbol = row["symbol"].strip()
+                genes.append(
+                    GeneReference(
+                        symbol=symbol,
+                        hgnc_id=row["hgnc_id"].strip(),
+                        name=row["name"].strip()[:255] or None,
+                        ensembl_id=row["ensembl_gene_id"].strip() or None,
+                    )
+                )
+
+                # Multiple values are separated by '|'
+                unique_synonyms = set()
+                for synonym_type, column in [
+                    ("previous", "prev_symbol"),
+                    ("alias", "alias_symbol"),
+                ]:
+                    for synonym in row[column].split("|"):
+                        synonym = synonym.strip()
+                        if synonym and synonym not in unique_synonyms:
+                            unique_synonyms.add(synonym)
+                            synonyms.append((symbol, synonym, synonym_type))
+
+        return genes, synonyms
+
+    def read_mim_file(self, mim_file):
+        """
+        Read the OMIM morbidmap file.
+        Returns the list of diseases (gene symbols, MIM ID, disease name).
+        Diseases without a MIM ID are not imported.
+        """
+        mim_diseases = []
+
+        with open(mim_file) as fh:
+            for line in fh:
+                if line.startswith("#") or not line.strip():
+                    continue
+
+                columns = line.rstrip("\n").split("\t")
+                if len(columns) < 3:
+                    continue
+
+                # Example: "Joubert syndrome 5, 610188 (3)"
+                match = re.match(r"^(.+),\s*(\d{6})\s*\(\d\)$", columns[0].strip())
+                if not match:
+                    continue
+
+                disease = re.sub(r"[\[\]\{\}\?]", "", match.group(1)).strip()
+                symbols = [symbol.strip() for symbol in columns[1].split(",")]
+                mim_diseases.append((symbols, match.group(2), disease[:255]))
+
+        return mim_diseases
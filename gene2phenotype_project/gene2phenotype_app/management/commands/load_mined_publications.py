@@ -1,10 +1,11 @@
-import csv
 import logging
 import re
 import os.path
+from collections import Counter
 
 from django.db.models import Count, F
-from django.core.management.base import BaseCommand, CommandError
+from django.core.management.base import CommandError
+from simple_history.utils import bulk_create_with_history
 
 from ...utils import get_publication, clean_title, get_date_now
 
@@ -16,12 +17,15 @@ from gene2phenotype_app.models import (
     User,
 )
 
+from .importer import BaseImportCommand
+
 
 """
 Command to load mined publications into G2P database.
 The mined publications are going to be saved into tables 'mined_publications' and 'lgd_mined_publications'.
-The command does not perform a bulk import because we want to populate the history tables - bulk updates
-do not insert rows into history tables.
+The rows are imported in batches and the import can be resumed (see importer/BaseImportCommand.py).
+By default the rows of a batch are inserted one by one. The option --bulk preloads the existing data of
+the batch and inserts the new rows with one query, the history rows are inserted in bulk with the same user.
 
 Supported input file: csv
 File format is the following:
@@ -29,13 +33,15 @@ PMID\tG2P_IDs
 
 How to run the command:
 python manage.py load_mined_publications --data_file <csv data file> --email <user account email>
+                                         [--bulk] [--batch_size <rows>] [--resume] [--dry_run]
 """
 
 logger = logging.getLogger(__name__)
 
 
-class Command(BaseCommand):
+class Command(BaseImportCommand):
     def add_arguments(self, parser):
+        super().add_arguments(parser)
         parser.add_argument(
             "--data_file",
             required=True,
@@ -48,6 +54,12 @@ class Command(BaseCommand):
             type=str,
             help="User email to store in the history table",
         )
+        parser.add_argument(
+            "--bulk",
+            required=False,
+            action="store_true",
+            help="Insert the data of each batch in bulk",
+        )
 
     def handle(self, *args, **options):
         data_file = options["data_file"]
@@ -69,164 +81,316 @@ class Command(BaseCommand):
         except User.DoesNotExist:
             raise CommandError(f"Invalid user {input_email}")
 
-        invalid_g2p_ids = set()
+        all_records, publication_counts = self.get_all_record_publications()
+
+        # Read the file once - count the mined publications of each G2P ID
+        # The counts include all rows, also the rows already imported if the import is resumed
+        rows = self.read_data_file(data_file, mandatory_headers)
+
+        self.bulk = options["bulk"]
+        self.user_obj = user_obj
+        self.all_records = all_records
+        self.g2p_records_skip = self.count_mined_publications(rows)
+        self.invalid_g2p_ids = set()
+
+        # If the import is resumed the invalid G2P IDs of the rows already imported
+        # are written again by replay_row()
+        with open(output_file, "w") as wr:
+            self.wr = wr
+            self.run_import(rows, data_file, options)
+
+    def count_mined_publications(self, rows):
+        """
+        Returns the number of mined publications of each G2P ID.
+        """
         g2p_records_skip = {}
-        # filter_year = 2000
 
-        all_records, publication_counts = self.get_all_record_publications()
+        for row in rows:
+            g2p_ids = row["G2P_IDs"].strip()
+            list_g2p_ids = g2p_ids.split(";")
 
-        # Pre-process the file
-        with open(data_file, newline="") as fh:
-            data_reader = csv.DictReader(fh)
+            for g2p_id in list_g2p_ids:
+                # Clean the IDs
+                new_g2p_id = re.sub(r'[\*."`)]+', "", g2p_id).strip()
 
-            # Check headers
-            if not all(
-                column in data_reader.fieldnames for column in mandatory_headers
-            ):
-                raise CommandError(
-                    f"Missing data. Mandatory fields are: {mandatory_headers}"
+                if new_g2p_id not in g2p_records_skip:
+                    g2p_records_skip[new_g2p_id] = 1
+                else:
+                    g2p_records_skip[new_g2p_id] += 1
+
+        return g2p_records_skip
+
+    def get_valid_row(self, row):
+        """
+        Returns the PMID and the list of G2P IDs of the row.
+        Returns None if the row is invalid.
+        """
+        pmid = row["PMID"].strip()
+        g2p_ids = row["G2P_IDs"].strip()
+
+        if not pmid or not g2p_ids or not g2p_ids.startswith("G2P"):
+            logger.warning(f"Invalid PMID or G2P IDs in row {str(row)}")
+            return None
+
+        return pmid, g2p_ids.split(";")
+
+    def get_valid_records(self, list_g2p_ids):
+        """
+        Returns the records (G2P ID and LocusGenotypeDisease) of the row to be imported.
+        Invalid G2P IDs are added to 'invalid_g2p_ids' and written to the output file.
+        """
+        # to make sure we don't try to insert duplicates
+        final_list_g2p_ids = {}
+
+        for g2p_id in list_g2p_ids:
+            # Clean the IDs
+            new_g2p_id = re.sub(r'[\*."`)]+', "", g2p_id).strip()
+
+            if self.g2p_records_skip[new_g2p_id] >= 100:
+                logger.warning(
+                    f"G2P ID '{new_g2p_id}' has >= 100 mined publications. Skipping import."
                 )
+                continue
 
-            for row in data_reader:
-                pmid = row["PMID"].strip()
-                g2p_ids = row["G2P_IDs"].strip()
-                list_g2p_ids = g2p_ids.split(";")
+            if (
+                new_g2p_id not in final_list_g2p_ids
+                and new_g2p_id not in self.invalid_g2p_ids
+            ):
+                # Get the LocusGenotypeDisease for the G2P ID
+                try:
+                    lgd_obj = self.all_records[new_g2p_id]
+                except KeyError:
+                    # The record could have been merged or deleted
+                    logger.warning(f"Invalid G2P ID '{new_g2p_id}'. Skipping import.")
+                    self.add_invalid_g2p_id(new_g2p_id)
+                    continue
+
+                final_list_g2p_ids[new_g2p_id] = lgd_obj
 
-                for g2p_id in list_g2p_ids:
-                    # Clean the IDs
-                    new_g2p_id = re.sub(r'[\*."`)]+', "", g2p_id).strip()
+        return final_list_g2p_ids.items()
 
-                    if new_g2p_id not in g2p_records_skip:
-                        g2p_records_skip[new_g2p_id] = 1
-                    else:
-                        g2p_records_skip[new_g2p_id] += 1
+    def add_invalid_g2p_id(self, g2p_id):
+        """
+        Add the G2P ID to 'invalid_g2p_ids' and write it to the output file.
+        """
+        self.invalid_g2p_ids.add(g2p_id)
+        self.wr.write(g2p_id.replace(",", " ") + "\n")
 
-        # Open the file again to import the data
-        with open(data_file, newline="") as fh_file, open(output_file, "w") as wr:
-            data_reader = csv.DictReader(fh_file)
+    def replay_row(self, row):
+        """
+        Rebuild the invalid G2P IDs of a row already imported.
+        The output file is rewritten when the import is resumed, each invalid G2P ID is written once.
+        """
+        pmid = row["PMID"].strip()
+        g2p_ids = row["G2P_IDs"].strip()
 
-            # Check headers
-            if not all(
-                column in data_reader.fieldnames for column in mandatory_headers
+        if not pmid or not g2p_ids or not g2p_ids.startswith("G2P"):
+            return
+
+        for g2p_id in g2p_ids.split(";"):
+            new_g2p_id = re.sub(r'[\*."`)]+', "", g2p_id).strip()
+
+            if (
+                self.g2p_records_skip[new_g2p_id] < 100
+                and new_g2p_id not in self.all_records
+                and new_g2p_id not in self.invalid_g2p_ids
             ):
-                raise CommandError(
-                    f"Missing data. Mandatory fields are: {mandatory_headers}"
+                self.add_invalid_g2p_id(new_g2p_id)
+
+    def get_mined_publication(self, pmid):
+        """
+        Fetch the publication from EuropePMC and returns a new (unsaved) MinedPublication.
+        Returns None if the PMID is invalid.
+        """
+        response = get_publication(int(pmid))
+        if response["hitCount"] == 0:
+            logger.warning(f"Invalid PMID '{pmid}'. Skipping import.")
+            return None
+        title = clean_title(response["result"]["title"])
+        year = response["result"]["pubYear"]
+
+        # Filter the publications
+        # TODO: review
+        # Filter by date
+        # if int(year) <= filter_year:
+        #     logger.warning(f"Skipping old PMID '{pmid}' ({year})")
+        #     continue
+
+        return MinedPublication(
+            pmid=int(pmid),
+            title=title,
+            year=year,
+            date_upload=get_date_now(),
+        )
+
+    def import_batch(self, rows):
+        if self.bulk:
+            return self.bulk_import(rows)
+
+        return super().import_batch(rows)
+
+    def import_row(self, row):
+        """
+        Import one row.
+        Returns 'imported' if at least one record-mined publication was inserted.
+        """
+        # filter_year = 2000
+        valid_row = self.get_valid_row(row)
+        if not valid_row:
+            return "invalid"
+
+        pmid, list_g2p_ids = valid_row
+        status_row = "skipped"
+
+        try:
+            mined_publication_obj = MinedPublication.objects.get(pmid=int(pmid))
+        except MinedPublication.DoesNotExist:
+            mined_publication_obj = self.get_mined_publication(pmid)
+            if not mined_publication_obj:
+                return "invalid"
+
+            # Insert mined publication
+            mined_publication_obj._history_user = self.user_obj
+            mined_publication_obj.save()
+        # else:
+        # The mined publication is in g2p but the date could still be old
+        # Check the year of the publication and skip if it's older than 'filter_year'
+        # if mined_publication_obj.year < filter_year:
+        #     logger.warning(f"Skipping old PMID '{pmid}' ({year})")
+        #     continue
+
+        for new_g2p_id, lgd_obj in self.get_valid_records(list_g2p_ids):
+            # Check number of publications linked to the record
+            # n_publications = 0
+            # if new_g2p_id in publication_counts:
+            #     n_publications = publication_counts[new_g2p_id]
+
+            # confidence = lgd_obj.confidence.value
+            # if n_publications >= 10 and (confidence == "definitive" or confidence == "strong") and int(mined_publication_obj.year) < 2020:
+            #     logger.warning(
+            #         f"G2P ID '{new_g2p_id}' (definitive) with {n_publications} publications. Skipping import."
+            #     )
+            #     continue
+
+            # Check if LGDMinedPublication already exists
+            try:
+                LGDMinedPublication.objects.get(
+                    lgd=lgd_obj, mined_publication=mined_publication_obj
                 )
+            except LGDMinedPublication.DoesNotExist:
+                # Insert the LGDMinedPublication obj
+                # Before insertion we need to know if the LGD-publication association already exists
+                try:
+                    LGDPublication.objects.get(
+                        lgd=lgd_obj, publication__pmid=pmid, is_deleted=0
+                    )
+                except LGDPublication.DoesNotExist:
+                    status = "mined"
+                else:
+                    status = "curated"
+
+                lgd_mined_pub_obj = LGDMinedPublication(
+                    lgd=lgd_obj,
+                    mined_publication=mined_publication_obj,
+                    status=status,
+                    comment=None,
+                )
+                lgd_mined_pub_obj._history_user = self.user_obj
+                lgd_mined_pub_obj.save()
+                status_row = "imported"
+            else:
+                logger.warning(f"{new_g2p_id}-{pmid} already exists. Skipping import.")
 
-            for row in data_reader:
-                pmid = row["PMID"].strip()
-                g2p_ids = row["G2P_IDs"].strip()
+        return status_row
+
+    def bulk_import(self, rows):
+        """
+        Import a batch of rows in bulk.
+        The existing mined publications, the existing (lgd, pmid) pairs and the curated
+        (lgd, pmid) pairs of the batch are preloaded with one query each.
+        New rows and their history rows are inserted with bulk_create_with_history.
+        Returns the same counts as import_row().
+        """
+        counts = Counter()
+        valid_rows = []
+
+        for row in rows:
+            valid_row = self.get_valid_row(row)
+            if valid_row:
+                valid_rows.append((int(valid_row[0]), valid_row[1]))
+            else:
+                counts["invalid"] += 1
+
+        # Keep the PMIDs in the same order as the file
+        pmids = list(dict.fromkeys(pmid for pmid, list_g2p_ids in valid_rows))
+
+        mined_publications = {
+            mined_publication_obj.pmid: mined_publication_obj
+            for mined_publication_obj in MinedPublication.objects.filter(
+                pmid__in=pmids
+            )
+        }
+        existing_pairs = set(
+            LGDMinedPublication.objects.filter(
+                mined_publication__pmid__in=pmids
+            ).values_list("lgd_id", "mined_publication__pmid")
+        )
+        curated_pairs = set(
+            LGDPublication.objects.filter(
+                publication__pmid__in=pmids, is_deleted=0
+            ).values_list("lgd_id", "publication__pmid")
+        )
 
-                if not pmid or not g2p_ids or not g2p_ids.startswith("G2P"):
-                    logger.warning(f"Invalid PMID or G2P IDs in row {str(row)}")
+        # Fetch the new publications from EuropePMC
+        new_mined_publications = []
+        for pmid in pmids:
+            if pmid not in mined_publications:
+                mined_publication_obj = self.get_mined_publication(pmid)
+                if mined_publication_obj:
+                    new_mined_publications.append(mined_publication_obj)
+
+        for mined_publication_obj in bulk_create_with_history(
+            new_mined_publications, MinedPublication, default_user=self.user_obj
+        ):
+            mined_publications[mined_publication_obj.pmid] = mined_publication_obj
+
+        new_lgd_mined_publications = []
+        for pmid, list_g2p_ids in valid_rows:
+            # Invalid PMID
+            if pmid not in mined_publications:
+                counts["invalid"] += 1
+                continue
+
+            status_row = "skipped"
+
+            for new_g2p_id, lgd_obj in self.get_valid_records(list_g2p_ids):
+                if (lgd_obj.id, pmid) in existing_pairs:
+                    logger.warning(
+                        f"{new_g2p_id}-{pmid} already exists. Skipping import."
+                    )
                     continue
 
-                list_g2p_ids = g2p_ids.split(";")
-                # to make sure we don't try to insert duplicates
-                final_list_g2p_ids = set()
+                existing_pairs.add((lgd_obj.id, pmid))
 
-                try:
-                    mined_publication_obj = MinedPublication.objects.get(pmid=int(pmid))
-                except MinedPublication.DoesNotExist:
-                    response = get_publication(int(pmid))
-                    if response["hitCount"] == 0:
-                        logger.warning(f"Invalid PMID '{pmid}'. Skipping import.")
-                        continue
-                    title = clean_title(response["result"]["title"])
-                    year = response["result"]["pubYear"]
-
-                    # Filter the publications
-                    # TODO: review
-                    # Filter by date
-                    # if int(year) <= filter_year:
-                    #     logger.warning(f"Skipping old PMID '{pmid}' ({year})")
-                    #     continue
-
-                    # Insert mined publication
-                    mined_publication_obj = MinedPublication(
-                        pmid=int(pmid),
-                        title=title,
-                        year=year,
-                        date_upload=get_date_now(),
+                new_lgd_mined_publications.append(
+                    LGDMinedPublication(
+                        lgd=lgd_obj,
+                        mined_publication=mined_publications[pmid],
+                        status=(
+                            "curated" if (lgd_obj.id, pmid) in curated_pairs else "mined"
+                        ),
+                        comment=None,
                     )
-                    mined_publication_obj._history_user = user_obj
-                    mined_publication_obj.save()
-                # else:
-                    # The mined publication is in g2p but the date could still be old
-                    # Check the year of the publication and skip if it's older than 'filter_year'
-                    # if mined_publication_obj.year < filter_year:
-                    #     logger.warning(f"Skipping old PMID '{pmid}' ({year})")
-                    #     continue
-
-                for g2p_id in list_g2p_ids:
-                    # Clean the IDs
-                    new_g2p_id = re.sub(r'[\*."`)]+', "", g2p_id).strip()
-
-                    if g2p_records_skip[new_g2p_id] >= 100:
-                        logger.warning(
-                            f"G2P ID '{new_g2p_id}' has >= 100 mined publications. Skipping import."
-                        )
-                        continue
-
-                    if (
-                        new_g2p_id not in final_list_g2p_ids
-                        and new_g2p_id not in invalid_g2p_ids
-                    ):
-                        # Get the LocusGenotypeDisease for the G2P ID
-                        try:
-                            lgd_obj = all_records[new_g2p_id]
-                        except KeyError:
-                            # The record could have been merged or deleted
-                            logger.warning(
-                                f"Invalid G2P ID '{new_g2p_id}'. Skipping import."
-                            )
-                            invalid_g2p_ids.add(new_g2p_id)
-                            wr.write(new_g2p_id.replace(",", " ") + "\n")
-                            continue
-
-                        final_list_g2p_ids.add(new_g2p_id)
-
-                        # Check number of publications linked to the record
-                        # n_publications = 0
-                        # if new_g2p_id in publication_counts:
-                        #     n_publications = publication_counts[new_g2p_id]
-
-                        # confidence = lgd_obj.confidence.value
-                        # if n_publications >= 10 and (confidence == "definitive" or confidence == "strong") and int(mined_publication_obj.year) < 2020:
-                        #     logger.warning(
-                        #         f"G2P ID '{new_g2p_id}' (definitive) with {n_publications} publications. Skipping import."
-                        #     )
-                        #     continue
-
-                        # Check if LGDMinedPublication already exists
-                        try:
-                            LGDMinedPublication.objects.get(
-                                lgd=lgd_obj, mined_publication=mined_publication_obj
-                            )
-                        except LGDMinedPublication.DoesNotExist:
-                            # Insert the LGDMinedPublication obj
-                            # Before insertion we need to know if the LGD-publication association already exists
-                            try:
-                                LGDPublication.objects.get(
-                                    lgd=lgd_obj, publication__pmid=pmid, is_deleted=0
-                                )
-                            except LGDPublication.DoesNotExist:
-                                status = "mined"
-                            else:
-                                status = "curated"
-
-                            lgd_mined_pub_obj = LGDMinedPublication(
-                                lgd=lgd_obj,
-                                mined_publication=mined_publication_obj,
-                                status=status,
-                                comment=None,
-                            )
-                            lgd_mined_pub_obj._history_user = user_obj
-                            lgd_mined_pub_obj.save()
-                        else:
-                            logger.warning(
-                                f"{new_g2p_id}-{pmid} already exists. Skipping import."
-                            )
+                )
+                status_row = "imported"
+
+            counts[status_row] += 1
+
+        bulk_create_with_history(
+            new_lgd_mined_publications, LGDMinedPublication, default_user=self.user_obj
+        )
+
+        return counts
 
     def get_all_record_publications(self):
         """
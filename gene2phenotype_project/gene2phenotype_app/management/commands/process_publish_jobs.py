@@ -0,0 +1,162 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework import serializers
+
+from ...utils import get_date_now
+
+from gene2phenotype_app.models import CurationData, PublishJob
+
+from gene2phenotype_app.serializers import CurationDataSerializer
+
+
+"""
+Command to publish the records queued by the publish endpoint (/curation/publish/<stable_id>/?async=true).
+For each job, the external data (EuropePMC publications) is fetched in parallel and then
+the record is published in a single transaction.
+
+How to run the command:
+python manage.py process_publish_jobs [--once] [--sleep <seconds>] [--max_workers <number of parallel requests>]
+"""
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Publish the records queued to be published"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            required=False,
+            action="store_true",
+            help="Process the queued jobs and exit",
+        )
+        parser.add_argument(
+            "--sleep",
+            required=False,
+            type=int,
+            default=5,
+            help="Number of seconds to wait before checking the queue again (default: 5)",
+        )
+        parser.add_argument(
+            "--max_workers",
+            required=False,
+            type=int,
+            default=4,
+            help="Maximum number of parallel requests to fetch external data (default: 4)",
+        )
+
+    def handle(self, *args, **options):
+        run_once = options["once"]
+        sleep_seconds = options["sleep"]
+        max_workers = options["max_workers"]
+
+        while True:
+            job_obj = self.get_next_job()
+
+            if job_obj is None:
+                if run_once:
+                    break
+                time.sleep(sleep_seconds)
+                continue
+
+            self.process_job(job_obj, max_workers)
+
+    def get_next_job(self):
+        """
+        Get the oldest job in the queue and set its status to 'fetching'.
+        The row is locked while it is updated, this way the command can run in parallel.
+        The jobs stopped before they finished are set to 'failed'.
+        """
+        stale_jobs = PublishJob.fail_stale_jobs()
+        if stale_jobs:
+            logger.warning(f"{stale_jobs} job(s) did not finish and were set to 'failed'")
+
+        with transaction.atomic():
+            job_obj = (
+                PublishJob.objects.select_for_update(skip_locked=True)
+                .filter(status="queued")
+                .order_by("id")
+                .first()
+            )
+
+            if job_obj is not None:
+                job_obj.status = "fetching"
+                job_obj.date_started = get_date_now()
+                job_obj.save()
+
+        return job_obj
+
+    def process_job(self, job_obj, max_workers):
+        """
+        Publish the record linked to the job.
+        The job status is updated to 'completed' or 'failed' when the job finishes.
+        """
+        stable_id = job_obj.stable_id.stable_id
+        user = job_obj.user
+
+        try:
+            curation_obj = CurationData.objects.get(
+                stable_id=job_obj.stable_id, user=user
+            )
+
+            serializer = CurationDataSerializer(context={"user": user})
+            serializer.validate_to_publish(curation_obj)
+
+            # Fetch the external data before opening the transaction
+            publication_responses = serializer.fetch_publications(
+                curation_obj, max_workers
+            )
+
+            job_obj.status = "publishing"
+            job_obj.save()
+
+            serializer.context["publication_responses"] = publication_responses
+
+            with transaction.atomic():
+                lgd_obj, check = serializer.publish(curation_obj)
+                # Delete entry from 'curation_data'
+                curation_obj.delete()
+
+        except CurationData.DoesNotExist:
+            self.update_job(
+                job_obj, "failed", f"Curation data not found for ID '{stable_id}'"
+            )
+        except serializers.ValidationError as e:
+            self.update_job(job_obj, "failed", self.get_error_message(e.detail))
+        except Exception as e:
+            logger.error(f"Failed to publish record ID '{stable_id}': {str(e)}")
+            self.update_job(
+                job_obj, "failed", f"Failed to publish record ID '{stable_id}'"
+            )
+        else:
+            message = f"Record '{lgd_obj.stable_id.stable_id}' published successfully"
+            if check:
+                message += ". Info: there is a monoallelic record with the same locus, disease and mechanism"
+            self.update_job(job_obj, "completed", message)
+
+    def update_job(self, job_obj, status, message):
+        job_obj.status = status
+        job_obj.message = message
+        job_obj.date_completed = get_date_now()
+        job_obj.save()
+
+        if status == "failed":
+            logger.warning(f"Job {job_obj.id}: {message}")
+        else:
+            self.stdout.write(f"Job {job_obj.id}: {message}")
+
+    def get_error_message(self, detail):
+        """
+        Returns the error message from the serializer validation error.
+        The error can be a dictionary {"error": <message>}, a list or a string.
+        """
+        if isinstance(detail, dict):
+            return " ".join(self.get_error_message(value) for value in detail.values())
+        if isinstance(detail, list):
+            return " ".join(self.get_error_message(value) for value in detail)
+
+        return str(detail)
@@ -0,0 +1,148 @@
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from .db_router import use_replica, replica_is_available
+
+logger = logging.getLogger(__name__)
+
+# Number of requests, new connections and reused connections by endpoint (url name)
+connection_metrics = {}
+
+_metrics_lock = threading.Lock()
+_request_state = threading.local()
+
+
+def count_new_connection(sender, connection, **kwargs):
+    """
+    Count the connections opened while processing a request.
+    """
+    if getattr(_request_state, "new_connections", None) is not None:
+        _request_state.new_connections += 1
+
+
+connection_created.connect(count_new_connection)
+
+
+def get_connection_metrics() -> dict:
+    """
+    Returns a copy of the connection metrics by endpoint.
+    Example: {"search": {"requests": 10, "new_connections": 1, "reused_connections": 9}}
+    """
+    with _metrics_lock:
+        return {
+            endpoint: dict(metrics) for endpoint, metrics in connection_metrics.items()
+        }
+
+
+def reset_connection_metrics() -> None:
+    with _metrics_lock:
+        connection_metrics.clear()
+
+
+class DBConnectionMetricsMiddleware:
+    """
+    Count the new and reused database connections of each endpoint.
+    A connection is reused if it was already open at the start of the request
+    (persistent connections, see CONN_MAX_AGE) and no new connection was opened.
+    Enabled by the setting DB_CONNECTION_METRICS.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        was_open = connections["default"].connection is not None
+        _request_state.new_connections = 0
+
+        try:
+            response = self.get_response(request)
+        finally:
+            new_connections = _request_state.new_connections
+            _request_state.new_connections = None
+
+        endpoint = (
+            request.resolver_match.url_name if request.resolver_match else "unknown"
+        )
+        reused = was_open and not new_connections
+
+        with _metrics_lock:
+            metrics = connection_metrics.setdefault(
+                endpoint,
+                {"requests": 0, "new_connections": 0, "reused_connections": 0},
+            )
+            metrics["requests"] += 1
+            metrics["new_connections"] += new_connections
+            metrics["reused_connections"] += int(reused)
+
+        logger.debug(
+            f"{endpoint}: {new_connections} new connection(s), reused connection: {reused}"
+        )
+
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Send the reads of the public GET requests to the read replica (see db_router.py).
+    A request reads from the replica if:
+        - it is a GET/HEAD request from an anonymous user, or to an export endpoint
+          (setting REPLICA_EXPORT_ENDPOINTS). A user with an access token or a refresh
+          token (the refresh token is checked against the blacklist) is not anonymous
+        - the user did not write data in the last REPLICA_PIN_SECONDS (read-your-writes)
+        - the replica lag is below REPLICA_MAX_LAG
+    Enabled by the setting REPLICA_ROUTING.
+    """
+
+    # Cookie set after a write, the requests with this cookie use the default database
+    PIN_COOKIE = "use_primary_db"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            use_replica.set(False)
+
+        if (
+            settings.REPLICA_ROUTING
+            and request.method not in ("GET", "HEAD", "OPTIONS")
+            and response.status_code < 400
+        ):
+            response.set_cookie(
+                self.PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                secure=settings.SIMPLE_JWT["AUTH_COOKIE_SECURE"],
+                httponly=True,
+                samesite="Lax",
+            )
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not settings.REPLICA_ROUTING or request.method not in ("GET", "HEAD"):
+            return None
+
+        if request.COOKIES.get(self.PIN_COOKIE):
+            return None
+
+        is_anonymous = (
+            settings.SIMPLE_JWT["AUTH_COOKIE"] not in request.COOKIES
+            and settings.SIMPLE_JWT["REFRESH_COOKIE"] not in request.COOKIES
+            and "HTTP_AUTHORIZATION" not in request.META
+        )
+        is_export = (
+            request.resolver_match is not None
+            and request.resolver_match.url_name in settings.REPLICA_EXPORT_ENDPOINTS
+        )
+
+        if (is_anonymous or is_export) and replica_is_available():
+            use_replica.set(True)
+
+        return None
@@ -0,0 +1,65 @@
+# Generated by Django 5.1.14 on 2026-10-19 09:45
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gene2phenotype_app", "0013_create_user_group"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PublishJob",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("queued", "Queued"),
+                            ("fetching", "Fetching external data"),
+                            ("publishing", "Publishing"),
+                            ("completed", "Completed"),
+                            ("failed", "Failed"),
+                        ],
+                        default="queued",
+                        max_length=20,
+                    ),
+                ),
+                ("message", models.TextField(default=None, null=True)),
+                ("date_created", models.DateTimeField()),
+                ("date_started", models.DateTimeField(default=None, null=True)),
+                ("date_completed", models.DateTimeField(default=None, null=True)),
+                (
+                    "stable_id",
+                    models.ForeignKey(
+                        db_column="stable_id",
+                        on_delete=django.db.models.deletion.PROTECT,
+                        to="gene2phenotype_app.g2pstableid",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "publish_job",
+                "indexes": [
+                    models.Index(
+                        fields=["status"], name="publish_job_status_6ee137_idx"
+                    ),
+                    models.Index(
+                        fields=["stable_id"], name="publish_job_stable__9cc604_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
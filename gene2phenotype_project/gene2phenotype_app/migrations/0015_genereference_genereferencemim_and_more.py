@@ -0,0 +1,81 @@
+# Generated by Django 5.1.14 on 2026-10-19 10:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gene2phenotype_app", "0014_publishjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GeneReference",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("symbol", models.CharField(max_length=100, unique=True)),
+                ("hgnc_id", models.CharField(max_length=50, unique=True)),
+                (
+                    "name",
+                    models.CharField(default=None, max_length=255, null=True),
+                ),
+                (
+                    "ensembl_id",
+                    models.CharField(default=None, max_length=50, null=True),
+                ),
+            ],
+            options={
+                "db_table": "gene_reference",
+                "indexes": [
+                    models.Index(
+                        fields=["ensembl_id"], name="gene_refere_ensembl_140e27_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="GeneReferenceMim",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("mim_id", models.CharField(max_length=50)),
+                ("disease", models.CharField(max_length=255)),
+                (
+                    "gene",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        to="gene2phenotype_app.genereference",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "gene_reference_mim",
+                "unique_together": {("gene", "mim_id")},
+            },
+        ),
+        migrations.CreateModel(
+            name="GeneReferenceSynonym",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("synonym", models.CharField(max_length=100)),
+                ("type", models.CharField(max_length=20)),
+                (
+                    "gene",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        to="gene2phenotype_app.genereference",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "gene_reference_synonym",
+                "indexes": [
+                    models.Index(
+                        fields=["synonym"], name="gene_refere_synonym_dfd3c4_idx"
+                    )
+                ],
+                "unique_together": {("gene", "synonym")},
+            },
+        ),
+    ]
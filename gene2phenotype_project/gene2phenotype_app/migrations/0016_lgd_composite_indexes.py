@@ -0,0 +1,93 @@
+# Generated by Django 5.1.14 on 2026-10-19 11:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gene2phenotype_app', '0015_genereference_genereferencemim_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='historicallgdcomment',
+            index=models.Index(fields=['lgd', 'history_date'], name='gene2phenot_lgd_id_0324bb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='historicallgdcrosscuttingmodifier',
+            index=models.Index(fields=['lgd', 'history_date'], name='gene2phenot_lgd_id_f7223c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='historicallgdmolecularmechanismevidence',
+            index=models.Index(fields=['lgd', 'history_date'], name='gene2phenot_lgd_id_d9b858_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='historicallgdmolecularmechanismsynopsis',
+            index=models.Index(fields=['lgd', 'history_date'], name='gene2phenot_lgd_id_fe39a9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='historicallgdpanel',
+            index=models.Index(fields=['lgd', 'history_date'], name='gene2phenot_lgd_id_b54f72_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='historicallgdphenotype',
+            index=models.Index(fields=['lgd', 'history_date'], name='gene2phenot_lgd_id_a047b4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='historicallgdphenotypesummary',
+            index=models.Index(fields=['lgd', 'history_date'], name='gene2phenot_lgd_id_7d6901_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='historicallgdpublication',
+            index=models.Index(fields=['lgd', 'history_date'], name='gene2phenot_lgd_id_e35ea3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='historicallgdvariantgenccconsequence',
+            index=models.Index(fields=['lgd', 'history_date'], name='gene2phenot_lgd_id_18fb13_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='historicallgdvarianttype',
+            index=models.Index(fields=['lgd', 'history_date'], name='gene2phenot_lgd_id_26780d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='historicallgdvarianttypedescription',
+            index=models.Index(fields=['lgd', 'history_date'], name='gene2phenot_lgd_id_b47a75_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lgdcomment',
+            index=models.Index(fields=['lgd', 'is_deleted'], name='lgd_comment_lgd_id_6663ea_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lgdmolecularmechanismevidence',
+            index=models.Index(fields=['lgd', 'is_deleted'], name='lgd_mechani_lgd_id_649e57_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lgdpanel',
+            index=models.Index(fields=['panel', 'is_deleted', 'lgd'], name='lgd_panel_panel_i_046983_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='lgdpanel',
+            name='lgd_panel_panel_i_06e355_idx',
+        ),
+        migrations.AddIndex(
+            model_name='lgdphenotypesummary',
+            index=models.Index(fields=['lgd', 'is_deleted'], name='lgd_phenoty_lgd_id_ba236d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lgdpublication',
+            index=models.Index(fields=['lgd', 'is_deleted'], name='lgd_publica_lgd_id_e19e7e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lgdvariantgenccconsequence',
+            index=models.Index(fields=['lgd', 'is_deleted'], name='lgd_variant_lgd_id_31343e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lgdvarianttypedescription',
+            index=models.Index(fields=['lgd', 'is_deleted'], name='lgd_variant_lgd_id_aca13d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='locusgenotypedisease',
+            index=models.Index(fields=['is_deleted', 'date_review'], name='locus_genot_is_dele_c07180_idx'),
+        ),
+    ]
@@ -1,9 +1,25 @@
+from django.conf import settings
 from django.db import models
 from django.db.models import Q
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from simple_history.models import HistoricalRecords
 from rest_framework_simplejwt.tokens import RefreshToken
 from .utils import get_date_now
+from datetime import timedelta
+
+
+class LGDHistoricalRecords(HistoricalRecords):
+    """
+    History of the data linked to a G2P record (LGD).
+    The history is searched by record and date (see view ActivityLogs), the
+    historical table has an index (lgd, history_date).
+    The index history_date is created by simple-history.
+    """
+
+    def get_meta_options(self, model):
+        meta_fields = super().get_meta_options(model)
+        meta_fields["indexes"] = [models.Index(fields=["lgd", "history_date"])]
+        return meta_fields
 
 
 class G2PStableID(models.Model):
@@ -49,6 +65,69 @@ class CurationData(models.Model):
         ]
 
 
+class PublishJob(models.Model):
+    """
+    Represents a request to publish a record under curation in the background.
+    Jobs are queued by the publish endpoint and processed by the command 'process_publish_jobs'.
+        - status: 'queued', 'fetching' (external data), 'publishing' (db writes), 'completed' or 'failed'
+        - message: result of the publication or error message if the job failed
+    """
+
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("fetching", "Fetching external data"),
+        ("publishing", "Publishing"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    ]
+
+    id = models.AutoField(primary_key=True)
+    stable_id = models.ForeignKey(
+        "G2PStableID", on_delete=models.PROTECT, db_column="stable_id"
+    )
+    user = models.ForeignKey("User", on_delete=models.PROTECT)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="queued")
+    message = models.TextField(null=True, default=None)
+    date_created = models.DateTimeField(null=False)
+    date_started = models.DateTimeField(null=True, default=None)
+    date_completed = models.DateTimeField(null=True, default=None)
+
+    class Meta:
+        db_table = "publish_job"
+        indexes = [
+            models.Index(fields=["status"]),
+            models.Index(fields=["stable_id"]),
+        ]
+
+    @classmethod
+    def fail_stale_jobs(cls, stable_id=None):
+        """
+        Set the status of the jobs that started more than PUBLISH_JOB_TIMEOUT_SECONDS
+        ago and did not finish to 'failed'. These jobs were stopped before they finished
+        (e.g. the command was killed) and would block the record.
+        The publication runs in a transaction, a stopped job did not change the record.
+
+        Args:
+            stable_id (G2PStableID obj): only update the jobs of this record (optional)
+
+        Returns the number of jobs updated
+        """
+        date_now = get_date_now()
+        queryset = cls.objects.filter(
+            status__in=["fetching", "publishing"],
+            date_started__lt=date_now
+            - timedelta(seconds=settings.PUBLISH_JOB_TIMEOUT_SECONDS),
+        )
+        if stable_id is not None:
+            queryset = queryset.filter(stable_id=stable_id)
+
+        return queryset.update(
+            status="failed",
+            message="The job did not finish, please publish the record again",
+            date_completed=date_now,
+        )
+
+
 class LocusGenotypeDisease(models.Model):
     """
     Represents a G2P record (LGD record).
@@ -96,6 +175,7 @@ class LocusGenotypeDisease(models.Model):
             models.Index(fields=["confidence"]),
             models.Index(fields=["is_deleted"]),
             models.Index(fields=["is_reviewed"]),
+            models.Index(fields=["is_deleted", "date_review"]),
         ]
 
 
@@ -113,7 +193,7 @@ class LGDMolecularMechanismSynopsis(models.Model):
         on_delete=models.PROTECT,
     )
     is_deleted = models.SmallIntegerField(null=False, default=False)
-    history = HistoricalRecords()
+    history = LGDHistoricalRecords()
 
     class Meta:
         db_table = "lgd_mechanism_synopsis"
@@ -132,11 +212,12 @@ class LGDMolecularMechanismEvidence(models.Model):
     description = models.TextField(null=True, default=None)
     publication = models.ForeignKey("Publication", on_delete=models.PROTECT, null=True)
     is_deleted = models.SmallIntegerField(null=False, default=False)
-    history = HistoricalRecords()
+    history = LGDHistoricalRecords()
 
     class Meta:
         db_table = "lgd_mechanism_evidence"
         unique_together = ["lgd", "evidence", "publication"]
+        indexes = [models.Index(fields=["lgd", "is_deleted"])]
 
 
 class LGDCrossCuttingModifier(models.Model):
@@ -148,7 +229,7 @@ class LGDCrossCuttingModifier(models.Model):
     lgd = models.ForeignKey("LocusGenotypeDisease", on_delete=models.PROTECT)
     ccm = models.ForeignKey("Attrib", on_delete=models.PROTECT)
     is_deleted = models.SmallIntegerField(null=False, default=False)
-    history = HistoricalRecords()
+    history = LGDHistoricalRecords()
 
     class Meta:
         db_table = "lgd_cross_cutting_modifier"
@@ -168,7 +249,7 @@ class LGDPhenotype(models.Model):
     phenotype = models.ForeignKey("OntologyTerm", on_delete=models.PROTECT)
     publication = models.ForeignKey("Publication", on_delete=models.PROTECT, null=True)
     is_deleted = models.SmallIntegerField(null=False, default=False)
-    history = HistoricalRecords()
+    history = LGDHistoricalRecords()
 
     class Meta:
         db_table = "lgd_phenotype"
@@ -189,10 +270,11 @@ class LGDPhenotypeSummary(models.Model):
     publication = models.ForeignKey("Publication", on_delete=models.PROTECT, null=True)
     summary = models.TextField(null=False)
     is_deleted = models.SmallIntegerField(null=False, default=False)
-    history = HistoricalRecords()
+    history = LGDHistoricalRecords()
 
     class Meta:
         db_table = "lgd_phenotype_summary"
+        indexes = [models.Index(fields=["lgd", "is_deleted"])]
 
 
 class LGDVariantType(models.Model):
@@ -213,7 +295,7 @@ class LGDVariantType(models.Model):
     unknown_inheritance = models.BooleanField(default=False)
     publication = models.ForeignKey("Publication", on_delete=models.PROTECT, null=True)
     is_deleted = models.SmallIntegerField(null=False, default=False)
-    history = HistoricalRecords()
+    history = LGDHistoricalRecords()
 
     class Meta:
         db_table = "lgd_variant_type"
@@ -235,10 +317,11 @@ class LGDVariantTypeDescription(models.Model):
     publication = models.ForeignKey("Publication", on_delete=models.PROTECT, null=True)
     description = models.CharField(max_length=250, null=False)
     is_deleted = models.SmallIntegerField(null=False, default=False)
-    history = HistoricalRecords()
+    history = LGDHistoricalRecords()
 
     class Meta:
         db_table = "lgd_variant_type_description"
+        indexes = [models.Index(fields=["lgd", "is_deleted"])]
 
 
 class LGDVariantTypeComment(models.Model):
@@ -272,12 +355,15 @@ class LGDVariantGenccConsequence(models.Model):
     variant_consequence = models.ForeignKey("OntologyTerm", on_delete=models.PROTECT)
     support = models.ForeignKey("Attrib", on_delete=models.PROTECT)
     is_deleted = models.SmallIntegerField(null=False, default=False)
-    history = HistoricalRecords()
+    history = LGDHistoricalRecords()
 
     class Meta:
         db_table = "lgd_variant_gencc_consequence"
         unique_together = ["lgd", "variant_consequence", "support"]
-        indexes = [models.Index(fields=["variant_consequence"])]
+        indexes = [
+            models.Index(fields=["variant_consequence"]),
+            models.Index(fields=["lgd", "is_deleted"]),
+        ]
 
 
 class CVMolecularMechanism(models.Model):
@@ -324,10 +410,11 @@ class LGDComment(models.Model):
     is_deleted = models.SmallIntegerField(null=False, default=False)
     user = models.ForeignKey("User", on_delete=models.PROTECT)
     date = models.DateTimeField(null=False)
-    history = HistoricalRecords()
+    history = LGDHistoricalRecords()
 
     class Meta:
         db_table = "lgd_comment"
+        indexes = [models.Index(fields=["lgd", "is_deleted"])]
 
 
 class LGDPublication(models.Model):
@@ -343,11 +430,12 @@ class LGDPublication(models.Model):
     affected_individuals = models.IntegerField(null=True)
     ancestry = models.CharField(max_length=500, null=True)
     is_deleted = models.SmallIntegerField(null=False, default=False)
-    history = HistoricalRecords()
+    history = LGDHistoricalRecords()
 
     class Meta:
         db_table = "lgd_publication"
         unique_together = ["lgd", "publication"]
+        indexes = [models.Index(fields=["lgd", "is_deleted"])]
 
 
 class LGDPanel(models.Model):
@@ -356,14 +444,14 @@ class LGDPanel(models.Model):
     panel = models.ForeignKey("Panel", on_delete=models.PROTECT)
     relevance = models.ForeignKey("Attrib", on_delete=models.PROTECT, null=True)
     is_deleted = models.SmallIntegerField(null=False, default=False)
-    history = HistoricalRecords()
+    history = LGDHistoricalRecords()
 
     class Meta:
         db_table = "lgd_panel"
         unique_together = ["lgd", "panel"]
         indexes = [
-            models.Index(fields=["panel"]),
             models.Index(fields=["lgd", "panel"]),
+            models.Index(fields=["panel", "is_deleted", "lgd"]),
         ]
 
 
@@ -751,6 +839,56 @@ class GeneDisease(models.Model):
         indexes = [models.Index(fields=["gene"]), models.Index(fields=["disease"])]
 
 
+class GeneReference(models.Model):
+    """
+    Reference genes from HGNC and Ensembl.
+    It is used to validate the genes without querying the Ensembl REST API.
+    The data is imported by the command 'load_gene_reference'.
+    """
+
+    id = models.AutoField(primary_key=True)
+    symbol = models.CharField(max_length=100, null=False, unique=True)
+    hgnc_id = models.CharField(max_length=50, null=False, unique=True)
+    name = models.CharField(max_length=255, null=True, default=None)
+    ensembl_id = models.CharField(max_length=50, null=True, default=None)
+
+    class Meta:
+        db_table = "gene_reference"
+        indexes = [models.Index(fields=["ensembl_id"])]
+
+
+class GeneReferenceSynonym(models.Model):
+    """
+    Previous and alias symbols of the reference genes.
+        - type: 'previous' or 'alias'
+    """
+
+    id = models.AutoField(primary_key=True)
+    gene = models.ForeignKey("GeneReference", on_delete=models.PROTECT)
+    synonym = models.CharField(max_length=100, null=False)
+    type = models.CharField(max_length=20, null=False)
+
+    class Meta:
+        db_table = "gene_reference_synonym"
+        unique_together = ["gene", "synonym"]
+        indexes = [models.Index(fields=["synonym"])]
+
+
+class GeneReferenceMim(models.Model):
+    """
+    MIM morbid diseases associated with the reference genes.
+    """
+
+    id = models.AutoField(primary_key=True)
+    gene = models.ForeignKey("GeneReference", on_delete=models.PROTECT)
+    mim_id = models.CharField(max_length=50, null=False)
+    disease = models.CharField(max_length=255, null=False)
+
+    class Meta:
+        db_table = "gene_reference_mim"
+        unique_together = ["gene", "mim_id"]
+
+
 class DiseaseExternal(models.Model):
     """
     Disease IDs from external sources and respective disease name.
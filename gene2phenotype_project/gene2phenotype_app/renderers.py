@@ -0,0 +1,66 @@
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+"""
+JSON renderer based on orjson.
+
+FastJSONRenderer returns the same JSON as the default DRF JSONRenderer but encodes
+large responses much faster. If orjson is not installed, or the client asks for an
+indented response (e.g. browsable API), it uses the default JSONRenderer.
+
+To use it in a view:
+    renderer_classes = FAST_RENDERER_CLASSES
+
+To use it in all views set 'fast_json_renderer = True' in the config.ini [settings].
+"""
+
+drf_encoder = JSONEncoder()
+
+
+class FastJSONRenderer(JSONRenderer):
+    # Same as DRF: the line and paragraph separators are valid JSON but not valid javascript
+    separators_to_escape = (
+        ("\u2028".encode(), b"\\u2028"),
+        ("\u2029".encode(), b"\\u2029"),
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.get_indent(
+            accepted_media_type, renderer_context or {}
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if data is None:
+            return b""
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.default,
+                # Datetimes are encoded by DRF JSONEncoder (ISO 8601 with milliseconds and 'Z')
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+            )
+        except TypeError:
+            # Data orjson cannot encode, e.g. integers larger than 64 bits
+            return super().render(data, accepted_media_type, renderer_context)
+
+        for separator, escaped in self.separators_to_escape:
+            ret = ret.replace(separator, escaped)
+
+        return ret
+
+    @staticmethod
+    def default(obj):
+        """
+        Encode the types orjson does not support: Decimal, datetime, timedelta,
+        lazy strings, querysets, etc. Uses the same rules as the DRF JSONEncoder.
+        """
+        return drf_encoder.default(obj)
+
+
+FAST_RENDERER_CLASSES = [FastJSONRenderer, BrowsableAPIRenderer]
@@ -61,9 +61,17 @@ from .curation import CurationDataSerializer
 
 from .meta import MetaSerializer
 
-from .gencc_submission import CreateGenCCSubmissionSerializer, GenCCSubmissionSerializer
+from .gencc_submission import (
+    CreateGenCCSubmissionSerializer,
+    GenCCSubmissionSerializer,
+    GenCCSubmissionPayload,
+)
 
 from .mined_publication import (
     LGDMinedPublicationSerializer,
     LGDMinedPublicationListSerializer,
 )
+
+from .bulk_edit import LGDBulkEdit
+
+from .disease_remap import LGDDiseaseRemap, DiseaseRename
@@ -0,0 +1,629 @@
+from rest_framework import serializers
+from simple_history.utils import bulk_create_with_history, bulk_update_with_history
+import re
+
+from ..models import (
+    Attrib,
+    OntologyTerm,
+    Publication,
+    LGDPublication,
+    LGDPublicationComment,
+    LGDPhenotype,
+    LGDPhenotypeSummary,
+    LGDVariantType,
+    LGDVariantTypeComment,
+    LGDVariantTypeDescription,
+    LGDMolecularMechanismEvidence,
+)
+
+from .phenotype import PhenotypeOntologyTermSerializer
+from .publication import PublicationSerializer, LGDPublicationSerializer
+
+from ..utils import get_date_now
+
+
+class LGDBulkEdit:
+    """
+    Adds a list of publications and the data linked to the publications to a G2P record (LGD):
+        - publications (+ comment and families)
+        - phenotypes
+        - variant types (+ comment)
+        - variant descriptions (HGVS)
+
+    The data is added in bulk: the publications, phenotypes and variant types sent in
+    the request are fetched with one query per type, compared with the data already
+    linked to the record and the new/updated rows are saved with bulk_create/bulk_update
+    (the history rows are also created in bulk).
+    The result is the same as calling the serializers for each entry:
+    LGDPublicationSerializer, LGDPhenotypeSerializer, LGDVariantTypeSerializer and
+    LGDVariantTypeDescriptionSerializer.
+
+    It also deletes the data linked to a publication of the record (delete_publication).
+
+    Called by: view LGDEditPublications()
+
+    Raises:
+        serializers.ValidationError: if the data is invalid, the error is in the key 'error'
+    """
+
+    def __init__(self, lgd, user):
+        self.lgd = lgd
+        self.user = user
+        # Publications already fetched (key: pmid)
+        self.publications = {}
+
+    @staticmethod
+    def get_pmid(pmid):
+        try:
+            return int(pmid)
+        except (TypeError, ValueError):
+            raise serializers.ValidationError({"error": f"Invalid publication '{pmid}'"})
+
+    def get_publications(self, pmids, create=False):
+        """
+        Fetch the publications with one query.
+
+        Args:
+            pmids: list of PMIDs
+            create (bool): insert the publications that are not in G2P yet (EuropePMC)
+
+        Returns:
+            dict: Publication objects (key: pmid)
+
+        Raises:
+            serializers.ValidationError: if a publication is not in G2P and create is False
+        """
+        pmids = {self.get_pmid(pmid) for pmid in pmids}
+        new_pmids = pmids - self.publications.keys()
+
+        if new_pmids:
+            for publication_obj in Publication.objects.filter(pmid__in=new_pmids):
+                self.publications[publication_obj.pmid] = publication_obj
+
+        for pmid in sorted(pmids - self.publications.keys()):
+            if not create:
+                # The publication has to be linked to the record before the other data
+                raise serializers.ValidationError(
+                    {"error": f"Invalid publication '{pmid}'"}
+                )
+
+            publication_serializer = PublicationSerializer(data={"pmid": pmid})
+            publication_serializer.is_valid(raise_exception=True)
+            self.publications[pmid] = publication_serializer.save()
+
+        return {pmid: self.publications[pmid] for pmid in pmids}
+
+    def save_objects(self, model, new_objs, updated_objs, fields):
+        """
+        Insert the new objects and update the existing objects.
+        Returns the new objects with their ids.
+        """
+        if updated_objs:
+            bulk_update_with_history(
+                updated_objs, model, fields, default_user=self.user
+            )
+
+        if new_objs:
+            # MySQL does not return the ids of the new rows, bulk_create_with_history
+            # fetches the inserted rows in that case
+            return bulk_create_with_history(new_objs, model, default_user=self.user)
+
+        return []
+
+    def add_publications(self, publications_data):
+        """
+        Link the publications to the record.
+        Same rules as LGDPublicationSerializer.create(): the families are only updated
+        if they are not defined yet and the deleted LGD-publications are undeleted.
+
+        Args:
+            publications_data: list of publications as sent to LGDPublicationSerializer
+            Example: [{ "publication": { "pmid": "1234" },
+                        "comment": { "comment": "this is a comment", "is_public": 1 },
+                        "families": { "families": 2, "consanguinity": "unknown",
+                                      "ancestries": "african", "affected_individuals": 1 }}]
+        """
+        entries = []
+        for publication in publications_data:
+            # LGDPublicationSerializer.validate() formats the families data
+            lgd_publication_serializer = LGDPublicationSerializer(
+                data=publication, context={"lgd": self.lgd, "user": self.user}
+            )
+            if not lgd_publication_serializer.is_valid():
+                raise serializers.ValidationError(
+                    {"error": f"Invalid publication data: {lgd_publication_serializer.errors}"}
+                )
+            data = lgd_publication_serializer.validated_data
+            entries.append((self.get_pmid(data["publication"]["pmid"]), data))
+
+        publications = self.get_publications(
+            [pmid for pmid, data in entries], create=True
+        )
+
+        consanguinity_values = {
+            data.get("consanguinity")
+            for pmid, data in entries
+            if data.get("consanguinity")
+        }
+        consanguinity_attribs = {}
+        if consanguinity_values:
+            consanguinity_attribs = {
+                attrib.value: attrib
+                for attrib in Attrib.objects.filter(
+                    value__in=consanguinity_values, type__code="consanguinity"
+                )
+            }
+        invalid_values = consanguinity_values - consanguinity_attribs.keys()
+        if invalid_values:
+            raise serializers.ValidationError(
+                {"error": f"Invalid consanguinity value '{sorted(invalid_values)[0]}'"}
+            )
+
+        lgd_publications = {
+            lgd_publication.publication_id: lgd_publication
+            for lgd_publication in LGDPublication.objects.filter(
+                lgd=self.lgd, publication__in=publications.values()
+            )
+        }
+
+        new_objs = []
+        updated_objs = {}
+        comments = []
+        for pmid, data in entries:
+            publication_obj = publications[pmid]
+            consanguinity_obj = consanguinity_attribs.get(data.get("consanguinity"))
+            ancestry = data.get("ancestry", None) or None
+
+            lgd_publication_obj = lgd_publications.get(publication_obj.id)
+            if lgd_publication_obj is None:
+                lgd_publication_obj = LGDPublication(
+                    lgd=self.lgd,
+                    publication=publication_obj,
+                    number_of_families=data.get("number_of_families", None),
+                    consanguinity=consanguinity_obj,
+                    affected_individuals=data.get("affected_individuals", None),
+                    ancestry=ancestry,
+                    is_deleted=0,
+                )
+                lgd_publications[publication_obj.id] = lgd_publication_obj
+                new_objs.append(lgd_publication_obj)
+            else:
+                is_updated = lgd_publication_obj.is_deleted != 0
+                # If it does not have number of families or affected individuals then update it
+                if (
+                    not lgd_publication_obj.number_of_families
+                    or not lgd_publication_obj.affected_individuals
+                ):
+                    lgd_publication_obj.number_of_families = data.get(
+                        "number_of_families", None
+                    )
+                    lgd_publication_obj.affected_individuals = data.get(
+                        "affected_individuals", None
+                    )
+                    lgd_publication_obj.ancestry = ancestry
+                    lgd_publication_obj.consanguinity = consanguinity_obj
+                    is_updated = True
+                # If existing LGD-publication is deleted then update to not deleted
+                lgd_publication_obj.is_deleted = 0
+                if is_updated and lgd_publication_obj.pk:
+                    updated_objs[lgd_publication_obj.pk] = lgd_publication_obj
+
+            comment = data.get("comment", None)
+            if comment and comment.get("comment"):
+                # Remove newlines from comment
+                comments.append(
+                    (publication_obj.id, re.sub(r"\n", " ", comment["comment"]))
+                )
+
+        for lgd_publication_obj in self.save_objects(
+            LGDPublication,
+            new_objs,
+            list(updated_objs.values()),
+            [
+                "number_of_families",
+                "affected_individuals",
+                "ancestry",
+                "consanguinity",
+                "is_deleted",
+            ],
+        ):
+            lgd_publications[lgd_publication_obj.publication_id] = lgd_publication_obj
+
+        if comments:
+            self.add_publication_comments(lgd_publications, comments)
+
+    def add_publication_comments(self, lgd_publications, comments):
+        """
+        Add the comments to the LGD-publications if they are not stored yet.
+        The publication comments are always private.
+
+        Args:
+            lgd_publications: LGDPublication objects (key: publication id)
+            comments: list of (publication id, comment)
+        """
+        existing_comments = set(
+            LGDPublicationComment.objects.filter(
+                lgd_publication__in=[
+                    lgd_publications[publication_id]
+                    for publication_id, comment in comments
+                ],
+                is_deleted=0,
+            ).values_list("lgd_publication_id", "comment")
+        )
+
+        new_objs = []
+        for publication_id, comment in comments:
+            lgd_publication_obj = lgd_publications[publication_id]
+            if (lgd_publication_obj.id, comment) in existing_comments:
+                continue
+
+            existing_comments.add((lgd_publication_obj.id, comment))
+            new_objs.append(
+                LGDPublicationComment(
+                    lgd_publication=lgd_publication_obj,
+                    comment=comment,
+                    is_public=0,
+                    is_deleted=0,
+                    date=get_date_now(),
+                    user=self.user,
+                )
+            )
+
+        self.save_objects(LGDPublicationComment, new_objs, [], [])
+
+    def get_phenotypes(self, accessions):
+        """
+        Fetch the phenotypes (HPO) with one query.
+        The phenotypes not in G2P are validated and inserted by PhenotypeOntologyTermSerializer.
+
+        Returns:
+            dict: OntologyTerm objects (key: accession)
+        """
+        for accession in accessions:
+            if not re.match(r"HP\:\d+", accession):
+                raise serializers.ValidationError(
+                    {"error": f"Invalid phenotype accession '{accession}'"}
+                )
+
+        phenotypes = {
+            phenotype_obj.accession: phenotype_obj
+            for phenotype_obj in OntologyTerm.objects.filter(accession__in=accessions)
+        }
+
+        for accession in sorted(set(accessions) - phenotypes.keys()):
+            # Query the HPO API and insert the new phenotype
+            phenotypes[accession] = PhenotypeOntologyTermSerializer().create(
+                {"accession": accession}
+            )
+
+        return phenotypes
+
+    def add_phenotypes(self, phenotypes_data):
+        """
+        Link the phenotypes to the record and the publication.
+        The publications have to be linked to the record.
+
+        Args:
+            phenotypes_data: list of phenotypes by publication
+            Example: [{ "pmid": "41",
+                        "hpo_terms": [{ "term": "Orofacial dyskinesia", "accession": "HP:0002310" }] }]
+        """
+        links = [
+            (hpo["accession"], self.get_pmid(phenotype["pmid"]))
+            for phenotype in phenotypes_data
+            for hpo in phenotype["hpo_terms"]
+        ]
+
+        if not links:
+            return
+
+        publications = self.get_publications({pmid for accession, pmid in links})
+        phenotypes = self.get_phenotypes({accession for accession, pmid in links})
+
+        lgd_phenotypes = {
+            (lgd_phenotype.phenotype_id, lgd_phenotype.publication_id): lgd_phenotype
+            for lgd_phenotype in LGDPhenotype.objects.filter(
+                lgd=self.lgd, phenotype__in=phenotypes.values()
+            )
+        }
+
+        new_objs = []
+        updated_objs = []
+        for accession, pmid in links:
+            key = (phenotypes[accession].id, publications[pmid].id)
+            lgd_phenotype_obj = lgd_phenotypes.get(key)
+
+            if lgd_phenotype_obj is None:
+                lgd_phenotype_obj = LGDPhenotype(
+                    lgd=self.lgd,
+                    phenotype=phenotypes[accession],
+                    publication=publications[pmid],
+                    is_deleted=0,
+                )
+                lgd_phenotypes[key] = lgd_phenotype_obj
+                new_objs.append(lgd_phenotype_obj)
+            elif lgd_phenotype_obj.is_deleted != 0:
+                # If it is deleted then update to not deleted
+                lgd_phenotype_obj.is_deleted = 0
+                updated_objs.append(lgd_phenotype_obj)
+
+        self.save_objects(LGDPhenotype, new_objs, updated_objs, ["is_deleted"])
+
+    def add_variant_types(self, variant_types_data):
+        """
+        Link the variant types to the record and the supporting publications.
+        Same rules as LGDVariantTypeSerializer.create(): a variant type without publication
+        is attached to the first supporting publication and the inheritance flags
+        of the existing variant types are only set to True.
+
+        Args:
+            variant_types_data: list of variant types
+            Example: [{ "primary_type": "protein_changing", "secondary_type": "inframe_insertion",
+                        "nmd_escape": false, "de_novo": false, "inherited": false,
+                        "unknown_inheritance": true, "supporting_papers": ["41"], "comment": "" }]
+        """
+        if not variant_types_data:
+            return
+
+        entries = []
+        for variant_type in variant_types_data:
+            var_type = variant_type.get("secondary_type", None)
+            # We save the variant types already with the NMD_escape attached to the term
+            if variant_type.get("nmd_escape", None) is True:
+                var_type = f"{var_type}_NMD_escaping"
+            pmids = [
+                self.get_pmid(pmid)
+                for pmid in variant_type.get("supporting_papers", None) or []
+            ]
+            entries.append((var_type, pmids, variant_type))
+
+        variant_type_terms = {
+            var_type_obj.term: var_type_obj
+            for var_type_obj in OntologyTerm.objects.filter(
+                term__in={var_type for var_type, pmids, data in entries},
+                group_type__value="variant_type",
+            )
+        }
+        for var_type, pmids, data in entries:
+            if var_type not in variant_type_terms:
+                raise serializers.ValidationError(
+                    {"error": f"Invalid variant type '{var_type}'"}
+                )
+
+        publications = self.get_publications(
+            {pmid for var_type, pmids, data in entries for pmid in pmids}
+        )
+
+        lgd_variant_types = {
+            (obj.variant_type_ot_id, obj.publication_id): obj
+            for obj in LGDVariantType.objects.filter(
+                lgd=self.lgd, variant_type_ot__in=variant_type_terms.values()
+            )
+        }
+
+        new_objs = []
+        updated_objs = {}
+        comments = []
+        for var_type, pmids, data in entries:
+            var_type_obj = variant_type_terms[var_type]
+
+            for publication_obj in [publications[pmid] for pmid in pmids] or [None]:
+                publication_id = publication_obj.id if publication_obj else None
+                key = (var_type_obj.id, publication_id)
+                lgd_variant_type_obj = lgd_variant_types.get(key)
+
+                # Variant type linked to publication: check if it already exists without a publication
+                if lgd_variant_type_obj is None and publication_obj:
+                    lgd_variant_type_obj = lgd_variant_types.get((var_type_obj.id, None))
+                    if lgd_variant_type_obj and lgd_variant_type_obj.is_deleted == 0:
+                        # Add publication to existing object
+                        del lgd_variant_types[(var_type_obj.id, None)]
+                        lgd_variant_type_obj.publication = publication_obj
+                        lgd_variant_types[key] = lgd_variant_type_obj
+                    else:
+                        lgd_variant_type_obj = None
+
+                if lgd_variant_type_obj is None:
+                    lgd_variant_type_obj = LGDVariantType(
+                        lgd=self.lgd,
+                        variant_type_ot=var_type_obj,
+                        inherited=data.get("inherited"),
+                        de_novo=data.get("de_novo"),
+                        unknown_inheritance=data.get("unknown_inheritance"),
+                        publication=publication_obj,
+                        is_deleted=0,
+                    )
+                    lgd_variant_types[key] = lgd_variant_type_obj
+                    new_objs.append(lgd_variant_type_obj)
+                else:
+                    # The entry already exists: set to not deleted and update inheritance data
+                    lgd_variant_type_obj.is_deleted = 0
+                    if not lgd_variant_type_obj.inherited and data.get("inherited") == True:
+                        lgd_variant_type_obj.inherited = True
+                    if not lgd_variant_type_obj.de_novo and data.get("de_novo") == True:
+                        lgd_variant_type_obj.de_novo = True
+                    if (
+                        not lgd_variant_type_obj.unknown_inheritance
+                        and data.get("unknown_inheritance") == True
+                    ):
+                        lgd_variant_type_obj.unknown_inheritance = True
+                    if lgd_variant_type_obj.pk:
+                        updated_objs[lgd_variant_type_obj.pk] = lgd_variant_type_obj
+
+                comment = data.get("comment", None)
+                if comment:
+                    # Remove newlines from comment
+                    comments.append((key, re.sub(r"\n", " ", comment)))
+
+        for lgd_variant_type_obj in self.save_objects(
+            LGDVariantType,
+            new_objs,
+            list(updated_objs.values()),
+            ["inherited", "de_novo", "unknown_inheritance", "publication", "is_deleted"],
+        ):
+            key = (lgd_variant_type_obj.variant_type_ot_id, lgd_variant_type_obj.publication_id)
+            lgd_variant_types[key] = lgd_variant_type_obj
+
+        if comments:
+            self.add_variant_type_comments(lgd_variant_types, comments)
+
+    def add_variant_type_comments(self, lgd_variant_types, comments):
+        """
+        Add the comments to the LGD-variant types if they are not stored yet.
+        The variant type comments are always private.
+
+        Args:
+            lgd_variant_types: LGDVariantType objects (key: (variant type id, publication id))
+            comments: list of (key, comment)
+        """
+        existing_comments = {
+            (comment_obj.lgd_variant_type_id, comment_obj.comment): comment_obj
+            for comment_obj in LGDVariantTypeComment.objects.filter(
+                lgd_variant_type__in=[lgd_variant_types[key] for key, comment in comments],
+                is_public=0,
+                user=self.user,
+            )
+        }
+
+        new_objs = []
+        updated_objs = []
+        for key, comment in comments:
+            lgd_variant_type_obj = lgd_variant_types[key]
+            comment_obj = existing_comments.get((lgd_variant_type_obj.id, comment))
+
+            if comment_obj is None:
+                comment_obj = LGDVariantTypeComment(
+                    comment=comment,
+                    lgd_variant_type=lgd_variant_type_obj,
+                    is_public=0,
+                    is_deleted=0,
+                    user=self.user,
+                    date=get_date_now(),
+                )
+                existing_comments[(lgd_variant_type_obj.id, comment)] = comment_obj
+                new_objs.append(comment_obj)
+            elif comment_obj.is_deleted == 1:
+                comment_obj.is_deleted = 0
+                updated_objs.append(comment_obj)
+
+        self.save_objects(LGDVariantTypeComment, new_objs, updated_objs, ["is_deleted"])
+
+    def add_variant_descriptions(self, variant_descriptions_data):
+        """
+        Link the variant descriptions (HGVS) to the record and the publications.
+
+        Args:
+            variant_descriptions_data: list of variant descriptions
+            Example: [{ "description": "HGVS:c.9Pro", "publication": "41" }]
+        """
+        links = []
+        for variant_description in variant_descriptions_data:
+            list_publications = variant_description.get("publications", None) or []
+            # Single publication sent by curation
+            if not list_publications and variant_description.get("publication"):
+                list_publications = [variant_description["publication"]]
+
+            for pmid in list_publications:
+                links.append((variant_description["description"], self.get_pmid(pmid)))
+
+        if not links:
+            return
+
+        publications = self.get_publications({pmid for description, pmid in links})
+
+        lgd_variant_descriptions = {
+            (obj.description, obj.publication_id): obj
+            for obj in LGDVariantTypeDescription.objects.filter(
+                lgd=self.lgd,
+                description__in={description for description, pmid in links},
+            )
+        }
+
+        new_objs = []
+        updated_objs = []
+        for description, pmid in links:
+            key = (description, publications[pmid].id)
+            lgd_variant_description_obj = lgd_variant_descriptions.get(key)
+
+            if lgd_variant_description_obj is None:
+                lgd_variant_description_obj = LGDVariantTypeDescription(
+                    lgd=self.lgd,
+                    description=description,
+                    publication=publications[pmid],
+                    is_deleted=0,
+                )
+                lgd_variant_descriptions[key] = lgd_variant_description_obj
+                new_objs.append(lgd_variant_description_obj)
+            elif lgd_variant_description_obj.is_deleted == 1:
+                lgd_variant_description_obj.is_deleted = 0
+                updated_objs.append(lgd_variant_description_obj)
+
+        self.save_objects(LGDVariantTypeDescription, new_objs, updated_objs, ["is_deleted"])
+
+    def soft_delete(self, queryset):
+        """
+        Set the flag 'is_deleted' to 1 for the rows in the queryset with
+        one UPDATE and create the history rows in bulk.
+        Returns the number of deleted rows.
+        """
+        model = queryset.model
+        objs = list(queryset)
+
+        if objs:
+            model.objects.filter(id__in=[obj.id for obj in objs]).update(is_deleted=1)
+
+            for obj in objs:
+                obj.is_deleted = 1
+
+            model.history.bulk_history_create(
+                objs, update=True, default_user=self.user
+            )
+
+        return len(objs)
+
+    def delete_publication(self, publication_obj):
+        """
+        Delete the data linked to the publication in the record:
+            - phenotypes
+            - phenotype summary
+            - variant types (+ comment)
+            - variant descriptions (HGVS)
+            - mechanism evidence
+
+        Each table is updated with one query, the number of queries does not
+        depend on the number of rows linked to the publication.
+        The LGD-publication (lgd_publication) is not deleted by this method.
+
+        Args:
+            publication_obj: Publication object
+
+        Returns:
+            dict: number of deleted rows (key: table name)
+        """
+        deleted = {}
+
+        # Each variant type can be linked to a LGDVariantTypeComment
+        # Delete the comments of the variant types linked to the publication
+        deleted[LGDVariantTypeComment._meta.db_table] = self.soft_delete(
+            LGDVariantTypeComment.objects.filter(
+                lgd_variant_type__lgd=self.lgd,
+                lgd_variant_type__publication=publication_obj,
+                lgd_variant_type__is_deleted=0,
+                is_deleted=0,
+            )
+        )
+
+        for model in (
+            LGDPhenotype,
+            LGDPhenotypeSummary,
+            LGDVariantType,
+            LGDVariantTypeDescription,
+            LGDMolecularMechanismEvidence,
+        ):
+            deleted[model._meta.db_table] = self.soft_delete(
+                model.objects.filter(
+                    lgd=self.lgd, publication=publication_obj, is_deleted=0
+                )
+            )
+
+        return deleted
@@ -2,12 +2,12 @@ from rest_framework import serializers
 from deepdiff import DeepDiff
 from django.db import transaction
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import copy
 
 from ..models import (
     CurationData,
     Disease,
-    User,
     LocusGenotypeDisease,
     Locus,
     DiseaseOntologyTerm,
@@ -29,12 +29,15 @@ from .locus_genotype_disease import (
 )
 
 from .phenotype import LGDPhenotypeSerializer, LGDPhenotypeSummarySerializer
-
-from .user import UserSerializer
 from .stable_id import G2PStableIDSerializer
 from .publication import PublicationSerializer
 
-from ..utils import get_date_now, validate_confidence_publications
+from ..user_context import get_user_context
+from ..utils import (
+    get_date_now,
+    validate_confidence_publications,
+    get_publication,
+)
 
 
 class CurationDataSerializer(serializers.ModelSerializer):
@@ -69,8 +72,8 @@ class CurationDataSerializer(serializers.ModelSerializer):
         data_copy = copy.deepcopy(data)
         data_dict = self.convert_to_dict(data_copy)
 
-        user_email = self.context.get("user")
-        user_obj = User.objects.get(email=user_email)
+        user_context = get_user_context(self.context.get("user"))
+        user_obj = user_context.user
 
         if (
             "locus" not in data_dict["json_data"]
@@ -98,7 +101,7 @@ class CurationDataSerializer(serializers.ModelSerializer):
             "panels" in data_dict["json_data"]
             and len(data_dict["json_data"]["panels"]) >= 1
         ):
-            panels = UserSerializer.get_panels(self, user_obj.id)
+            panels = user_context.panel_descriptions
             # Check if any panel in data_dict["json_data"]["panels"] is not in the updated panels list
             unauthorized_panels = [
                 panel
@@ -399,13 +402,7 @@ class CurationDataSerializer(serializers.ModelSerializer):
                 }
             )
 
-        user_email = self.context.get("user")
-        try:
-            user_obj = User.objects.get(email=user_email)
-        except User.DoesNotExist:
-            raise serializers.ValidationError(
-                {"message": f"User '{user_email}' does not exist."}
-            )
+        user_obj = get_user_context(self.context.get("user")).user
 
         try:
             new_curation_data = CurationData.objects.create(
@@ -446,6 +443,62 @@ class CurationDataSerializer(serializers.ModelSerializer):
 
         return instance
 
+    def fetch_publications(self, data, max_workers=4):
+        """
+        Fetch from EuropePMC the publications of the record that are not stored in G2P yet.
+        The requests are sent in parallel and no database writes are done, this way
+        the publish step can run in a single transaction without waiting for EuropePMC.
+        This method is called by the command 'process_publish_jobs'.
+
+        Args:
+            (CurationData obj) data: data to be published
+            (int) max_workers: maximum number of parallel requests
+
+        Returns:
+            dict: EuropePMC responses indexed by PMID, the format is the expected
+                  format of the context 'publication_responses' in PublicationSerializer
+
+        Raises:
+            serializers.ValidationError: if EuropePMC cannot be queried
+        """
+        pmids = set()
+        for publication in data.json_data.get("publications", []):
+            try:
+                pmids.add(int(publication["pmid"]))
+            except (KeyError, TypeError, ValueError):
+                # Invalid PMIDs are reported by PublicationSerializer
+                continue
+
+        existing_pmids = set(
+            Publication.objects.filter(pmid__in=pmids).values_list("pmid", flat=True)
+        )
+        missing_pmids = sorted(pmids - existing_pmids)
+
+        if not missing_pmids:
+            return {}
+
+        def fetch(pmid):
+            try:
+                return get_publication(pmid)
+            except SystemExit:
+                # get_publication exits after the max number of retries
+                return None
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            responses = dict(zip(missing_pmids, executor.map(fetch, missing_pmids)))
+
+        failed_pmids = [
+            str(pmid) for pmid, response in responses.items() if not response
+        ]
+        if failed_pmids:
+            raise serializers.ValidationError(
+                {
+                    "error": f"Cannot fetch PMID(s) '{', '.join(failed_pmids)}' from EuropePMC"
+                }
+            )
+
+        return responses
+
     @transaction.atomic
     def publish(self, data):
         """
@@ -456,16 +509,9 @@ class CurationDataSerializer(serializers.ModelSerializer):
         Args:
             data: CurationData object to publish (JSON format)
         """
-        user = self.context.get("user")
+        user_obj = get_user_context(self.context.get("user")).user
         publications_list = []
 
-        # Get user object
-        try:
-            user_obj = User.objects.get(email=user, is_active=1)
-
-        except User.DoesNotExist:
-            raise serializers.ValidationError({"error": f"Invalid user '{user}'"})
-
         ### Publications ###
         for publication in data.json_data["publications"]:
             if publication["comment"] is None or publication["comment"] == "":
@@ -489,7 +535,13 @@ class CurationDataSerializer(serializers.ModelSerializer):
             # the PMID is used to get/create the publication
             try:
                 publication_serializer = PublicationSerializer(
-                    data=publication_data, context={"user": user_obj}
+                    data=publication_data,
+                    context={
+                        "user": user_obj,
+                        "publication_responses": self.context.get(
+                            "publication_responses", {}
+                        ),
+                    },
                 )
                 # Validate the input data
                 if publication_serializer.is_valid(raise_exception=True):
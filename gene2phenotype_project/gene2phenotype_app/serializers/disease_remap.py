@@ -0,0 +1,385 @@
+from django.db.models import Count
+from django.http import Http404
+from simple_history.utils import bulk_create_with_history, bulk_update_with_history
+import copy
+
+from ..models import Disease, DiseaseSynonym, LocusGenotypeDisease
+
+from ..utils import validate_disease_name
+
+
+def get_id(value):
+    """
+    Returns the integer ID or None if the value is not a valid ID.
+    """
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class BulkRemap:
+    """
+    Base class to update a unique key (disease name, LGD disease) of many objects.
+
+    The updates are simulated in memory in the same order as the input, the
+    objects are then saved with bulk_update (one UPDATE per batch).
+    A single UPDATE can fail if an object takes the key released by another
+    object of the same UPDATE (the unique key is checked row by row), in this
+    case the update is saved in a new batch.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.batches = [[]]
+        # Keys released and objects updated in the current batch
+        self.released_keys = set()
+        self.batch_ids = set()
+
+    def add_update(self, obj, old_key, new_key):
+        if new_key in self.released_keys or obj.id in self.batch_ids:
+            self.batches.append([])
+            self.released_keys = set()
+            self.batch_ids = set()
+
+        # bulk_update reads the values when the batch is saved
+        self.batches[-1].append(copy.copy(obj))
+        self.batch_ids.add(obj.id)
+        self.released_keys.add(old_key)
+
+    def save_updates(self, model, fields):
+        for batch in self.batches:
+            if batch:
+                bulk_update_with_history(batch, model, fields, default_user=self.user)
+
+
+class LGDDiseaseRemap(BulkRemap):
+    """
+    Updates the disease of G2P records (LGD) in bulk.
+
+    Each item of the input can update all the records linked to a disease or
+    a specific record:
+        [
+            {"disease_id": 1, "new_disease_id": 2},
+            {"disease_id": 1, "new_disease_id": 2, "stable_id": "G2P00001"}
+        ]
+
+    The records and the unique keys (locus, genotype, disease, mechanism) that
+    can conflict with the new diseases are fetched with one query each.
+    The result is the same as updating the records one by one.
+
+    Called by: view LGDUpdateDisease()
+    """
+
+    def remap(self, data):
+        """
+        Returns a report for each item of the input:
+            {"updated": [{"g2p_id": ..., "lgd_id": ...}], "errors": [...]}
+        """
+        items = []
+        reports = []
+
+        for disease_to_update in data:
+            if not isinstance(disease_to_update, dict):
+                disease_to_update = {}
+
+            current_disease_id = get_id(disease_to_update.get("disease_id"))
+            new_disease_id = get_id(disease_to_update.get("new_disease_id"))
+            report = {"updated": [], "errors": []}
+            reports.append(report)
+
+            if not current_disease_id or not new_disease_id:
+                report["errors"].append(
+                    {"error": "Both 'disease_id' and 'new_disease_id' are required."}
+                )
+                continue
+
+            items.append(
+                (
+                    report,
+                    current_disease_id,
+                    new_disease_id,
+                    disease_to_update.get("stable_id", None),
+                )
+            )
+
+        if not items:
+            return reports
+
+        # Records linked to the diseases (key: disease id)
+        records = {}
+        for lgd_obj in (
+            LocusGenotypeDisease.objects.filter(
+                disease_id__in={item[1] for item in items}, is_deleted=0
+            )
+            .select_related("stable_id")
+            .order_by("id")
+        ):
+            records.setdefault(lgd_obj.disease_id, {})[lgd_obj.id] = lgd_obj
+
+        new_disease_ids = {item[2] for item in items}
+        valid_disease_ids = set(
+            Disease.objects.filter(id__in=new_disease_ids).values_list("id", flat=True)
+        )
+
+        # Existing records that use the new diseases
+        # key: (locus, genotype, disease, mechanism), value: stable id
+        unique_keys = {
+            (locus_id, genotype_id, disease_id, mechanism_id): stable_id
+            for locus_id, genotype_id, disease_id, mechanism_id, stable_id in (
+                LocusGenotypeDisease.objects.filter(
+                    disease_id__in=new_disease_ids,
+                    locus_id__in={
+                        lgd_obj.locus_id
+                        for lgd_objs in records.values()
+                        for lgd_obj in lgd_objs.values()
+                    },
+                ).values_list(
+                    "locus_id",
+                    "genotype_id",
+                    "disease_id",
+                    "mechanism_id",
+                    "stable_id__stable_id",
+                )
+            )
+        }
+
+        for report, current_disease_id, new_disease_id, stable_id_to_update in items:
+            lgd_list = [
+                lgd_obj
+                for lgd_obj in records.get(current_disease_id, {}).values()
+                if not stable_id_to_update
+                or lgd_obj.stable_id.stable_id == stable_id_to_update
+            ]
+
+            if not lgd_list:
+                report["errors"].append(
+                    {
+                        "error": f"No records associated with disease id {current_disease_id}"
+                    }
+                )
+                continue
+
+            if new_disease_id not in valid_disease_ids:
+                report["errors"].append(
+                    {
+                        "disease_id": current_disease_id,
+                        "error": f"Invalid disease id {new_disease_id}",
+                    }
+                )
+                continue
+
+            for lgd_obj in lgd_list:
+                stable_id = lgd_obj.stable_id.stable_id
+                old_key = (
+                    lgd_obj.locus_id,
+                    lgd_obj.genotype_id,
+                    lgd_obj.disease_id,
+                    lgd_obj.mechanism_id,
+                )
+                new_key = old_key[:2] + (new_disease_id, lgd_obj.mechanism_id)
+
+                # Check if there is another LGD record linked to the new disease id
+                if new_key in unique_keys:
+                    report["errors"].append(
+                        {
+                            "disease_id": current_disease_id,
+                            "error": f"Found a different record with same locus, genotype, disease and mechanism: '{unique_keys[new_key]}'",
+                        }
+                    )
+                    continue
+
+                if unique_keys.get(old_key) == stable_id:
+                    del unique_keys[old_key]
+                unique_keys[new_key] = stable_id
+
+                del records[lgd_obj.disease_id][lgd_obj.id]
+                lgd_obj.disease_id = new_disease_id
+                records.setdefault(new_disease_id, {})[lgd_obj.id] = lgd_obj
+
+                self.add_update(lgd_obj, old_key, new_key)
+                report["updated"].append({"g2p_id": stable_id, "lgd_id": lgd_obj.id})
+
+        self.save_updates(LocusGenotypeDisease, ["disease"])
+
+        return reports
+
+
+class DiseaseRename(BulkRemap):
+    """
+    Updates the name of diseases in bulk and adds the previous names as synonyms.
+
+    Input:
+        [
+            {"id": 1, "name": "VMA12-related congenital disorder", "add_synonym": true},
+            {"id": 2, "name": "TMEM199-related congenital disorder"}
+        ]
+
+    The diseases, the names already used and the number of records linked to
+    each disease are fetched with one query each. The synonyms are inserted
+    with one bulk insert.
+    The result is the same as updating the diseases one by one.
+
+    Called by: view UpdateDisease()
+
+    Raises:
+        Http404: if a disease is not found
+    """
+
+    def rename(self, data):
+        """
+        Returns a report for each item of the input:
+            {"updated": [{"id": ..., "name": ...}], "errors": [...]}
+        """
+        disease_ids = set()
+        names = set()
+        for disease_data in data:
+            if isinstance(disease_data, dict):
+                disease_ids.add(get_id(disease_data.get("id")))
+                if isinstance(disease_data.get("name"), str):
+                    names.add(disease_data["name"].strip())
+
+        diseases = {
+            disease_obj.id: disease_obj
+            for disease_obj in Disease.objects.filter(id__in=disease_ids - {None})
+        }
+
+        # Names already used (key: lower case name, value: disease id)
+        # MySQL compares the names case-insensitively
+        used_names = {
+            name.lower(): disease_id
+            for disease_id, name in Disease.objects.filter(name__in=names).values_list(
+                "id", "name"
+            )
+        }
+        for disease_obj in diseases.values():
+            used_names[disease_obj.name.lower()] = disease_obj.id
+
+        lgd_counts = dict(
+            LocusGenotypeDisease.objects.filter(disease_id__in=diseases.keys())
+            .values("disease_id")
+            .annotate(total=Count("id"))
+            .values_list("disease_id", "total")
+        )
+
+        reports = []
+        synonyms = {}
+
+        for disease_data in data:
+            if not isinstance(disease_data, dict):
+                disease_data = {}
+
+            disease_id = disease_data.get("id")
+            new_name = disease_data.get("name")
+            add_synonym = disease_data.get("add_synonym", False)
+            report = {"updated": [], "errors": []}
+            reports.append(report)
+
+            if not disease_id or not new_name:
+                report["errors"].append({"error": "Both 'id' and 'name' are required."})
+                continue
+
+            if not validate_disease_name(new_name):
+                report["errors"].append(
+                    {
+                        "id": disease_id,
+                        "name": new_name,
+                        "error": f"Invalid disease name '{new_name}'",
+                    }
+                )
+                continue
+
+            disease_obj = diseases.get(get_id(disease_id))
+            if disease_obj is None:
+                raise Http404("No Disease matches the given query.")
+
+            # Ensure the new disease does not include leading or trailing whitespaces
+            new_disease_name = new_name.strip()
+
+            if new_disease_name == disease_obj.name:
+                report["errors"].append(
+                    {
+                        "id": disease_id,
+                        "name": new_disease_name,
+                        "error": "Disease name is already up to date.",
+                    }
+                )
+                continue
+
+            # Ensure the new name is unique
+            existing_id = used_names.get(new_disease_name.lower())
+            if existing_id is not None and existing_id != disease_obj.id:
+                report["errors"].append(
+                    {
+                        "id": disease_id,
+                        "name": new_disease_name,
+                        "existing_id": existing_id,
+                        "error": f"A disease with the name '{new_disease_name}' already exists.",
+                    }
+                )
+                continue
+
+            # Dot not update the name if disease is associated with multiple records
+            if lgd_counts.get(disease_obj.id, 0) > 1:
+                report["errors"].append(
+                    {
+                        "id": disease_id,
+                        "name": new_disease_name,
+                        "error": "Disease is associated with multiple records.",
+                    }
+                )
+                continue
+
+            current_name = disease_obj.name
+            if used_names.get(current_name.lower()) == disease_obj.id:
+                del used_names[current_name.lower()]
+            used_names[new_disease_name.lower()] = disease_obj.id
+
+            disease_obj.name = new_disease_name
+            self.add_update(disease_obj, current_name.lower(), new_disease_name.lower())
+            report["updated"].append({"id": disease_id, "name": new_disease_name})
+
+            # Add the previous name as synonym
+            if add_synonym:
+                synonyms.setdefault(
+                    (disease_obj.id, current_name.lower()),
+                    DiseaseSynonym(disease=disease_obj, synonym=current_name),
+                )
+
+        self.save_updates(Disease, ["name"])
+        self.add_synonyms(synonyms)
+
+        return reports
+
+    def add_synonyms(self, synonyms):
+        """
+        Inserts the synonyms that are not in G2P yet.
+
+        Args:
+            synonyms: dict of DiseaseSynonym objects (key: (disease id, lower case synonym))
+        """
+        if not synonyms:
+            return
+
+        existing_synonyms = {
+            (disease_id, synonym.lower())
+            for disease_id, synonym in DiseaseSynonym.objects.filter(
+                disease_id__in={disease_id for disease_id, synonym in synonyms},
+                synonym__in={obj.synonym for obj in synonyms.values()},
+            ).values_list("disease_id", "synonym")
+        }
+
+        new_synonyms = [
+            obj for key, obj in synonyms.items() if key not in existing_synonyms
+        ]
+
+        if new_synonyms:
+            # ignore_conflicts: the synonym could have been added by another request
+            bulk_create_with_history(
+                new_synonyms,
+                DiseaseSynonym,
+                ignore_conflicts=True,
+                default_user=self.user,
+            )
@@ -1,9 +1,17 @@
 from rest_framework import serializers
-from ..models import GenCCSubmission, G2PStableID, LocusGenotypeDisease
+from ..models import (
+    GenCCSubmission,
+    G2PStableID,
+    LocusGenotypeDisease,
+    LocusIdentifier,
+    DiseaseOntologyTerm,
+    LGDPanel,
+    LGDPublication,
+)
 from django.db.models import OuterRef, Exists
-from typing import Any
+from typing import Any, Iterator
 from django.db.models.query import QuerySet
-from django.core.exceptions import ObjectDoesNotExist
+from itertools import islice
 
 
 class GenCCSubmissionListSerializer(serializers.ListSerializer):
@@ -21,15 +29,21 @@ class GenCCSubmissionListSerializer(serializers.ListSerializer):
         Returns:
             list: Returns the validated list
         """
+        # Fetch all the stable ids with one query
+        stable_ids = {
+            g2p_stable.stable_id: g2p_stable
+            for g2p_stable in G2PStableID.objects.filter(
+                stable_id__in={item["g2p_stable_id"] for item in data}
+            )
+        }
+
         for item in data:
             stable_id_value = item.pop("g2p_stable_id")
-            try:
-                g2p_stable = G2PStableID.objects.get(stable_id=stable_id_value)
-            except ObjectDoesNotExist:
+            if stable_id_value not in stable_ids:
                 raise serializers.ValidationError(
                     f"G2PStableID with stable_id '{stable_id_value}' does not exist."
                 )
-            item["g2p_stable_id"] = g2p_stable
+            item["g2p_stable_id"] = stable_ids[stable_id_value]
         return data
 
     def create(self, validated_data: list) -> GenCCSubmission:
@@ -112,3 +126,254 @@ class GenCCSubmissionSerializer(serializers.ModelSerializer):
         return GenCCSubmission.objects.filter(submission_id=submission_id).values_list(
             "g2p_stable_id__stable_id", flat=True
         )
+
+
+class GenCCSubmissionPayload:
+    """Builds the GenCC submission file (one row per G2P record)
+
+    The file contains three types of submissions:
+        - create: live records that were never submitted to GenCC
+        - update: records reviewed after the last GenCC submission
+        - withdraw: submitted records that are not live anymore (deleted or not public)
+
+    The records are selected with anti-joins (NOT EXISTS) on the gencc_submission table
+    and fetched in chunks. The gene, disease and publications of each chunk are fetched
+    with one query each.
+    """
+
+    SUBMITTER_ID = "GENCC:000112"
+    SUBMITTER_NAME = "TGMI|G2P"
+    PUBLIC_REPORT_URL = "https://www.ebi.ac.uk/gene2phenotype/lgd/"
+    ASSERTION_CRITERIA_URL = "https://www.ebi.ac.uk/gene2phenotype/about/terminology"
+
+    HEADER = [
+        "submission_id",
+        "submission_type",
+        "g2p_id",
+        "hgnc_id",
+        "hgnc_symbol",
+        "disease_id",
+        "disease_name",
+        "moi_id",
+        "moi_name",
+        "submitter_id",
+        "submitter_name",
+        "classification_id",
+        "classification_name",
+        "date",
+        "public_report_url",
+        "notes",
+        "pmids",
+        "assertion_criteria_url",
+    ]
+
+    # G2P allelic requirement to GenCC mode of inheritance (HPO)
+    MOI = {
+        "biallelic_autosomal": ("HP:0000007", "Autosomal recessive"),
+        "biallelic_PAR": ("HP:0000007", "Autosomal recessive"),
+        "monoallelic_autosomal": ("HP:0000006", "Autosomal dominant"),
+        "monoallelic_PAR": ("HP:0000006", "Autosomal dominant"),
+        "monoallelic_X_hemizygous": ("HP:0001419", "X-linked recessive"),
+        "monoallelic_X_heterozygous": ("HP:0001423", "X-linked dominant"),
+        "monoallelic_X": ("HP:0001417", "X-linked"),
+        "monoallelic_Y_hemizygous": ("HP:0001450", "Y-linked inheritance"),
+        "mitochondrial": ("HP:0001427", "Mitochondrial"),
+    }
+    UNKNOWN_MOI = ("HP:0000005", "Unknown")
+
+    # G2P confidence to GenCC classification
+    CLASSIFICATION = {
+        "definitive": ("GENCC:100001", "Definitive"),
+        "strong": ("GENCC:100002", "Strong"),
+        "moderate": ("GENCC:100003", "Moderate"),
+        "limited": ("GENCC:100004", "Limited"),
+        "disputed": ("GENCC:100005", "Disputed Evidence"),
+        "refuted": ("GENCC:100006", "Refuted Evidence"),
+    }
+
+    RECORD_FIELDS = [
+        "id",
+        "stable_id_id",
+        "stable_id__stable_id",
+        "locus_id",
+        "locus__name",
+        "disease_id",
+        "disease__name",
+        "genotype__value",
+        "confidence__value",
+        "date_review",
+    ]
+
+    def __init__(self, chunk_size: int = 2000):
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def public_records() -> QuerySet[LocusGenotypeDisease]:
+        """Live records linked to at least one visible panel"""
+        return LocusGenotypeDisease.objects.filter(
+            Exists(
+                LGDPanel.objects.filter(
+                    lgd=OuterRef("id"), is_deleted=0, panel__is_visible=1
+                )
+            ),
+            is_deleted=0,
+            stable_id__is_live=1,
+        )
+
+    def new_records(self) -> QuerySet[LocusGenotypeDisease]:
+        """Public records without GenCC submissions"""
+        return self.public_records().filter(
+            ~Exists(GenCCSubmission.objects.filter(g2p_stable_id=OuterRef("stable_id")))
+        )
+
+    def updated_records(self) -> QuerySet[LocusGenotypeDisease]:
+        """Public records reviewed after the last GenCC submission"""
+        return self.public_records().filter(
+            Exists(GenCCSubmission.objects.filter(g2p_stable_id=OuterRef("stable_id"))),
+            ~Exists(
+                GenCCSubmission.objects.filter(
+                    g2p_stable_id=OuterRef("stable_id"),
+                    date_of_submission__gte=OuterRef("date_review"),
+                )
+            ),
+            date_review__isnull=False,
+        )
+
+    def withdrawn_submissions(self) -> QuerySet[GenCCSubmission]:
+        """GenCC submissions of records that are not public anymore"""
+        return GenCCSubmission.objects.filter(
+            ~Exists(
+                self.public_records().filter(stable_id=OuterRef("g2p_stable_id"))
+            )
+        )
+
+    def chunks(self, queryset: QuerySet) -> Iterator[list]:
+        iterator = queryset.iterator(chunk_size=self.chunk_size)
+        while chunk := list(islice(iterator, self.chunk_size)):
+            yield chunk
+
+    @staticmethod
+    def get_last_submissions(stable_ids: set) -> dict:
+        """Returns the last submission ID of each stable id (key: stable id internal id)"""
+        return dict(
+            GenCCSubmission.objects.filter(g2p_stable_id__in=stable_ids)
+            .order_by("date_of_submission", "id")
+            .values_list("g2p_stable_id", "submission_id")
+        )
+
+    def record_rows(self, records: list, submission_type: str) -> Iterator[list]:
+        """Returns the rows of a chunk of records
+
+        Args:
+            records (list): list of records (dict with the RECORD_FIELDS)
+            submission_type (str): 'create' or 'update'
+        """
+        hgnc_ids = dict(
+            LocusIdentifier.objects.filter(
+                locus_id__in={record["locus_id"] for record in records},
+                source__name="HGNC",
+            ).values_list("locus_id", "identifier")
+        )
+
+        # Mondo ID or OMIM ID
+        disease_ids = {}
+        for disease_id, accession, source in DiseaseOntologyTerm.objects.filter(
+            disease_id__in={record["disease_id"] for record in records},
+            ontology_term__source__name__in=["Mondo", "OMIM"],
+        ).values_list(
+            "disease_id", "ontology_term__accession", "ontology_term__source__name"
+        ):
+            if source == "Mondo":
+                disease_ids[disease_id] = accession
+            elif disease_id not in disease_ids:
+                disease_ids[disease_id] = (
+                    accession if accession.startswith("OMIM:") else f"OMIM:{accession}"
+                )
+
+        pmids = {}
+        for lgd_id, pmid in (
+            LGDPublication.objects.filter(
+                lgd_id__in={record["id"] for record in records}, is_deleted=0
+            )
+            .order_by("publication__pmid")
+            .values_list("lgd_id", "publication__pmid")
+        ):
+            pmids.setdefault(lgd_id, []).append(str(pmid))
+
+        submission_ids = {}
+        if submission_type != "create":
+            submission_ids = self.get_last_submissions(
+                {record["stable_id_id"] for record in records}
+            )
+
+        for record in records:
+            moi_id, moi_name = self.MOI.get(record["genotype__value"], self.UNKNOWN_MOI)
+            classification_id, classification_name = self.CLASSIFICATION.get(
+                record["confidence__value"], ("", "")
+            )
+
+            yield [
+                submission_ids.get(record["stable_id_id"], ""),
+                submission_type,
+                record["stable_id__stable_id"],
+                hgnc_ids.get(record["locus_id"], ""),
+                record["locus__name"],
+                disease_ids.get(record["disease_id"], ""),
+                record["disease__name"],
+                moi_id,
+                moi_name,
+                self.SUBMITTER_ID,
+                self.SUBMITTER_NAME,
+                classification_id,
+                classification_name,
+                record["date_review"].strftime("%Y-%m-%d")
+                if record["date_review"]
+                else "",
+                self.PUBLIC_REPORT_URL + record["stable_id__stable_id"],
+                "",
+                ", ".join(pmids.get(record["id"], [])),
+                self.ASSERTION_CRITERIA_URL,
+            ]
+
+    def withdrawn_rows(self) -> Iterator[list]:
+        """Returns one row per withdrawn stable id with the last submission ID"""
+        submissions = (
+            self.withdrawn_submissions()
+            .order_by("g2p_stable_id", "-date_of_submission", "-id")
+            .values_list("g2p_stable_id", "g2p_stable_id__stable_id", "submission_id")
+        )
+
+        last_stable_id = None
+        for g2p_stable_id, stable_id, submission_id in submissions.iterator(
+            chunk_size=self.chunk_size
+        ):
+            if g2p_stable_id == last_stable_id:
+                continue
+            last_stable_id = g2p_stable_id
+
+            row = dict.fromkeys(self.HEADER, "")
+            row.update(
+                {
+                    "submission_id": submission_id,
+                    "submission_type": "withdraw",
+                    "g2p_id": stable_id,
+                    "submitter_id": self.SUBMITTER_ID,
+                    "submitter_name": self.SUBMITTER_NAME,
+                }
+            )
+            yield list(row.values())
+
+    def rows(self) -> Iterator[list]:
+        """Returns the header and the rows of the submission file"""
+        yield self.HEADER
+
+        for submission_type, queryset in (
+            ("create", self.new_records()),
+            ("update", self.updated_records()),
+        ):
+            for records in self.chunks(
+                queryset.order_by("id").values(*self.RECORD_FIELDS)
+            ):
+                yield from self.record_rows(records, submission_type)
+
+        yield from self.withdrawn_rows()
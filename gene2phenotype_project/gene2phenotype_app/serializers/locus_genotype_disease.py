@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from simple_history.utils import bulk_create_with_history, bulk_update_with_history
 from django.db import IntegrityError
 from django.db.models import Prefetch
 from django.conf import settings
@@ -20,7 +21,6 @@ from ..models import (
     Locus,
     LGDComment,
     LGDVariantTypeComment,
-    User,
     LGDMolecularMechanismEvidence,
     CVMolecularMechanism,
     OntologyTerm,
@@ -38,6 +38,7 @@ from .panel import LGDPanelSerializer
 
 from ..utils import get_date_now, ConfidenceCustomMail
 from ..utils import validate_mechanism_synopsis, validate_confidence_publications
+from ..user_context import get_user_context
 
 
 class LocusGenotypeDiseaseSerializer(serializers.ModelSerializer):
@@ -107,11 +108,7 @@ class LocusGenotypeDiseaseSerializer(serializers.ModelSerializer):
         If available, also returns the evidence.
         """
         user = self.context.get("user")
-        try:
-            User.objects.get(email=user)
-            authenticated_user = 1
-        except User.DoesNotExist:
-            authenticated_user = 0
+        authenticated_user = get_user_context(user).is_authenticated
 
         mechanism = id.mechanism.value
         mechanism_support = id.mechanism_support.value
@@ -145,7 +142,7 @@ class LocusGenotypeDiseaseSerializer(serializers.ModelSerializer):
                 }
                 # If description is defined and the user is authenticated,
                 # overwrite the description in the output
-                if evidence_data.description and authenticated_user == 1:
+                if evidence_data.description and authenticated_user:
                     mechanism_evidence[pmid]["descriptions"] = [
                         evidence_data.description
                     ]
@@ -163,7 +160,7 @@ class LocusGenotypeDiseaseSerializer(serializers.ModelSerializer):
                 # Update description
                 if (
                     evidence_data.description
-                    and authenticated_user == 1
+                    and authenticated_user
                     and evidence_data.description
                     not in mechanism_evidence[pmid]["descriptions"]
                 ):
@@ -273,13 +270,9 @@ class LocusGenotypeDiseaseSerializer(serializers.ModelSerializer):
         """
         # Check if user is authenticated
         user = self.context.get("user")
-        try:
-            User.objects.get(email=user)
-            authenticated_user = 1
-        except User.DoesNotExist:
-            authenticated_user = 0
+        authenticated_user = get_user_context(user).is_authenticated
 
-        if authenticated_user == 1:
+        if authenticated_user:
             # Authenticated users have access to comments
             queryset = LGDVariantType.objects.filter(
                 lgd_id=id, is_deleted=0
@@ -394,11 +387,7 @@ class LocusGenotypeDiseaseSerializer(serializers.ModelSerializer):
         """
         # Check if user is authenticated
         user = self.context.get("user")
-        try:
-            User.objects.get(email=user)
-            authenticated_user = 1
-        except User.DoesNotExist:
-            authenticated_user = 0
+        authenticated_user = get_user_context(user).is_authenticated
 
         # If user is autenticated return all panels
         # otherwise return only the visible panels
@@ -419,15 +408,11 @@ class LocusGenotypeDiseaseSerializer(serializers.ModelSerializer):
         """
         # Check if user is authenticated
         user = self.context.get("user")
-        try:
-            User.objects.get(email=user)
-            authenticated_user = 1
-        except User.DoesNotExist:
-            authenticated_user = 0
+        authenticated_user = get_user_context(user).is_authenticated
 
         # If user is authenticated return all comments
         # otherwise return only the public comments
-        if authenticated_user == 1:
+        if authenticated_user:
             lgd_comments = LGDComment.objects.filter(
                 lgd_id=id, is_deleted=0
             ).prefetch_related()
@@ -451,7 +436,7 @@ class LocusGenotypeDiseaseSerializer(serializers.ModelSerializer):
             }
 
             # authenticated users can have access to the user name
-            if authenticated_user == 1:
+            if authenticated_user:
                 text["user"] = f"{comment.user.first_name} {comment.user.last_name}"
 
             data.append(text)
@@ -729,10 +714,9 @@ class LocusGenotypeDiseaseSerializer(serializers.ModelSerializer):
         # Save all updates
         instance.save()
 
-        user_obj = User.objects.get(email=user)
         if settings.SEND_MAILS is True:
             ConfidenceCustomMail(
-                instance, old_confidence, user_obj, request
+                instance, old_confidence, user, request
             ).send_confidence_update_email()
 
         return instance
@@ -910,15 +894,29 @@ class LocusGenotypeDiseaseSerializer(serializers.ModelSerializer):
             }]
         """
 
+        # Fetch the publications with one query
+        # When updating the mechanism the supporting pmid used as evidence
+        # have to already be linked to the LGD record
+        pmids = {str(evidence["pmid"]) for evidence in validated_data}
+        publications = {
+            str(publication_obj.pmid): publication_obj
+            for publication_obj in Publication.objects.filter(
+                pmid__in=[pmid for pmid in pmids if pmid.isdigit()]
+            )
+        }
+
+        # Fetch the evidence values with one query (key: (subtype, value))
+        cv_evidence = {
+            (cv_evidence_obj.subtype, cv_evidence_obj.value): cv_evidence_obj
+            for cv_evidence_obj in CVMolecularMechanism.objects.filter(type="evidence")
+        }
+
+        # List of (publication, description, evidence value)
+        evidence_list = []
         for evidence in validated_data:
-            pmid = evidence["pmid"]
+            pmid = str(evidence["pmid"])
 
-            # Check if the PMID exists in G2P
-            # When updating the mechanism the supporting pmid used as evidence
-            # have to already be linked to the LGD record
-            try:
-                publication_obj = Publication.objects.get(pmid=pmid)
-            except Publication.DoesNotExist:
+            if pmid not in publications:
                 # TODO: improve in future to insert new pmids + link them to the record
                 raise serializers.ValidationError(
                     {"error": f"pmid '{pmid}' not found in G2P"}
@@ -941,38 +939,57 @@ class LocusGenotypeDiseaseSerializer(serializers.ModelSerializer):
                 # secondary_type is the evidence value ('human')
                 secondary_type = evidence_type["secondary_type"]
                 for m_type in secondary_type:
-                    try:
-                        cv_evidence_obj = CVMolecularMechanism.objects.get(
-                            value=m_type.lower(), type="evidence", subtype=primary_type
-                        )
-                    except CVMolecularMechanism.DoesNotExist:
+                    cv_evidence_obj = cv_evidence.get((primary_type, m_type.lower()))
+                    if cv_evidence_obj is None:
                         raise serializers.ValidationError(
                             {"error": f"Invalid mechanism evidence '{m_type}'"}
                         )
+                    evidence_list.append(
+                        (publications[pmid], description, cv_evidence_obj)
+                    )
 
-                    # Insert evidence
-                    try:
-                        mechanism_evidence_obj = (
-                            LGDMolecularMechanismEvidence.objects.get(
-                                lgd=lgd_obj,
-                                publication=publication_obj,
-                                evidence=cv_evidence_obj,
-                            )
-                        )
-                    except LGDMolecularMechanismEvidence.DoesNotExist:
-                        mechanism_evidence_obj = (
-                            LGDMolecularMechanismEvidence.objects.create(
-                                lgd=lgd_obj,
-                                description=description,
-                                publication=publication_obj,
-                                evidence=cv_evidence_obj,
-                                is_deleted=0,
-                            )
-                        )
-                    else:
-                        if mechanism_evidence_obj.is_deleted == 1:
-                            mechanism_evidence_obj.is_deleted = 0
-                            mechanism_evidence_obj.save()
+        # Existing evidence of the record (key: (publication id, evidence id))
+        lgd_evidence = {
+            (obj.publication_id, obj.evidence_id): obj
+            for obj in LGDMolecularMechanismEvidence.objects.filter(
+                lgd=lgd_obj,
+                publication__in=[publication for publication, _, _ in evidence_list],
+            )
+        }
+
+        new_objs = []
+        updated_objs = []
+        for publication_obj, description, cv_evidence_obj in evidence_list:
+            key = (publication_obj.id, cv_evidence_obj.id)
+            mechanism_evidence_obj = lgd_evidence.get(key)
+
+            if mechanism_evidence_obj is None:
+                mechanism_evidence_obj = LGDMolecularMechanismEvidence(
+                    lgd=lgd_obj,
+                    description=description,
+                    publication=publication_obj,
+                    evidence=cv_evidence_obj,
+                    is_deleted=0,
+                )
+                lgd_evidence[key] = mechanism_evidence_obj
+                new_objs.append(mechanism_evidence_obj)
+            elif mechanism_evidence_obj.is_deleted == 1:
+                mechanism_evidence_obj.is_deleted = 0
+                updated_objs.append(mechanism_evidence_obj)
+
+        # The history rows are saved with the user making the request
+        user = self.context.get("user")
+        if updated_objs:
+            bulk_update_with_history(
+                updated_objs,
+                LGDMolecularMechanismEvidence,
+                ["is_deleted"],
+                default_user=user,
+            )
+        if new_objs:
+            bulk_create_with_history(
+                new_objs, LGDMolecularMechanismEvidence, default_user=user
+            )
 
         # Update LGD date_review without creating an history row
         lgd_obj.date_review = get_date_now()
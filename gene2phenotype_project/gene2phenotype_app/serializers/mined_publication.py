@@ -1,6 +1,7 @@
 from rest_framework import serializers
+from simple_history.utils import bulk_update_with_history
 
-from ..models import LGDMinedPublication, MinedPublication
+from ..models import LGDMinedPublication
 
 
 ### G2P record (LGD) - mined publication ###
@@ -55,28 +56,24 @@ class LGDMinedPublicationSerializer(serializers.ModelSerializer):
                         "comments": [],
                     }]
         """
-        for publication in validated_data:
-            pmid = publication.get("publication").get("pmid")
-
-            # Check if the PMID exists in mined_publication table
-            try:
-                mined_publication_obj = MinedPublication.objects.get(pmid=pmid)
-            except MinedPublication.DoesNotExist:
-                # If the PMID does not exist then skip update
-                continue
-
-            # Check if the lgd - mined publication link already exists in lgd_mined_publication table
-            try:
-                lgd_mined_publication_obj = LGDMinedPublication.objects.get(
-                    lgd=lgd_obj, mined_publication=mined_publication_obj
-                )
-            except LGDMinedPublication.DoesNotExist:
-                # If the lgd - mined publication link does not exist then skip update
-                continue
-            else:
-                # If the lgd - mined publication link already exists then update status to "curated"
-                lgd_mined_publication_obj.status = "curated"
-                lgd_mined_publication_obj.save()
+        pmids = [
+            publication.get("publication").get("pmid") for publication in validated_data
+        ]
+
+        # Only the PMIDs already linked to the record as mined publications are updated
+        lgd_mined_publications = list(
+            LGDMinedPublication.objects.filter(
+                lgd=lgd_obj, mined_publication__pmid__in=pmids
+            )
+        )
+
+        for lgd_mined_publication_obj in lgd_mined_publications:
+            lgd_mined_publication_obj.status = "curated"
+
+        if lgd_mined_publications:
+            bulk_update_with_history(
+                lgd_mined_publications, LGDMinedPublication, ["status"]
+            )
 
     class Meta:
         model = LGDMinedPublication
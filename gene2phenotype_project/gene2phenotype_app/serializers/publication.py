@@ -78,6 +78,8 @@ class PublicationSerializer(serializers.ModelSerializer):
         Method to create a publication.
         This method is called when publishing a record.
         The PMID is mandatory.
+        If the EuropePMC response was already fetched (context 'publication_responses')
+        it is used instead of querying EuropePMC again.
 
         Args:
             (dict) validated_data: valid PublicationSerializer fields
@@ -95,7 +97,11 @@ class PublicationSerializer(serializers.ModelSerializer):
             publication_obj = Publication.objects.get(pmid=pmid)
 
         except Publication.DoesNotExist:
-            response = get_publication(pmid)
+            publication_responses = self.context.get("publication_responses", {})
+            if pmid in publication_responses:
+                response = publication_responses[pmid]
+            else:
+                response = get_publication(pmid)
 
             if response["hitCount"] == 0:
                 raise serializers.ValidationError(
@@ -11,6 +11,8 @@ from django.core.exceptions import ObjectDoesNotExist
 
 
 from ..utils import CustomMail
+from ..authentication import add_blacklisted_token
+from ..user_context import get_user_context
 from ..models import User, UserPanel, Panel
 
 
@@ -48,6 +50,11 @@ class UserSerializer(serializers.ModelSerializer):
         Output example: ["Developmental disorders", "Ear disorders"]
         """
         user_login = self.context.get("user")
+        user_context = get_user_context(user_login)
+        # The panels of the user making the request are already in the request context
+        if user_context.is_user(id):
+            return user_context.panel_descriptions
+
         if user_login and user_login.is_authenticated:
             user_panels = (
                 UserPanel.objects.filter(user=id, is_deleted=0)
@@ -71,6 +78,10 @@ class UserSerializer(serializers.ModelSerializer):
         Output example: ["DD", "Ear"]
         """
         user_login = self.context.get("user")
+        user_context = get_user_context(user_login)
+        if user_context.is_user(id):
+            return user_context.panel_names
+
         if user_login and user_login.is_authenticated:
             user_panels = (
                 UserPanel.objects.filter(user=id, is_deleted=0)
@@ -97,19 +108,11 @@ class UserSerializer(serializers.ModelSerializer):
             True if user has permission to edit at least one of the panels from the list
             False if user does not have permission to edit any of the panels
         """
-        user_login = self.context.get("user")
+        user_panels = set(get_user_context(self.context.get("user")).panel_names)
 
-        if user_login and user_login.is_authenticated:
-            for panel in panels:
-                panel_name = panel.get("name")
-                try:
-                    UserPanel.objects.get(
-                        user=user_login.id, panel__name=panel_name, is_deleted=0
-                    )
-                except UserPanel.DoesNotExist:
-                    continue
-                else:
-                    return True
+        for panel in panels:
+            if panel.get("name") in user_panels:
+                return True
 
         return False
 
@@ -805,3 +808,5 @@ class LogoutSerializer(serializers.Serializer):
             token.blacklist()
         except TokenError as e:
             raise serializers.ValidationError({"message": str(e)})
+
+        add_blacklisted_token(token)
@@ -0,0 +1,368 @@
+from io import StringIO
+from contextlib import redirect_stdout
+import xml.etree.ElementTree as ET
+import tempfile
+from difflib import SequenceMatcher
+import json
+import os
+import re
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, TransactionTestCase
+
+from gene2phenotype_app.models import (
+    Attrib,
+    Disease,
+    DiseaseOntologyTerm,
+    LocusGenotypeDisease,
+    OntologyTerm,
+)
+from gene2phenotype_app.utils import (
+    clean_string,
+    clean_omim_disease,
+    check_synonyms_disease,
+)
+from gene2phenotype_app.management.commands.datachecks import (
+    CHECKS,
+    DataCheckSnapshot,
+    register_check,
+    check_ar_publications,
+    check_cross_references,
+    check_near_duplicate_records,
+    find_merge_candidates,
+    mutation_consequence_constraint,
+)
+from gene2phenotype_app.management.commands.datachecks.SimilarRecords import (
+    get_visible_records,
+)
+from gene2phenotype_app.management.commands.datachecks.Similarity import (
+    similarity_below,
+)
+
+
+class TestCheckDataCommand(TestCase):
+    fixtures = [
+        "gene2phenotype_app/fixtures/attribs.json",
+        "gene2phenotype_app/fixtures/user_panels.json",
+        "gene2phenotype_app/fixtures/cv_molecular_mechanism.json",
+        "gene2phenotype_app/fixtures/g2p_stable_id.json",
+        "gene2phenotype_app/fixtures/source.json",
+        "gene2phenotype_app/fixtures/sequence.json",
+        "gene2phenotype_app/fixtures/locus.json",
+        "gene2phenotype_app/fixtures/disease.json",
+        "gene2phenotype_app/fixtures/ontology_term.json",
+        "gene2phenotype_app/fixtures/publication.json",
+        "gene2phenotype_app/fixtures/locus_genotype_disease.json",
+        "gene2phenotype_app/fixtures/lgd_panel.json",
+        "gene2phenotype_app/fixtures/lgd_publication.json",
+        "gene2phenotype_app/fixtures/lgd_mechanism_synopsis.json",
+    ]
+
+    def test_check_ar_publications(self):
+        snapshot = DataCheckSnapshot()
+
+        # Query the records, the panels and the publication counts
+        with self.assertNumQueries(3):
+            errors = check_ar_publications(snapshot=snapshot)
+
+        self.assertEqual(
+            sorted(error.msg for error in errors),
+            [
+                "'G2P00001' has confidence 'definitive' but only 1 publication(s)",
+                "'G2P00005' has confidence 'definitive' but only 0 publication(s)",
+                "'G2P00008' has confidence 'definitive' but only 1 publication(s)",
+                "'G2P00009' has confidence 'definitive' but only 1 publication(s)",
+            ],
+        )
+
+    def test_mutation_consequence_constraint(self):
+        snapshot = DataCheckSnapshot()
+        # Load the shared data before running the check
+        snapshot.processable_lgd_ids
+
+        # One query per check, the number of queries does not depend on the number of records
+        with self.assertNumQueries(5):
+            errors = mutation_consequence_constraint(snapshot=snapshot)
+
+        self.assertEqual(len(errors), 3)
+        self.assertIn(
+            "G2P00002 mechanism value is 'loss of function' and mechanism categorisation is 'aggregation'",
+            [error.msg for error in errors],
+        )
+
+    def test_check_data(self):
+        out = StringIO()
+        with self.assertLogs(
+            "gene2phenotype_app.management.commands.check_data", level="ERROR"
+        ) as cm, redirect_stdout(out):
+            call_command("check_data")
+
+        self.assertTrue(
+            any(
+                "'G2P00005' has confidence 'definitive' but only 0 publication(s)"
+                in msg
+                for msg in cm.output
+            )
+        )
+        self.assertIn("Timing report:", out.getvalue())
+        self.assertIn("check_ar_publications: 4 issue(s)", out.getvalue())
+
+    def test_check_data_only_skip(self):
+        out = StringIO()
+        with self.assertLogs(
+            "gene2phenotype_app.management.commands.check_data", level="WARNING"
+        ), redirect_stdout(out):
+            call_command(
+                "check_data",
+                "--only",
+                "check_ar_publications",
+                "check_cross_references",
+                "mutation_consequence_constraint",
+                "--skip",
+                "mutation_consequence_constraint",
+            )
+
+        self.assertIn("check_ar_publications: 4 issue(s)", out.getvalue())
+        self.assertIn("check_cross_references:", out.getvalue())
+        self.assertNotIn("mutation_consequence_constraint", out.getvalue())
+        self.assertNotIn("check_disease_name", out.getvalue())
+
+    def test_check_data_invalid_name(self):
+        with self.assertRaisesMessage(CommandError, "Unknown data check(s): bad_check"):
+            call_command("check_data", "--only", "bad_check")
+
+    def test_check_data_reports(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_file = os.path.join(tmp_dir, "report.json")
+            junit_file = os.path.join(tmp_dir, "report.xml")
+
+            with self.assertLogs(
+                "gene2phenotype_app.management.commands.check_data", level="ERROR"
+            ), redirect_stdout(StringIO()):
+                call_command(
+                    "check_data",
+                    "--only",
+                    "check_ar_constraint",
+                    "check_ar_publications",
+                    "--json_report",
+                    json_file,
+                    "--junit_report",
+                    junit_file,
+                )
+
+            with open(json_file) as fh:
+                report = json.load(fh)
+            testsuite = ET.parse(junit_file).getroot()
+
+        checks = {check["name"]: check for check in report["checks"]}
+        self.assertEqual(checks["check_ar_constraint"]["status"], "passed")
+        self.assertEqual(checks["check_ar_publications"]["status"], "failed")
+        self.assertEqual(checks["check_ar_publications"]["level"], "ERROR")
+        self.assertEqual(checks["check_ar_publications"]["issues"], 4)
+        self.assertEqual(len(checks["check_ar_publications"]["errors"]), 4)
+
+        self.assertEqual(testsuite.get("tests"), "2")
+        self.assertEqual(testsuite.get("failures"), "1")
+        failure = testsuite.find("testcase[@name='check_ar_publications']/failure")
+        self.assertEqual(failure.get("message"), "4 issue(s)")
+
+    def test_check_data_exception(self):
+        @register_check()
+        def check_raises_exception():
+            raise ValueError("Invalid data")
+
+        self.addCleanup(CHECKS.pop, "check_raises_exception")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_file = os.path.join(tmp_dir, "report.json")
+
+            with self.assertLogs(
+                "gene2phenotype_app.management.commands.check_data", level="ERROR"
+            ) as cm, redirect_stdout(StringIO()), self.assertRaisesMessage(
+                CommandError, "Data check(s) failed to run: check_raises_exception"
+            ):
+                call_command(
+                    "check_data",
+                    "--only",
+                    "check_ar_constraint",
+                    "check_raises_exception",
+                    "--json_report",
+                    json_file,
+                )
+
+            # The report is written before the command exits with an error
+            with open(json_file) as fh:
+                report = json.load(fh)
+
+        self.assertIn(
+            "Data check 'check_raises_exception' failed: Invalid data", cm.output[0]
+        )
+        checks = {check["name"]: check for check in report["checks"]}
+        self.assertEqual(checks["check_ar_constraint"]["status"], "passed")
+        self.assertEqual(checks["check_raises_exception"]["status"], "error")
+
+
+class TestCheckDataParallel(TransactionTestCase):
+    """
+    Run the checks in parallel (--jobs), each thread uses its own database connection.
+    The fixtures have to be committed to be read by the other connections.
+    """
+
+    fixtures = TestCheckDataCommand.fixtures
+
+    def test_check_data_jobs(self):
+        out = StringIO()
+        with self.assertLogs(
+            "gene2phenotype_app.management.commands.check_data", level="ERROR"
+        ) as cm, redirect_stdout(out):
+            call_command(
+                "check_data",
+                "--only",
+                "check_ar_publications",
+                "check_ar_constraint",
+                "mutation_consequence_constraint",
+                "--jobs",
+                "2",
+            )
+
+        self.assertIn("check_ar_publications: 4 issue(s)", out.getvalue())
+        self.assertIn("check_ar_constraint: 0 issue(s)", out.getvalue())
+        self.assertIn("mutation_consequence_constraint: 3 issue(s)", out.getvalue())
+        # The issues are logged in the order the checks were registered
+        self.assertIn("'G2P00001' has confidence 'definitive'", cm.output[0])
+
+
+class TestCrossReferencesCheck(TestCase):
+    """
+    Compare the fast similarity check with the full SequenceMatcher ratio
+    """
+
+    fixtures = TestCheckDataCommand.fixtures
+
+    def reference_check_cross_references(self):
+        """
+        Original implementation: full SequenceMatcher ratio for each pair
+        """
+        messages = []
+
+        for obj in DiseaseOntologyTerm.objects.filter(
+            disease__id__in=LocusGenotypeDisease.objects.filter(
+                lgdpanel__panel__is_visible=1, is_deleted=0
+            ).values("disease")
+        ).select_related("disease", "ontology_term"):
+            new_disease_name = re.sub(r".*\-related\s*", "", obj.disease.name).strip()
+            term_without_type = clean_omim_disease(obj.ontology_term.term)
+            synonyms_g2p_name = check_synonyms_disease(obj.ontology_term.term.lower())
+
+            if synonyms_g2p_name and synonyms_g2p_name == new_disease_name.lower():
+                continue
+            if "deafness" in new_disease_name and "hearing loss" in term_without_type:
+                continue
+
+            score = SequenceMatcher(
+                None,
+                clean_string(new_disease_name).lower(),
+                clean_string(term_without_type).lower(),
+            ).ratio()
+
+            if (
+                score < 0.3
+                and new_disease_name.lower() not in term_without_type
+                and term_without_type not in new_disease_name.lower()
+            ):
+                messages.append(
+                    f"Disease '{obj.disease.name}' associated with suspicious ontology disease '{obj.ontology_term.term}' ({obj.ontology_term.accession})"
+                )
+
+        return messages
+
+    def test_similarity_below(self):
+        disease_names = [
+            clean_string(name)
+            for name in Disease.objects.values_list("name", flat=True)
+        ]
+        terms = [
+            clean_string(clean_omim_disease(term))
+            for term in OntologyTerm.objects.values_list("term", flat=True)
+        ]
+        # Long names use the SequenceMatcher autojunk heuristic
+        disease_names.append(" ".join(disease_names))
+        terms.append(" ".join(terms))
+
+        for disease_name in disease_names:
+            for term in terms:
+                for threshold in (0.3, 0.5, 0.8):
+                    self.assertEqual(
+                        similarity_below(disease_name, term, threshold),
+                        SequenceMatcher(None, disease_name, term).ratio() < threshold,
+                        f"'{disease_name}' - '{term}' ({threshold})",
+                    )
+
+    def test_check_cross_references(self):
+        # Link all the diseases to all the ontology terms to get suspicious links
+        mapped_by = Attrib.objects.first()
+        existing_links = set(
+            DiseaseOntologyTerm.objects.values_list("disease_id", "ontology_term_id")
+        )
+        DiseaseOntologyTerm.objects.bulk_create(
+            [
+                DiseaseOntologyTerm(
+                    disease=disease,
+                    ontology_term=ontology_term,
+                    mapped_by_attrib=mapped_by,
+                )
+                for disease in Disease.objects.all()
+                for ontology_term in OntologyTerm.objects.all()
+                if (disease.id, ontology_term.id) not in existing_links
+            ]
+        )
+
+        errors = check_cross_references()
+
+        self.assertGreater(len(errors), 0)
+        self.assertEqual(
+            [error.msg for error in errors], self.reference_check_cross_references()
+        )
+
+
+class TestSimilarRecordsCheck(TestCase):
+    fixtures = TestCheckDataCommand.fixtures
+
+    def test_get_visible_records(self):
+        g2p_ids = [record["g2p_id"] for record in get_visible_records()]
+
+        # G2P00001 is linked to three visible panels
+        self.assertEqual(len(g2p_ids), len(set(g2p_ids)))
+        self.assertIn("G2P00001", g2p_ids)
+
+    def test_find_merge_candidates(self):
+        # One query for the records and one query for the ontology terms
+        with self.assertNumQueries(2):
+            candidates = find_merge_candidates()
+
+        self.assertEqual(
+            candidates,
+            [
+                {
+                    "final_g2p_id": "G2P00002",
+                    "g2p_ids": ["G2P00006"],
+                    "score": 0.6,
+                    "diseases": [
+                        "RAB27A-related Griscelli syndrome",
+                        "RAB27A-related Griscelli syndrome biallelic",
+                    ],
+                    "shared_accessions": [],
+                }
+            ],
+        )
+
+    def test_check_near_duplicate_records(self):
+        errors = check_near_duplicate_records()
+
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0].id, "gene2phenotype_app.E602")
+        self.assertEqual(
+            errors[0].hint,
+            'Merge data: {"g2p_ids": ["G2P00006"], "final_g2p_id": "G2P00002"}',
+        )
@@ -0,0 +1,106 @@
+import os
+import tempfile
+import csv
+from io import StringIO
+
+from django.core.management import call_command, CommandError
+from django.test import TestCase
+
+from gene2phenotype_app.models import LGDPublication
+
+
+class TestImportPublicationFamiliesDataCommand(TestCase):
+    fixtures = [
+        "gene2phenotype_app/fixtures/attribs.json",
+        "gene2phenotype_app/fixtures/user_panels.json",
+        "gene2phenotype_app/fixtures/cv_molecular_mechanism.json",
+        "gene2phenotype_app/fixtures/g2p_stable_id.json",
+        "gene2phenotype_app/fixtures/source.json",
+        "gene2phenotype_app/fixtures/sequence.json",
+        "gene2phenotype_app/fixtures/locus.json",
+        "gene2phenotype_app/fixtures/disease.json",
+        "gene2phenotype_app/fixtures/ontology_term.json",
+        "gene2phenotype_app/fixtures/publication.json",
+        "gene2phenotype_app/fixtures/locus_genotype_disease.json",
+        "gene2phenotype_app/fixtures/lgd_publication.json",
+    ]
+
+    def setUp(self):
+        self.user_email = "john@test.ac.uk"
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.data_file = os.path.join(self.tmp_dir.name, "families.csv")
+        self.write_data_file("unknown")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_data_file(self, consanguinity_last_row):
+        with open(self.data_file, "w", newline="") as wr:
+            writer = csv.writer(wr)
+            writer.writerow(
+                [
+                    "g2p id",
+                    "lgd_id",
+                    "pmid",
+                    "publication_id",
+                    "number of families",
+                    "affected individuals",
+                    "ancestries",
+                    "consanguinity",
+                ]
+            )
+            writer.writerow(["G2P00001", "1", "3897232", "1", "2", "3", "", "no"])
+            writer.writerow(["G2P00002", "2", "15214012", "2", "1", "1", "", "yes"])
+            writer.writerow(
+                ["G2P00006", "5", "1882842", "6", "4", "5", "", consanguinity_last_row]
+            )
+
+    def run_command(self, *args):
+        out = StringIO()
+        call_command(
+            "import_publication_families_data",
+            "--data_file",
+            self.data_file,
+            "--email",
+            self.user_email,
+            "--batch_size",
+            "1",
+            *args,
+            stdout=out,
+            stderr=StringIO(),
+        )
+        return out.getvalue()
+
+    def test_dry_run(self):
+        output = self.run_command("--dry_run")
+
+        self.assertIn("Summary (dry run):", output)
+        self.assertIn("updated: 3", output)
+        self.assertFalse(
+            LGDPublication.objects.filter(number_of_families__isnull=False).exists()
+        )
+        self.assertFalse(os.path.exists(f"{self.data_file}.checkpoint"))
+
+    def test_resume(self):
+        self.write_data_file("invalid")
+
+        with self.assertRaisesMessage(CommandError, "Invalid consanguinity 'invalid'"):
+            self.run_command()
+
+        # The first two batches were committed
+        self.assertEqual(
+            LGDPublication.objects.filter(number_of_families__isnull=False).count(), 2
+        )
+        self.assertTrue(os.path.exists(f"{self.data_file}.checkpoint"))
+
+        # A new import cannot start while there is a checkpoint
+        with self.assertRaisesMessage(CommandError, "Use --resume"):
+            self.run_command()
+
+        self.write_data_file("unknown")
+        output = self.run_command("--resume")
+
+        self.assertIn("Resuming import from row 3", output)
+        self.assertIn("updated: 3", output)
+        self.assertEqual(LGDPublication.objects.get(id=6).number_of_families, 4)
+        self.assertFalse(os.path.exists(f"{self.data_file}.checkpoint"))
@@ -0,0 +1,100 @@
+import os
+import tempfile
+import csv
+
+from django.core.management import call_command, CommandError
+from django.test import TestCase
+
+from gene2phenotype_app.models import DiseaseOntologyTerm, OntologyTerm
+
+
+class TestLoadDiseaseOntologiesCommand(TestCase):
+    fixtures = [
+        "gene2phenotype_app/fixtures/attribs.json",
+        "gene2phenotype_app/fixtures/disease.json",
+        "gene2phenotype_app/fixtures/g2p_stable_id.json",
+        "gene2phenotype_app/fixtures/cv_molecular_mechanism.json",
+        "gene2phenotype_app/fixtures/locus_genotype_disease.json",
+        "gene2phenotype_app/fixtures/ontology_term.json",
+        "gene2phenotype_app/fixtures/source.json",
+        "gene2phenotype_app/fixtures/locus.json",
+        "gene2phenotype_app/fixtures/sequence.json",
+        "gene2phenotype_app/fixtures/user_panels.json"
+    ]
+
+    def setUp(self):
+        self.user_email = "john@test.ac.uk"
+
+        # Make a temp input file
+        self.tempfile = tempfile.NamedTemporaryFile(mode="w+", suffix=".csv", delete=False)
+        writer = csv.writer(self.tempfile, delimiter=",")
+        writer.writerow(["g2p id", "G2P disease name", "OMIM", "exact match MONDO", "status"])
+        writer.writerow(["G2P00001", "CEP290-related JOUBERT SYNDROME TYPE 5", "610188", "MONDO_0012345", "EXACT"])
+        writer.writerow(["G2P00001", "CEP290-related JOUBERT SYNDROME TYPE 5", "610188", "MONDO:0012345", "EXACT"])
+        writer.writerow(["G2P00001", "CEP290-related Joubert syndrome type 5", "610188", "MONDO:0099999", "EXACT"])
+        writer.writerow(["G2P00006", "RAB27A-related Griscelli syndrome biallelic", "607624", "MONDO:0012345", "EXACT"])
+        writer.writerow(["G2P00007", "CEP290-related JOUBERT SYNDROME TYPE 6", "610188", "MONDO:0012345", "DIFFERENT"])
+        self.tempfile.flush()
+        self.tempfile.close()
+
+        # Make a temp Mondo file
+        self.mondo_file = tempfile.NamedTemporaryFile(mode="w+", suffix=".obo", delete=False)
+        self.mondo_file.write(
+            "format-version: 1.2\n\n"
+            "[Term]\n"
+            "id: MONDO:0012345\n"
+            "name: Joubert syndrome 5\n"
+            'def: "A Joubert syndrome caused by mutation in the CEP290 gene." [OMIM:610188]\n\n'
+            "[Term]\n"
+            "id: MONDO:0099999\n"
+            "name: obsolete disease\n"
+            "is_obsolete: true\n"
+        )
+        self.mondo_file.close()
+
+    def tearDown(self):
+        # Clean up the temp files
+        for file in [self.tempfile.name, f"{self.tempfile.name}.checkpoint", self.mondo_file.name]:
+            if os.path.exists(file):
+                os.remove(file)
+
+    def test_load_disease_ontologies(self):
+        with self.assertLogs("gene2phenotype_app", level="WARNING") as cm:
+            call_command(
+                "load_disease_ontologies",
+                "--data_file", self.tempfile.name,
+                "--email", self.user_email,
+                "--mondo_file", self.mondo_file.name,
+                "--batch_size", "2",
+            )
+        self.assertTrue(any("Invalid ontology MONDO:0099999" in msg for msg in cm.output))
+        self.assertTrue(any("607624 not found associated with disease" in msg for msg in cm.output))
+
+        # Check database
+        ontology_obj = OntologyTerm.objects.get(accession="MONDO:0012345")
+        self.assertEqual(ontology_obj.term, "Joubert syndrome 5")
+        self.assertEqual(
+            ontology_obj.description,
+            "A Joubert syndrome caused by mutation in the CEP290 gene.",
+        )
+        self.assertEqual(len(OntologyTerm.history.filter(accession="MONDO:0012345")), 1)
+        self.assertFalse(OntologyTerm.objects.filter(accession="MONDO:0099999").exists())
+
+        disease_ontologies = DiseaseOntologyTerm.objects.filter(ontology_term=ontology_obj)
+        self.assertEqual(
+            list(disease_ontologies.values_list("disease__name", flat=True)),
+            ["CEP290-related JOUBERT SYNDROME TYPE 5"],
+        )
+        history_disease_ontologies = DiseaseOntologyTerm.history.filter(
+            history_user__email=self.user_email
+        )
+        self.assertEqual(len(history_disease_ontologies), 1)
+
+    def test_invalid_mondo_file(self):
+        with self.assertRaises(CommandError):
+            call_command(
+                "load_disease_ontologies",
+                "--data_file", self.tempfile.name,
+                "--email", self.user_email,
+                "--mondo_file", "mondo_missing.obo",
+            )
@@ -0,0 +1,70 @@
+import os
+import tempfile
+
+from django.core.management import call_command, CommandError
+from django.test import TestCase
+
+from gene2phenotype_app.models import GeneReference, GeneReferenceSynonym
+from gene2phenotype_app.utils import validate_gene
+
+
+class TestLoadGeneReferenceCommand(TestCase):
+    def setUp(self):
+        # Make a temp HGNC file
+        self.hgnc_file = tempfile.NamedTemporaryFile(mode="w+", suffix=".txt", delete=False)
+        self.hgnc_file.write(
+            "hgnc_id\tsymbol\tname\tstatus\tprev_symbol\talias_symbol\tensembl_gene_id\n"
+            'HGNC:29021\tCEP290\tcentrosomal protein 290\tApproved\tNPHP6\t"BBS14|JBTS5"\tENSG00000198707\n'
+            "HGNC:11317\tRAB27A\tRAB27A, member RAS oncogene family\tApproved\t\tGS2\tENSG00000069974\n"
+            "HGNC:99999\tOLD1\twithdrawn gene\tEntry Withdrawn\t\t\t\n"
+        )
+        self.hgnc_file.close()
+
+        # Make a temp morbidmap file
+        self.mim_file = tempfile.NamedTemporaryFile(mode="w+", suffix=".txt", delete=False)
+        self.mim_file.write(
+            "# Phenotype\tGene/Locus And Other Related Symbols\tMIM Number\tCyto Location\n"
+            "Joubert syndrome 5, 610188 (3)\tCEP290, NPHP6, JBTS5\t610142\t12q21.32\n"
+            "{Bardet-Biedl syndrome 14, modifier of}, 209900 (3)\tCEP290, NPHP6\t610142\t12q21.32\n"
+            "Griscelli syndrome, type 2 (3)\tRAB27A, GS2\t603868\t15q21.3\n"
+        )
+        self.mim_file.close()
+
+    def tearDown(self):
+        # Clean up the temp files
+        for file in [self.hgnc_file.name, self.mim_file.name]:
+            if os.path.exists(file):
+                os.remove(file)
+
+    def test_load_gene_reference(self):
+        call_command(
+            "load_gene_reference",
+            "--hgnc_file", self.hgnc_file.name,
+            "--mim_file", self.mim_file.name,
+        )
+
+        # Check database
+        self.assertEqual(GeneReference.objects.count(), 2)
+        self.assertEqual(GeneReferenceSynonym.objects.count(), 4)
+
+        # Validate the genes without querying Ensembl
+        gene = validate_gene("CEP290")
+        self.assertEqual(gene["primary_id"], "HGNC:29021")
+        self.assertEqual(gene["ensembl_id"], "ENSG00000198707")
+        self.assertEqual(sorted(gene["synonyms"]), ["BBS14", "JBTS5", "NPHP6"])
+        self.assertEqual(
+            sorted(mim["id"] for mim in gene["mim"]), ["209900", "610188"]
+        )
+
+        gene = validate_gene("gs2")
+        self.assertEqual(gene["display_id"], "RAB27A")
+        self.assertNotIn("mim", gene)
+
+        self.assertIsNone(validate_gene("OLD1"))
+
+    def test_invalid_file(self):
+        with self.assertRaises(CommandError):
+            call_command(
+                "load_gene_reference",
+                "--hgnc_file", "hgnc_missing.txt",
+            )
@@ -7,6 +7,7 @@ from django.core.management import call_command, CommandError
 from django.test import TestCase
 
 from gene2phenotype_app.models import MinedPublication, LGDMinedPublication
+from gene2phenotype_app.management.commands.importer import ImportCheckpoint
 
 
 class TestLoadMinedPublicationsCommand(TestCase):
@@ -43,6 +44,9 @@ class TestLoadMinedPublicationsCommand(TestCase):
         # Clean up the temp file
         if os.path.exists(self.tempfile.name):
             os.remove(self.tempfile.name)
+        # Checkpoint left by a failed import
+        if os.path.exists(f"{self.tempfile.name}.checkpoint"):
+            os.remove(f"{self.tempfile.name}.checkpoint")
 
     def test_load_mined_publications(self):
         with self.assertLogs("gene2phenotype_app", level="WARNING") as cm:
@@ -64,6 +68,73 @@ class TestLoadMinedPublicationsCommand(TestCase):
         history_lgd_mined_publications = LGDMinedPublication.history.all()
         self.assertEqual(len(history_lgd_mined_publications), 3)
 
+    def test_load_mined_publications_bulk(self):
+        # The PMIDs are already in the mined publications table
+        bulk_file = tempfile.NamedTemporaryFile(mode="w+", suffix=".csv", delete=False)
+        writer = csv.writer(bulk_file, delimiter=",")
+        writer.writerow(["PMID", "G2P_IDs"])
+        writer.writerow(["7866404", "G2P00001;G2P00002;G2P00008"])
+        writer.writerow(["32302040", "G2P00002;G2P12346"])
+        bulk_file.close()
+
+        with self.assertLogs("gene2phenotype_app", level="WARNING") as cm:
+            call_command(
+                "load_mined_publications",
+                "--data_file", bulk_file.name,
+                "--email", self.user_email,
+                "--bulk",
+                "--batch_size", "1",
+            )
+        os.remove(bulk_file.name)
+
+        self.assertTrue(any("G2P00001-7866404 already exists. Skipping import." in msg for msg in cm.output))
+        self.assertTrue(any("G2P00002-32302040 already exists. Skipping import." in msg for msg in cm.output))
+        self.assertTrue(any("Invalid G2P ID 'G2P12346'. Skipping import." in msg for msg in cm.output))
+
+        # Check database
+        self.assertEqual(MinedPublication.objects.count(), 2)
+        lgd_mined_publications = LGDMinedPublication.objects.filter(
+            mined_publication__pmid=7866404, status="mined"
+        )
+        self.assertEqual(
+            sorted(lgd_mined_publications.values_list("lgd__stable_id__stable_id", flat=True)),
+            ["G2P00001", "G2P00002", "G2P00008"],
+        )
+        history_lgd_mined_publications = LGDMinedPublication.history.filter(
+            history_user__email=self.user_email
+        )
+        self.assertEqual(len(history_lgd_mined_publications), 2)
+
+    def test_load_mined_publications_resume(self):
+        # The PMIDs are already in the mined publications table
+        resume_file = tempfile.NamedTemporaryFile(mode="w+", suffix=".csv", delete=False)
+        writer = csv.writer(resume_file, delimiter=",")
+        writer.writerow(["PMID", "G2P_IDs"])
+        writer.writerow(["7866404", "G2P12346;G2P00001"])
+        writer.writerow(["32302040", "G2P12346;G2P99999"])
+        resume_file.close()
+
+        # The first row was imported before the failure
+        ImportCheckpoint(f"{resume_file.name}.checkpoint", resume_file.name, 2).save(
+            1, {"imported": 1}
+        )
+
+        with self.assertLogs("gene2phenotype_app", level="WARNING"):
+            call_command(
+                "load_mined_publications",
+                "--data_file", resume_file.name,
+                "--email", self.user_email,
+                "--bulk",
+                "--batch_size", "1",
+                "--resume",
+                stdout=StringIO(),
+            )
+        os.remove(resume_file.name)
+
+        # Each invalid G2P ID is written once, including the IDs of the rows imported before the failure
+        with open("invalid_g2p_ids.txt") as fh:
+            self.assertEqual(fh.read().splitlines(), ["G2P12346", "G2P99999"])
+
     def test_invalid_file_extension(self):
         invalid_file = tempfile.NamedTemporaryFile(suffix=".txt")
         with self.assertRaises(CommandError):
@@ -1,13 +1,20 @@
+import datetime
+
 from django.test import TestCase
 from django.urls import reverse
 from django.conf import settings
+from django.core.management import call_command
 from rest_framework_simplejwt.tokens import RefreshToken
 from gene2phenotype_app.models import (
     User,
     LocusGenotypeDisease,
     LGDPublication,
     LGDPublicationComment,
+    CurationData,
+    G2PStableID,
+    PublishJob,
 )
+from gene2phenotype_app.utils import get_date_now
 
 
 class LGDAddCurationEndpoint(TestCase):
@@ -857,3 +864,228 @@ class LGDAddCurationEndpoint(TestCase):
             response_data_publish["detail"],
             "You do not have permission to perform this action.",
         )
+
+
+class PublishRecordAsyncEndpoint(TestCase):
+    """
+    Test endpoint to publish a record in the background
+    """
+
+    fixtures = [
+        "gene2phenotype_app/fixtures/g2p_stable_id.json",
+        "gene2phenotype_app/fixtures/user_panels.json",
+        "gene2phenotype_app/fixtures/auth_groups.json",
+        "gene2phenotype_app/fixtures/curation_data.json",
+        "gene2phenotype_app/fixtures/sequence.json",
+        "gene2phenotype_app/fixtures/locus.json",
+        "gene2phenotype_app/fixtures/source.json",
+        "gene2phenotype_app/fixtures/attribs.json",
+        "gene2phenotype_app/fixtures/cv_molecular_mechanism.json",
+        "gene2phenotype_app/fixtures/ontology_term.json",
+        "gene2phenotype_app/fixtures/locus_genotype_disease.json",
+        "gene2phenotype_app/fixtures/disease.json",
+        "gene2phenotype_app/fixtures/publication.json",
+    ]
+
+    def setUp(self):
+        self.url_add_curation = reverse("add_curation_data")
+
+    def login_user(self):
+        self.user = User.objects.get(email="user5@test.ac.uk")
+        refresh = RefreshToken.for_user(self.user)
+        self.client.cookies[settings.SIMPLE_JWT["AUTH_COOKIE"]] = str(
+            refresh.access_token
+        )
+
+    def add_curation_draft(self):
+        """
+        Save a curation draft that can be published and return its stable ID
+        """
+        # Define the input data structure
+        data_to_add = {
+            "json_data": {
+                "allelic_requirement": "monoallelic_Y_hemizygous",
+                "confidence": "limited",
+                "cross_cutting_modifier": ["potential secondary finding"],
+                "disease": {
+                    "cross_references": [],
+                    "disease_name": "SRY-related 46,xx sex reversal",
+                },
+                "locus": "SRY",
+                "mechanism_evidence": [],
+                "mechanism_synopsis": [
+                    {"name": "destabilising LOF", "support": "inferred"}
+                ],
+                "molecular_mechanism": {
+                    "name": "loss of function",
+                    "support": "evidence",
+                },
+                "panels": ["Developmental disorders"],
+                "phenotypes": [],
+                "private_comment": "",
+                "public_comment": "test comment public",
+                "publications": [
+                    {
+                        "affectedIndividuals": 1,
+                        "ancestries": "test",
+                        "authors": "Bame KJ, Rome LH.",
+                        "comment": "test comment",
+                        "consanguineous": "no",
+                        "families": 1,
+                        "pmid": "3897232",
+                        "source": "G2P",
+                        "title": "Acetyl coenzyme A: alpha-glucosaminide N-acetyltransferase. Evidence for a transmembrane acetylation mechanism.",
+                        "year": 1985,
+                    }
+                ],
+                "session_name": "Test async",
+                "variant_consequences": [
+                    {
+                        "support": "inferred",
+                        "variant_consequence": "decreased_gene_product_level",
+                    }
+                ],
+                "variant_descriptions": [],
+                "variant_types": [],
+            }
+        }
+
+        # Save the curation draft
+        response = self.client.post(
+            self.url_add_curation, data_to_add, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200)
+        stable_id = response.json()["result"]
+
+        return stable_id
+
+    def test_publish_async(self):
+        """
+        Test publishing a record in the background.
+        The endpoint adds the record to the queue and the record is only
+        published when the command 'process_publish_jobs' runs.
+        """
+        self.login_user()
+        stable_id = self.add_curation_draft()
+
+        # Call the endpoint to publish in the background
+        url_publish = reverse("publish_record", kwargs={"stable_id": stable_id})
+        response_publish = self.client.post(
+            f"{url_publish}?async=true", content_type="application/json"
+        )
+        self.assertEqual(response_publish.status_code, 202)
+
+        response_data_publish = response_publish.json()
+        self.assertEqual(
+            response_data_publish["message"],
+            f"Record '{stable_id}' queued to be published",
+        )
+        job_id = response_data_publish["job_id"]
+
+        # The record is not published until the job runs
+        url_status = reverse("publish_job_status", kwargs={"job_id": job_id})
+        response_status = self.client.get(url_status)
+        self.assertEqual(response_status.status_code, 200)
+        self.assertEqual(response_status.json()["status"], "queued")
+        self.assertTrue(
+            CurationData.objects.filter(stable_id__stable_id=stable_id).exists()
+        )
+
+        # Publishing the same record again returns the queued job
+        response_publish_2 = self.client.post(
+            f"{url_publish}?async=true", content_type="application/json"
+        )
+        self.assertEqual(response_publish_2.status_code, 200)
+        self.assertEqual(response_publish_2.json()["job_id"], job_id)
+
+        call_command("process_publish_jobs", "--once")
+
+        response_status = self.client.get(url_status)
+        self.assertEqual(response_status.status_code, 200)
+        response_data_status = response_status.json()
+        self.assertEqual(response_data_status["status"], "completed")
+        self.assertEqual(
+            response_data_status["message"],
+            f"Record '{stable_id}' published successfully",
+        )
+
+        # Check inserted data
+        lgd_obj = LocusGenotypeDisease.objects.get(
+            stable_id__stable_id=stable_id, is_deleted=0
+        )
+        lgd_publications = LGDPublication.objects.filter(lgd=lgd_obj, is_deleted=0)
+        self.assertEqual(len(lgd_publications), 1)
+        self.assertFalse(
+            CurationData.objects.filter(stable_id__stable_id=stable_id).exists()
+        )
+
+    def test_publish_job_status_not_found(self):
+        """
+        Test the endpoint to fetch the status of a job that does not exist
+        """
+        self.login_user()
+
+        url_status = reverse("publish_job_status", kwargs={"job_id": 100})
+        response_status = self.client.get(url_status)
+        self.assertEqual(response_status.status_code, 404)
+        self.assertEqual(
+            response_status.json()["error"],
+            "No matching Publish job found for: 100",
+        )
+
+    def test_publish_async_stale_job(self):
+        """
+        Test a job that did not finish only blocks the record until it times out
+        """
+        self.login_user()
+        stable_id = self.add_curation_draft()
+        stable_id_obj = G2PStableID.objects.get(stable_id=stable_id)
+        job_obj = PublishJob.objects.create(
+            stable_id=stable_id_obj,
+            user=self.user,
+            status="fetching",
+            date_created=get_date_now(),
+            date_started=get_date_now(),
+        )
+
+        url_publish = reverse("publish_record", kwargs={"stable_id": stable_id})
+        response = self.client.post(
+            f"{url_publish}?async=true", content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["job_id"], job_obj.id)
+
+        # The job started before the timeout
+        job_obj.date_started = get_date_now() - datetime.timedelta(
+            seconds=settings.PUBLISH_JOB_TIMEOUT_SECONDS + 60
+        )
+        job_obj.save()
+
+        response = self.client.post(
+            f"{url_publish}?async=true", content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 202)
+        self.assertNotEqual(response.json()["job_id"], job_obj.id)
+
+        job_obj.refresh_from_db()
+        self.assertEqual(job_obj.status, "failed")
+        self.assertIsNotNone(job_obj.date_completed)
+
+    def test_process_stale_job(self):
+        """
+        Test the command 'process_publish_jobs' sets the jobs that did not finish to 'failed'
+        """
+        self.user = User.objects.get(email="user5@test.ac.uk")
+        job_obj = PublishJob.objects.create(
+            stable_id=G2PStableID.objects.get(stable_id="G2P00004"),
+            user=self.user,
+            status="publishing",
+            date_created=get_date_now(),
+            date_started=get_date_now()
+            - datetime.timedelta(seconds=settings.PUBLISH_JOB_TIMEOUT_SECONDS + 60),
+        )
+
+        call_command("process_publish_jobs", "--once")
+
+        job_obj.refresh_from_db()
+        self.assertEqual(job_obj.status, "failed")
@@ -12,7 +12,10 @@ from gene2phenotype_app.models import (
     LGDVariantTypeDescription,
     LGDMolecularMechanismEvidence,
     LocusGenotypeDisease,
+    OntologyTerm,
+    Publication,
 )
+from gene2phenotype_app.serializers import LGDBulkEdit
 
 
 class LGDDeletePublication(TestCase):
@@ -45,6 +48,9 @@ class LGDDeletePublication(TestCase):
         "gene2phenotype_app/fixtures/lgd_variant_consequence.json",
     ]
 
+    # Number of queries to delete a publication, it does not depend on the number of rows linked to it
+    DELETE_PUBLICATION_NUM_QUERIES = 32
+
     def setUp(self):
         self.url_delete = reverse("lgd_publication", kwargs={"stable_id": "G2P00002"})
         self.url_try_delete = reverse(
@@ -267,3 +273,139 @@ class LGDDeletePublication(TestCase):
         self.assertEqual(len(history_records_mechanism_evidence), 1)
         history_records_lgd = LocusGenotypeDisease.history.all()
         self.assertEqual(len(history_records_lgd), 0)
+
+    def delete_publication_captured_queries(self, num_queries):
+        """
+        Delete the publication 15214012 from G2P00002 and check the number of queries
+        """
+        to_delete = {"pmid": 15214012}
+
+        # Login
+        user = User.objects.get(email="john@test.ac.uk")
+        refresh = RefreshToken.for_user(user)
+        access_token = str(refresh.access_token)
+
+        # Authenticate by setting cookie on the test client
+        self.client.cookies[settings.SIMPLE_JWT["AUTH_COOKIE"]] = access_token
+
+        with self.assertNumQueries(num_queries) as queries:
+            response = self.client.patch(
+                self.url_delete, to_delete, content_type="application/json"
+            )
+        self.assertEqual(response.status_code, 200)
+
+        return queries.captured_queries
+
+    def test_lgd_publication_delete_num_queries(self):
+        """
+        Test the data linked to the publication is deleted with one query per table
+        """
+        captured_queries = self.delete_publication_captured_queries(
+            self.DELETE_PUBLICATION_NUM_QUERIES
+        )
+
+        # Each table is updated once, the history rows are created with one insert
+        for model in [
+            LGDPhenotype,
+            LGDPhenotypeSummary,
+            LGDVariantType,
+            LGDVariantTypeComment,
+            LGDVariantTypeDescription,
+            LGDMolecularMechanismEvidence,
+        ]:
+            updates = [
+                query["sql"]
+                for query in captured_queries
+                if query["sql"].startswith(f'UPDATE "{model._meta.db_table}"')
+            ]
+            self.assertEqual(len(updates), 1)
+
+            history_table = model.history.model._meta.db_table
+            history_inserts = [
+                query["sql"]
+                for query in captured_queries
+                if query["sql"].startswith(f'INSERT INTO "{history_table}"')
+            ]
+            self.assertEqual(len(history_inserts), 1)
+
+    def test_lgd_publication_delete_num_queries_more_data(self):
+        """
+        Test the number of queries does not depend on the number of rows linked to the publication
+        """
+        lgd_obj = LocusGenotypeDisease.objects.get(stable_id__stable_id="G2P00002")
+        publication_obj = Publication.objects.get(pmid=15214012)
+        # Ontology terms not linked to the record and the publication
+        ontology_terms = list(
+            OntologyTerm.objects.exclude(
+                id__in=LGDPhenotype.objects.filter(
+                    lgd=lgd_obj, publication=publication_obj
+                ).values("phenotype_id")
+            ).exclude(
+                id__in=LGDVariantType.objects.filter(
+                    lgd=lgd_obj, publication=publication_obj
+                ).values("variant_type_ot_id")
+            )[:5]
+        )
+        self.assertEqual(len(ontology_terms), 5)
+
+        LGDPhenotype.objects.bulk_create(
+            [
+                LGDPhenotype(
+                    lgd=lgd_obj,
+                    phenotype=ontology_term,
+                    publication=publication_obj,
+                    is_deleted=0,
+                )
+                for ontology_term in ontology_terms
+            ]
+        )
+        LGDVariantType.objects.bulk_create(
+            [
+                LGDVariantType(
+                    lgd=lgd_obj,
+                    variant_type_ot=ontology_term,
+                    publication=publication_obj,
+                    is_deleted=0,
+                )
+                for ontology_term in ontology_terms
+            ]
+        )
+
+        self.delete_publication_captured_queries(self.DELETE_PUBLICATION_NUM_QUERIES)
+
+        self.assertFalse(
+            LGDPhenotype.objects.filter(
+                lgd=lgd_obj, publication=publication_obj, is_deleted=0
+            ).exists()
+        )
+        self.assertFalse(
+            LGDVariantType.objects.filter(
+                lgd=lgd_obj, publication=publication_obj, is_deleted=0
+            ).exists()
+        )
+
+    def test_delete_publication_counts(self):
+        """
+        Test the number of deleted rows returned by LGDBulkEdit.delete_publication
+        """
+        user = User.objects.get(email="john@test.ac.uk")
+        lgd_obj = LocusGenotypeDisease.objects.get(stable_id__stable_id="G2P00002")
+        publication_obj = Publication.objects.get(pmid=15214012)
+
+        deleted = LGDBulkEdit(lgd_obj, user).delete_publication(publication_obj)
+
+        self.assertEqual(
+            deleted,
+            {
+                "lgd_variant_type_comment": 1,
+                "lgd_phenotype": 3,
+                "lgd_phenotype_summary": 1,
+                "lgd_variant_type": 2,
+                "lgd_variant_type_description": 2,
+                "lgd_mechanism_evidence": 1,
+            },
+        )
+
+        # Nothing left to delete
+        deleted = LGDBulkEdit(lgd_obj, user).delete_publication(publication_obj)
+        self.assertEqual(sum(deleted.values()), 0)
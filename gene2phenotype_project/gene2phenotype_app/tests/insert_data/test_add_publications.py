@@ -1,4 +1,6 @@
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from django.urls import reverse
 from django.conf import settings
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -378,6 +380,163 @@ class LGDEditPublicationsEndpoint(TestCase):
         self.assertEqual(len(lgd_mined_publications), 1)
         self.assertEqual(lgd_mined_publications[0].status, "curated")
 
+    def test_add_lgd_publication_bulk(self):
+        """
+        Test the phenotypes and variant types are added with one query per table
+        """
+        publication_to_add = {
+            "publications": [
+                {
+                    "publication": {"pmid": 15214012},
+                    "comment": {"comment": "", "is_public": 1},
+                    "families": {
+                        "families": 1,
+                        "consanguinity": "unknown",
+                        "ancestries": None,
+                        "affected_individuals": 1,
+                    },
+                }
+            ],
+            "phenotypes": [
+                {
+                    "pmid": "15214012",
+                    "summary": "",
+                    "hpo_terms": [
+                        {"term": "", "accession": accession, "description": ""}
+                        for accession in [
+                            "HP:0100881",
+                            "HP:0003549",
+                            "HP:0033127",
+                            "HP:0011794",
+                        ]
+                    ],
+                }
+            ],
+            "variant_types": [
+                {
+                    "comment": "",
+                    "de_novo": False,
+                    "inherited": False,
+                    "nmd_escape": False,
+                    "primary_type": "protein_changing",
+                    "secondary_type": secondary_type,
+                    "supporting_papers": ["15214012"],
+                    "unknown_inheritance": True,
+                }
+                for secondary_type in [
+                    "missense_variant",
+                    "inframe_insertion",
+                    "inframe_deletion",
+                ]
+            ],
+        }
+
+        # Login
+        user = User.objects.get(email="user5@test.ac.uk")
+        refresh = RefreshToken.for_user(user)
+        access_token = str(refresh.access_token)
+        self.client.cookies[settings.SIMPLE_JWT["AUTH_COOKIE"]] = access_token
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                self.url_add_publication,
+                publication_to_add,
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, 201)
+
+        for table in ["lgd_phenotype", "lgd_variant_type"]:
+            queries = [
+                query["sql"]
+                for query in context.captured_queries
+                if f'"{table}"' in query["sql"]
+            ]
+            # Fetch the existing rows and insert the new rows
+            self.assertEqual(len(queries), 2)
+
+        lgd_phenotypes = LGDPhenotype.objects.filter(
+            lgd__stable_id__stable_id="G2P00001",
+            publication__pmid=15214012,
+            is_deleted=0,
+        )
+        self.assertEqual(len(lgd_phenotypes), 4)
+        self.assertEqual(LGDPhenotype.history.count(), 4)
+
+        lgd_variant_types = LGDVariantType.objects.filter(
+            lgd__stable_id__stable_id="G2P00001",
+            publication__pmid=15214012,
+            is_deleted=0,
+        )
+        self.assertEqual(len(lgd_variant_types), 3)
+        self.assertEqual(LGDVariantType.history.count(), 3)
+
+    def test_add_lgd_publication_invalid_variant_type(self):
+        """
+        Test nothing is added to the record if a variant type is invalid
+        """
+        publication_to_add = {
+            "publications": [
+                {
+                    "publication": {"pmid": 15214012},
+                    "comment": {"comment": "", "is_public": 1},
+                    "families": {
+                        "families": 1,
+                        "consanguinity": "unknown",
+                        "ancestries": None,
+                        "affected_individuals": 1,
+                    },
+                }
+            ],
+            "phenotypes": [
+                {
+                    "pmid": "15214012",
+                    "summary": "",
+                    "hpo_terms": [
+                        {"term": "", "accession": "HP:0003549", "description": ""}
+                    ],
+                }
+            ],
+            "variant_types": [
+                {
+                    "comment": "",
+                    "de_novo": False,
+                    "inherited": False,
+                    "nmd_escape": False,
+                    "primary_type": "protein_changing",
+                    "secondary_type": "not_a_variant_type",
+                    "supporting_papers": ["15214012"],
+                    "unknown_inheritance": True,
+                }
+            ],
+        }
+        lgd_publications = LGDPublication.objects.filter(
+            lgd__stable_id__stable_id="G2P00001", is_deleted=0
+        )
+        n_lgd_publications = lgd_publications.count()
+
+        # Login
+        user = User.objects.get(email="user5@test.ac.uk")
+        refresh = RefreshToken.for_user(user)
+        access_token = str(refresh.access_token)
+        self.client.cookies[settings.SIMPLE_JWT["AUTH_COOKIE"]] = access_token
+
+        response = self.client.post(
+            self.url_add_publication,
+            publication_to_add,
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+        # The publication and the phenotype added before the error are rolled back
+        self.assertEqual(lgd_publications.count(), n_lgd_publications)
+        self.assertFalse(
+            LGDPhenotype.objects.filter(
+                lgd__stable_id__stable_id="G2P00001", publication__pmid=15214012
+            ).exists()
+        )
+        self.assertEqual(LGDPublication.history.count(), 0)
+        self.assertEqual(LGDPhenotype.history.count(), 0)
+
     def test_add_lgd_publication_wrong_mechanism_evidence(self):
         """
         Test to add mechanism evidence with wrong value
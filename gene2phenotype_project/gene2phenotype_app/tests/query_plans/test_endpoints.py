@@ -0,0 +1,228 @@
+"""
+Query plan regression tests for the read endpoints.
+
+For each endpoint the test records the number of queries, the SQL time and the
+query plan (EXPLAIN) of each query. The test fails if an endpoint runs more
+queries than the baseline (baseline.json) or does a full scan of a table that
+is not in the baseline.
+
+Run:
+    python manage.py test gene2phenotype_app.tests.query_plans
+
+Options (environment variables):
+    QUERY_PLAN_REPORT=<file>: write the queries, times and query plans to a JSON file
+    QUERY_PLAN_UPDATE_BASELINE=1: write the current values to baseline.json
+"""
+
+import json
+import os
+import re
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from gene2phenotype_app.models import User
+
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Endpoints: name -> (url name, url kwargs, query string, authenticated user)
+ENDPOINTS = {
+    "search_all": ("search", {}, "query=CEP290", False),
+    "search_gene": ("search", {}, "type=gene&query=CEP290", False),
+    "search_gene_authenticated": ("search", {}, "type=gene&query=CEP290", True),
+    "search_disease": (
+        "search",
+        {},
+        "type=disease&query=CEP290-related JOUBERT SYNDROME TYPE 5",
+        False,
+    ),
+    "search_phenotype": ("search", {}, "type=phenotype&query=HP:0003549", False),
+    "search_stable_id": ("search", {}, "type=stable_id&query=G2P00002", False),
+    "panel_summary": ("panel_summary", {"name": "DD"}, "", False),
+    "panel_download": ("panel_download", {"name": "DD"}, "", False),
+    "panel_download_all": ("panel_download", {"name": "all"}, "", False),
+    "panel_download_all_authenticated": (
+        "panel_download",
+        {"name": "all"},
+        "",
+        True,
+    ),
+    "gene_summary": ("locus_gene_summary", {"name": "RAB27A"}, "", False),
+    "gene_full": ("locus_gene_full", {"name": "RAB27A"}, "", False),
+    "disease_summary": (
+        "disease_summary",
+        {"id": "CEP290-related JOUBERT SYNDROME TYPE 5"},
+        "",
+        False,
+    ),
+    "lgd": ("lgd", {"stable_id": "G2P00002"}, "", False),
+    "lgd_authenticated": ("lgd", {"stable_id": "G2P00002"}, "", True),
+}
+
+
+def get_query_plan(sql):
+    """
+    Returns the query plan of a SELECT query.
+    Uses 'EXPLAIN QUERY PLAN' in SQLite and 'EXPLAIN' in the other databases (MySQL).
+    """
+    if not sql.lstrip().upper().startswith("SELECT"):
+        return []
+
+    if connection.vendor == "sqlite":
+        explain = "EXPLAIN QUERY PLAN "
+    else:
+        explain = "EXPLAIN "
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(explain + sql)
+            return [" ".join(str(value) for value in row) for row in cursor.fetchall()]
+    except DatabaseError as error:
+        return [f"EXPLAIN failed: {error}"]
+
+
+def get_table_scans(query_plan):
+    """
+    Returns the tables read without index (SQLite 'SCAN <table>').
+    """
+    table_scans = set()
+    for line in query_plan:
+        match = re.search(r"\bSCAN (?:TABLE )?(\S+)(.*)", line)
+        if match and "USING" not in match.group(2):
+            table_scans.add(match.group(1))
+
+    return table_scans
+
+
+class EndpointQueryPlanTests(TestCase):
+    """
+    Test the number of queries and the query plans of the read endpoints:
+    SearchView, PanelDownload, the records summary and LocusGenotypeDiseaseSerializer.
+    """
+
+    fixtures = [
+        "gene2phenotype_app/fixtures/attribs.json",
+        "gene2phenotype_app/fixtures/cv_molecular_mechanism.json",
+        "gene2phenotype_app/fixtures/disease.json",
+        "gene2phenotype_app/fixtures/disease_synonym.json",
+        "gene2phenotype_app/fixtures/g2p_stable_id.json",
+        "gene2phenotype_app/fixtures/gene_disease.json",
+        "gene2phenotype_app/fixtures/gene_stats.json",
+        "gene2phenotype_app/fixtures/lgd_comment.json",
+        "gene2phenotype_app/fixtures/lgd_cross_cutting_modifier.json",
+        "gene2phenotype_app/fixtures/lgd_mechanism_evidence.json",
+        "gene2phenotype_app/fixtures/lgd_mechanism_synopsis.json",
+        "gene2phenotype_app/fixtures/lgd_panel.json",
+        "gene2phenotype_app/fixtures/lgd_phenotype.json",
+        "gene2phenotype_app/fixtures/lgd_phenotype_summary.json",
+        "gene2phenotype_app/fixtures/lgd_publication.json",
+        "gene2phenotype_app/fixtures/lgd_variant_consequence.json",
+        "gene2phenotype_app/fixtures/lgd_variant_type.json",
+        "gene2phenotype_app/fixtures/lgd_variant_type_comment.json",
+        "gene2phenotype_app/fixtures/lgd_variant_type_description.json",
+        "gene2phenotype_app/fixtures/locus.json",
+        "gene2phenotype_app/fixtures/locus_genotype_disease.json",
+        "gene2phenotype_app/fixtures/ontology_term.json",
+        "gene2phenotype_app/fixtures/publication.json",
+        "gene2phenotype_app/fixtures/sequence.json",
+        "gene2phenotype_app/fixtures/source.json",
+        "gene2phenotype_app/fixtures/uniprot_annotation.json",
+        "gene2phenotype_app/fixtures/user_panels.json",
+    ]
+
+    def setUp(self):
+        user = User.objects.get(email="user5@test.ac.uk")
+        self.access_token = str(RefreshToken.for_user(user).access_token)
+
+    def run_endpoint(self, url_name, url_kwargs, query_string, authenticated):
+        """
+        Calls the endpoint and returns the queries with their time and query plan.
+        """
+        url = reverse(url_name, kwargs=url_kwargs)
+        if query_string:
+            url = f"{url}?{query_string}"
+
+        if authenticated:
+            self.client.cookies[settings.SIMPLE_JWT["AUTH_COOKIE"]] = self.access_token
+        else:
+            self.client.cookies.pop(settings.SIMPLE_JWT["AUTH_COOKIE"], None)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+            # Read the content of the file downloads
+            b"".join(getattr(response, "streaming_content", [response.content]))
+
+        self.assertEqual(response.status_code, 200, msg=url)
+
+        return [
+            {
+                "sql": query["sql"],
+                "time": float(query["time"]),
+                "query_plan": get_query_plan(query["sql"]),
+            }
+            for query in context.captured_queries
+        ]
+
+    def test_endpoints(self):
+        with open(BASELINE_FILE) as baseline_file:
+            baseline = json.load(baseline_file)
+
+        report = {}
+        for name, (url_name, url_kwargs, query_string, authenticated) in (
+            ENDPOINTS.items()
+        ):
+            queries = self.run_endpoint(
+                url_name, url_kwargs, query_string, authenticated
+            )
+            table_scans = set()
+            for query in queries:
+                table_scans.update(get_table_scans(query["query_plan"]))
+
+            report[name] = {
+                "num_queries": len(queries),
+                "sql_time_ms": round(
+                    sum(query["time"] for query in queries) * 1000, 3
+                ),
+                "table_scans": sorted(table_scans),
+                "queries": queries,
+            }
+
+            with self.subTest(endpoint=name):
+                self.assertIn(
+                    name,
+                    baseline,
+                    msg="Endpoint not in baseline.json, run with QUERY_PLAN_UPDATE_BASELINE=1",
+                )
+                self.assertLessEqual(
+                    len(queries),
+                    baseline[name]["num_queries"],
+                    msg=f"{name}: more queries than the baseline",
+                )
+                # Full table scans are only checked in the database used to create the baseline
+                if connection.vendor == "sqlite":
+                    self.assertEqual(
+                        table_scans - set(baseline[name]["table_scans"]),
+                        set(),
+                        msg=f"{name}: new full table scans",
+                    )
+
+        if os.environ.get("QUERY_PLAN_REPORT"):
+            with open(os.environ["QUERY_PLAN_REPORT"], "w") as report_file:
+                json.dump(report, report_file, indent=2)
+
+        if os.environ.get("QUERY_PLAN_UPDATE_BASELINE"):
+            new_baseline = {
+                name: {
+                    "num_queries": data["num_queries"],
+                    "table_scans": data["table_scans"],
+                }
+                for name, data in report.items()
+            }
+            with open(BASELINE_FILE, "w") as baseline_file:
+                json.dump(new_baseline, baseline_file, indent=2)
+                baseline_file.write("\n")
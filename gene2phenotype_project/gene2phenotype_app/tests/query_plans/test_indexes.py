@@ -0,0 +1,85 @@
+import datetime
+
+from django.test import TestCase
+
+from gene2phenotype_app.models import (
+    LGDComment,
+    LGDMolecularMechanismEvidence,
+    LGDPanel,
+    LGDPhenotypeSummary,
+    LGDPublication,
+    LGDVariantGenccConsequence,
+    LGDVariantTypeDescription,
+    LocusGenotypeDisease,
+)
+
+DATE = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def get_index_name(model, fields):
+    """
+    Returns the name of the index of the model on the fields.
+    """
+    for index in model._meta.indexes:
+        if list(index.fields) == fields:
+            return index.name
+
+    raise ValueError(f"No index on {fields} for {model.__name__}")
+
+
+class CompositeIndexesTests(TestCase):
+    """
+    Test the database uses the composite indexes for the most used filters.
+    Checks the query plan (EXPLAIN) of each query.
+    """
+
+    def assertUsesIndex(self, queryset, index_name):
+        query_plan = queryset.explain()
+        self.assertIn(index_name, query_plan, msg=str(queryset.query))
+
+    def test_lgd_is_deleted(self):
+        """
+        Test the data of a record is fetched with the index (lgd, is_deleted)
+        """
+        for model in [
+            LGDPublication,
+            LGDComment,
+            LGDVariantGenccConsequence,
+            LGDMolecularMechanismEvidence,
+            LGDPhenotypeSummary,
+            LGDVariantTypeDescription,
+        ]:
+            with self.subTest(model=model.__name__):
+                self.assertUsesIndex(
+                    model.objects.filter(lgd_id=1, is_deleted=0),
+                    get_index_name(model, ["lgd", "is_deleted"]),
+                )
+
+    def test_panel_is_deleted(self):
+        """
+        Test the records of a panel are fetched with the index (panel, is_deleted, lgd)
+        """
+        self.assertUsesIndex(
+            LGDPanel.objects.filter(panel_id=1, is_deleted=0).values("lgd_id"),
+            get_index_name(LGDPanel, ["panel", "is_deleted", "lgd"]),
+        )
+
+    def test_lgd_date_review(self):
+        """
+        Test the records reviewed after a date are fetched with the index (is_deleted, date_review)
+        """
+        self.assertUsesIndex(
+            LocusGenotypeDisease.objects.filter(is_deleted=0, date_review__gte=DATE),
+            get_index_name(LocusGenotypeDisease, ["is_deleted", "date_review"]),
+        )
+
+    def test_history_lgd_date(self):
+        """
+        Test the history of a record is fetched with the index (lgd, history_date)
+        """
+        for model in [LGDPanel, LGDPublication, LGDComment]:
+            with self.subTest(model=model.__name__):
+                self.assertUsesIndex(
+                    model.history.filter(lgd_id=1, history_date__gte=DATE),
+                    get_index_name(model.history.model, ["lgd", "history_date"]),
+                )
@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.conf import settings
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -6,6 +8,7 @@ from gene2phenotype_app.models import (
     User,
     LocusGenotypeDisease,
 )
+from gene2phenotype_app.serializers import LGDDiseaseRemap
 
 
 class LGDDiseaseUpdatesEndpoint(TestCase):
@@ -141,6 +144,15 @@ class LGDDiseaseUpdatesEndpoint(TestCase):
         ]
         self.assertEqual(response_data["Updated records"], expected_response_updates)
         self.assertEqual(response_data["error"], expected_response_data_error)
+        self.assertEqual(
+            response_data["report"],
+            [
+                {
+                    "updated": expected_response_updates,
+                    "errors": expected_response_data_error,
+                }
+            ],
+        )
 
         # Test updated records
         lgd_obj = LocusGenotypeDisease.objects.get(
@@ -215,3 +227,111 @@ class LGDDiseaseUpdatesEndpoint(TestCase):
 
         response_data = response.json()
         self.assertEqual(response_data["error"], [{'error': 'No records associated with disease id 1'}])
+
+    def test_update_report(self):
+        """
+        Test the response includes the report of each item of the input
+        """
+        # Login
+        user = User.objects.get(email="user5@test.ac.uk")
+        refresh = RefreshToken.for_user(user)
+        access_token = str(refresh.access_token)
+        self.client.cookies[settings.SIMPLE_JWT["AUTH_COOKIE"]] = access_token
+
+        response = self.client.post(
+            self.url_update,
+            self.specific_lgd_diseases_invalid + self.specific_lgd_diseases_to_update,
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+        response_data = response.json()
+        self.assertEqual(
+            response_data["report"],
+            [
+                {
+                    "updated": [],
+                    "errors": [{"error": "No records associated with disease id 1"}],
+                },
+                {"updated": [{"g2p_id": "G2P00001", "lgd_id": 1}], "errors": []},
+            ],
+        )
+        self.assertEqual(
+            response_data["Updated records"], [{"g2p_id": "G2P00001", "lgd_id": 1}]
+        )
+        self.assertEqual(
+            response_data["error"],
+            [{"error": "No records associated with disease id 1"}],
+        )
+
+    def test_remap_report(self):
+        """
+        Test the report of the bulk update, the records are fetched once
+        and the later items see the updates of the previous items
+        """
+        user = User.objects.get(email="user5@test.ac.uk")
+
+        with CaptureQueriesContext(connection) as queries:
+            reports = LGDDiseaseRemap(user).remap(
+                [
+                    {"disease_id": 10, "new_disease_id": 11},
+                    {"disease_id": 2, "new_disease_id": 13, "stable_id": "G2P00001"},
+                    {"disease_id": 1, "new_disease_id": 13},
+                    {"disease_id": 13, "new_disease_id": 5000},
+                    {"disease_id": 11},
+                ]
+            )
+
+        self.assertEqual(
+            reports,
+            [
+                {
+                    "updated": [{"g2p_id": "G2P00008", "lgd_id": 7}],
+                    "errors": [
+                        {
+                            "disease_id": 10,
+                            "error": "Found a different record with same locus, genotype, disease and mechanism: 'G2P00006'",
+                        }
+                    ],
+                },
+                {"updated": [{"g2p_id": "G2P00001", "lgd_id": 1}], "errors": []},
+                {
+                    "updated": [],
+                    "errors": [{"error": "No records associated with disease id 1"}],
+                },
+                {
+                    "updated": [],
+                    "errors": [
+                        {"disease_id": 13, "error": "Invalid disease id 5000"}
+                    ],
+                },
+                {
+                    "updated": [],
+                    "errors": [
+                        {
+                            "error": "Both 'disease_id' and 'new_disease_id' are required."
+                        }
+                    ],
+                },
+            ],
+        )
+
+        # Records + unique keys
+        lgd_selects = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith("SELECT")
+            and 'FROM "locus_genotype_disease"' in query["sql"]
+        ]
+        self.assertEqual(len(lgd_selects), 2)
+
+        lgd_updates = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith('UPDATE "locus_genotype_disease"')
+        ]
+        self.assertEqual(len(lgd_updates), 1)
+
+        self.assertEqual(LocusGenotypeDisease.objects.get(id=7).disease_id, 11)
+        self.assertEqual(LocusGenotypeDisease.objects.get(id=1).disease_id, 13)
+        self.assertEqual(LocusGenotypeDisease.history.count(), 2)
@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.conf import settings
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -127,6 +129,10 @@ class UpdateDiseasesEndpoint(TestCase):
             response_data["error"],
             [{"error": "Both 'id' and 'name' are required."}],
         )
+        self.assertEqual(
+            response_data["report"],
+            [{"updated": [], "errors": response_data["error"]}],
+        )
 
     def test_update_same_name(self):
         """
@@ -215,6 +221,28 @@ class UpdateDiseasesEndpoint(TestCase):
                 }
             ],
         )
+        # One report per disease of the input, in the same order
+        self.assertEqual(
+            response_data["report"],
+            [
+                {
+                    "updated": [
+                        {"id": 3, "name": "CT87-related MICROPHTHALMIA SYNDROMIC"}
+                    ],
+                    "errors": [],
+                },
+                {
+                    "updated": [
+                        {
+                            "id": 6,
+                            "name": "GS2-related INTELLECTUAL DEVELOPMENTAL DISORDER X-LINKED",
+                        }
+                    ],
+                    "errors": [],
+                },
+                {"updated": [], "errors": response_data["error"]},
+            ],
+        )
 
         # Test updated records
         disease_obj = Disease.objects.get(id=3)
@@ -267,3 +295,48 @@ class UpdateDiseasesEndpoint(TestCase):
         self.assertEqual(disease_obj.name, "CT87-related MICROPHTHALMIA SYNDROMIC")
         disease_synonym_obj = DiseaseSynonym.objects.get(disease=disease_obj)
         self.assertEqual(disease_synonym_obj.synonym, "MICROPHTHALMIA SYNDROMIC TYPE 9")
+
+    def test_update_diseases_bulk(self):
+        """
+        Test the disease names are updated with one query and the synonyms
+        are inserted in bulk
+        """
+        # Login
+        user = User.objects.get(email="john@test.ac.uk")
+        refresh = RefreshToken.for_user(user)
+        access_token = str(refresh.access_token)
+        self.client.cookies[settings.SIMPLE_JWT["AUTH_COOKIE"]] = access_token
+
+        diseases_to_update = [
+            {**disease, "add_synonym": True} for disease in self.diseases_to_update
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                self.url_update, diseases_to_update, content_type="application/json"
+            )
+        self.assertEqual(response.status_code, 200)
+
+        response_data = response.json()
+        self.assertEqual(len(response_data["updated"]), 2)
+        self.assertEqual(len(response_data["error"]), 1)
+
+        disease_updates = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith('UPDATE "disease"')
+        ]
+        self.assertEqual(len(disease_updates), 1)
+
+        synonym_inserts = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith("INSERT")
+            and 'INTO "disease_synonym"' in query["sql"]
+        ]
+        self.assertEqual(len(synonym_inserts), 1)
+
+        disease_synonyms = DiseaseSynonym.objects.filter(disease_id__in=[3, 6])
+        self.assertEqual(len(disease_synonyms), 2)
+        self.assertEqual(DiseaseSynonym.history.count(), 2)
+        self.assertEqual(Disease.history.count(), 2)
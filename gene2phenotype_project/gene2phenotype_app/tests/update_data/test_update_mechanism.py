@@ -542,6 +542,7 @@ class LGDUpdateMechanismEndpoint(TestCase):
             lgd__stable_id__stable_id="G2P00009"
         )
         self.assertEqual(len(history_records), 1)
+        self.assertEqual(history_records[0].history_user, user)
 
         # Test lgd_mechanism_synopsis history table
         history_records = LGDMolecularMechanismSynopsis.history.filter(
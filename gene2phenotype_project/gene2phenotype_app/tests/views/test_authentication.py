@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from gene2phenotype_app.authentication import clear_authentication_cache
+from gene2phenotype_app.models import User
+
+
+@override_settings(AUTH_BLACKLIST_CACHE_SECONDS=30, AUTH_USER_CACHE_SECONDS=30)
+class CustomAuthenticationCacheTests(TestCase):
+    """
+    Test the authentication caches: blacklisted tokens and users
+    """
+
+    fixtures = [
+        "gene2phenotype_app/fixtures/user_panels.json",
+        "gene2phenotype_app/fixtures/attribs.json",
+    ]
+
+    def setUp(self):
+        clear_authentication_cache()
+        self.url_panels = reverse("list_panels")
+
+        user = User.objects.get(email="user5@test.ac.uk")
+        refresh = RefreshToken.for_user(user)
+        self.client.cookies[settings.SIMPLE_JWT["AUTH_COOKIE"]] = str(
+            refresh.access_token
+        )
+        self.client.cookies[settings.SIMPLE_JWT["REFRESH_COOKIE"]] = str(refresh)
+
+    def tearDown(self):
+        clear_authentication_cache()
+
+    def test_cached_authentication(self):
+        response = self.client.get(self.url_panels)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data.get("count"), 5)
+
+        # The second request does not query the blacklist or the user
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url_panels)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data.get("count"), 5)
+
+        auth_queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if "token_blacklist" in query["sql"] or 'FROM "user"' in query["sql"]
+        ]
+        self.assertEqual(auth_queries, [])
+
+    def test_logout_blacklists_token(self):
+        response = self.client.get(self.url_panels)
+        self.assertEqual(response.status_code, 200)
+
+        refresh_token = self.client.cookies[settings.SIMPLE_JWT["REFRESH_COOKIE"]].value
+        response = self.client.post(reverse("logout"))
+        self.assertEqual(response.status_code, 204)
+
+        # Use the old tokens
+        self.client.cookies[settings.SIMPLE_JWT["REFRESH_COOKIE"]] = refresh_token
+        response = self.client.get(self.url_panels)
+        self.assertEqual(response.status_code, 401)
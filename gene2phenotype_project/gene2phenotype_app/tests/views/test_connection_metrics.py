@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from gene2phenotype_app.middleware import (
+    get_connection_metrics,
+    reset_connection_metrics,
+)
+
+
+@override_settings(
+    MIDDLEWARE=settings.MIDDLEWARE
+    + ["gene2phenotype_app.middleware.DBConnectionMetricsMiddleware"]
+)
+class DBConnectionMetricsMiddlewareTests(TestCase):
+    """
+    Test the database connection metrics: DBConnectionMetricsMiddleware
+    """
+
+    fixtures = [
+        "gene2phenotype_app/fixtures/user_panels.json",
+        "gene2phenotype_app/fixtures/attribs.json",
+    ]
+
+    def setUp(self):
+        reset_connection_metrics()
+
+    def test_connection_metrics(self):
+        for _ in range(3):
+            response = self.client.get(reverse("list_panels"))
+            self.assertEqual(response.status_code, 200)
+
+        # The test connection is kept open between requests
+        metrics = get_connection_metrics()
+        self.assertEqual(
+            metrics["list_panels"],
+            {"requests": 3, "new_connections": 0, "reused_connections": 3},
+        )
@@ -286,3 +286,74 @@ class DiseaseExternalEndpointTests(TestCase):
 
         self.assertEqual(response.status_code, 404)
         self.assertEqual(response.data["error"], "Invalid ID(s): Syndrome 2")
+
+    def test_get_disease_num_queries(self):
+        """
+        Test the disease external endpoint runs one query per table
+        """
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url_disease_2)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_post_diseases(self):
+        """
+        Test the response of the disease external endpoint for a list of IDs
+        """
+        disease_ids = ["MONDO:0012433", "MONDO:0018368", "MONDO:0010734"] * 100
+
+        with self.assertNumQueries(2):
+            response = self.client.post(
+                reverse("external_disease_list"),
+                disease_ids,
+                content_type="application/json",
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 300)
+        self.assertEqual(
+            [disease["identifier"] for disease in response.data["results"][:3]],
+            disease_ids[:3],
+        )
+        self.assertEqual(response.data["results"][0]["source"], "Mondo")
+
+    def test_post_diseases_not_found(self):
+        """
+        Test the response of the disease external endpoint for a list of IDs
+        when one of the IDs is not found
+        """
+        response = self.client.post(
+            reverse("external_disease_list"),
+            ["MONDO:0012433", "MONDO:001073", "Syndrome 2"],
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(
+            response.data["error"], "Invalid ID(s): MONDO:001073, Syndrome 2"
+        )
+
+    def test_post_diseases_invalid_input(self):
+        """
+        Test the response of the disease external endpoint when the input is not a list
+        """
+        response = self.client.post(
+            reverse("external_disease_list"),
+            {"ids": "MONDO:0012433"},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["error"], "Please provide a list of disease IDs")
+
+    def test_list_methods(self):
+        """
+        Test the list endpoint only accepts POST and the IDs endpoint only accepts GET
+        """
+        response = self.client.get(reverse("external_disease_list"))
+        self.assertEqual(response.status_code, 405)
+
+        response = self.client.post(
+            self.url_disease, ["MONDO:0012433"], content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 405)
@@ -0,0 +1,131 @@
+import csv
+import datetime
+
+from django.conf import settings
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from gene2phenotype_app.models import G2PStableID, GenCCSubmission, User
+
+
+class GenCCSubmissionTests(TestCase):
+    """
+    Test the GenCC submission endpoints
+    """
+
+    fixtures = [
+        "gene2phenotype_app/fixtures/attribs.json",
+        "gene2phenotype_app/fixtures/cv_molecular_mechanism.json",
+        "gene2phenotype_app/fixtures/disease.json",
+        "gene2phenotype_app/fixtures/g2p_stable_id.json",
+        "gene2phenotype_app/fixtures/lgd_panel.json",
+        "gene2phenotype_app/fixtures/lgd_publication.json",
+        "gene2phenotype_app/fixtures/locus_genotype_disease.json",
+        "gene2phenotype_app/fixtures/locus.json",
+        "gene2phenotype_app/fixtures/ontology_term.json",
+        "gene2phenotype_app/fixtures/publication.json",
+        "gene2phenotype_app/fixtures/sequence.json",
+        "gene2phenotype_app/fixtures/source.json",
+        "gene2phenotype_app/fixtures/user_panels.json",
+    ]
+
+    def setUp(self):
+        submission_date = datetime.date(2018, 1, 1)
+        for stable_id, submission_id in [
+            ("G2P00001", "GENCC_000112-0001"),
+            ("G2P00002", "GENCC_000112-0002"),
+            ("G2P00003", "GENCC_000112-0003"),
+        ]:
+            GenCCSubmission.objects.create(
+                submission_id=submission_id,
+                g2p_stable_id=G2PStableID.objects.get(stable_id=stable_id),
+                date_of_submission=submission_date,
+                type_of_submission="create",
+            )
+
+        user = User.objects.get(email="user5@test.ac.uk")
+        self.access_token = str(RefreshToken.for_user(user).access_token)
+
+    def test_payload_no_permission(self):
+        response = self.client.get(reverse("gencc_submission_payload"))
+        self.assertEqual(response.status_code, 401)
+
+    def test_payload(self):
+        self.client.cookies[settings.SIMPLE_JWT["AUTH_COOKIE"]] = self.access_token
+
+        # User + new records (4 queries) + updated records (5 queries)
+        # + withdrawn submissions
+        with self.assertNumQueries(11):
+            response = self.client.get(reverse("gencc_submission_payload"))
+            content = b"".join(response.streaming_content).decode()
+
+        self.assertEqual(response.status_code, 200)
+
+        rows = list(csv.DictReader(content.splitlines(), delimiter="\t"))
+        submissions = {row["g2p_id"]: row for row in rows}
+
+        # G2P00001 was not reviewed after the submission
+        # G2P00005 is not in a visible panel
+        self.assertEqual(
+            sorted(submissions.keys()),
+            ["G2P00002", "G2P00003", "G2P00006", "G2P00008", "G2P00009"],
+        )
+        self.assertEqual(submissions["G2P00006"]["submission_type"], "create")
+        self.assertEqual(submissions["G2P00006"]["submission_id"], "")
+        self.assertEqual(submissions["G2P00006"]["classification_id"], "GENCC:100002")
+
+        self.assertEqual(submissions["G2P00002"]["submission_type"], "update")
+        self.assertEqual(submissions["G2P00002"]["submission_id"], "GENCC_000112-0002")
+        self.assertEqual(submissions["G2P00002"]["hgnc_id"], "HGNC:9766")
+        self.assertEqual(submissions["G2P00002"]["moi_id"], "HP:0000007")
+        self.assertEqual(submissions["G2P00002"]["date"], "2018-07-05")
+
+        self.assertEqual(submissions["G2P00003"]["submission_type"], "withdraw")
+        self.assertEqual(submissions["G2P00003"]["submission_id"], "GENCC_000112-0003")
+
+    def test_create_submissions(self):
+        self.client.cookies[settings.SIMPLE_JWT["AUTH_COOKIE"]] = self.access_token
+
+        data = [
+            {
+                "submission_id": f"GENCC_000112-1{number}",
+                "date_of_submission": "2025-06-01",
+                "type_of_submission": "create",
+                "g2p_stable_id": stable_id,
+            }
+            for number, stable_id in enumerate(["G2P00006", "G2P00008", "G2P00009"])
+        ]
+
+        # User + stable ids + insert
+        with self.assertNumQueries(3):
+            response = self.client.post(
+                reverse("create_gencc"), data, content_type="application/json"
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(GenCCSubmission.objects.count(), 6)
+
+        response = self.client.get(reverse("unsubmitted_stable_ids"))
+        self.assertEqual(response.json(), ["G2P00005"])
+
+    def test_create_invalid_submission(self):
+        self.client.cookies[settings.SIMPLE_JWT["AUTH_COOKIE"]] = self.access_token
+
+        data = [
+            {
+                "submission_id": "GENCC_000112-10",
+                "date_of_submission": "2025-06-01",
+                "type_of_submission": "create",
+                "g2p_stable_id": "G2P99999",
+            }
+        ]
+
+        response = self.client.post(
+            reverse("create_gencc"), data, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()["non_field_errors"],
+            ["G2PStableID with stable_id 'G2P99999' does not exist."],
+        )
+        self.assertEqual(GenCCSubmission.objects.count(), 3)
@@ -1,4 +1,4 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
 
@@ -260,3 +260,94 @@ class GeneDiseaseEndpointTests(TestCase):
             response.data["error"],
             "No matching Gene-Disease association found for: GS2",
         )
+
+
+class GeneFullEndpointTests(TestCase):
+    """
+    Test the gene page endpoint: GeneFull
+    """
+
+    fixtures = [
+        "gene2phenotype_app/fixtures/attribs.json",
+        "gene2phenotype_app/fixtures/cv_molecular_mechanism.json",
+        "gene2phenotype_app/fixtures/disease.json",
+        "gene2phenotype_app/fixtures/g2p_stable_id.json",
+        "gene2phenotype_app/fixtures/gene_disease.json",
+        "gene2phenotype_app/fixtures/gene_stats.json",
+        "gene2phenotype_app/fixtures/lgd_panel.json",
+        "gene2phenotype_app/fixtures/locus_genotype_disease.json",
+        "gene2phenotype_app/fixtures/locus.json",
+        "gene2phenotype_app/fixtures/ontology_term.json",
+        "gene2phenotype_app/fixtures/publication.json",
+        "gene2phenotype_app/fixtures/sequence.json",
+        "gene2phenotype_app/fixtures/source.json",
+        "gene2phenotype_app/fixtures/uniprot_annotation.json",
+        "gene2phenotype_app/fixtures/user_panels.json",
+    ]
+
+    def setUp(self):
+        self.url_gene = reverse("locus_gene_full", kwargs={"name": "CEP290"})
+        self.url_gene_synonym = reverse("locus_gene_full", kwargs={"name": "BBS14"})
+        self.url_invalid_gene = reverse("locus_gene_full", kwargs={"name": "BBBS14"})
+
+    def test_get_gene(self):
+        """
+        Test the response of the gene page endpoint is the same as the gene endpoints
+        """
+        response = self.client.get(self.url_gene)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("timings", response.data)
+
+        for url_name, fields in [
+            ("locus_gene", ["gene_symbol", "sequence", "start", "end", "ids", "synonyms"]),
+            ("locus_gene_summary", ["records_summary"]),
+            ("locus_gene_function", ["function", "gene_stats"]),
+        ]:
+            expected_data = self.client.get(
+                reverse(url_name, kwargs={"name": "CEP290"})
+            ).json()
+            for field in fields:
+                self.assertEqual(response.json()[field], expected_data[field])
+
+        expected_data = self.client.get(
+            reverse("locus_gene_disease", kwargs={"name": "CEP290"})
+        ).json()
+        self.assertEqual(response.data["gene_disease"]["count"], 4)
+        self.assertEqual(
+            response.json()["gene_disease"]["results"], expected_data["results"]
+        )
+
+    def test_get_gene_synonym(self):
+        """
+        Test the response of the gene page endpoint when searching the gene synonym
+        """
+        response = self.client.get(self.url_gene_synonym)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["gene_symbol"], "CEP290")
+        self.assertEqual(
+            response.json()["records_summary"][0]["stable_id"], "G2P00001"
+        )
+
+    def test_invalid_gene(self):
+        """
+        Test the response of the gene page endpoint for an invalid gene
+        """
+        response = self.client.get(self.url_invalid_gene)
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data["error"], "No matching Gene found for: BBBS14")
+
+    @override_settings(DEBUG=True)
+    def test_timings(self):
+        """
+        Test the gene page endpoint returns the time of each section in debug mode
+        """
+        response = self.client.get(self.url_gene)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            list(response.data["timings"]),
+            ["gene", "records_summary", "function", "gene_stats", "gene_disease"],
+        )
@@ -0,0 +1,118 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from gene2phenotype_app.gene_resolver import gene_resolver
+from gene2phenotype_app.models import Locus
+
+# Default cache of the deployments (see settings.py), each read is a query
+DATABASE_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "g2p_cache",
+    }
+}
+
+class GeneResolverTests(TestCase):
+    """
+    Test the gene resolver: gene symbol, gene synonym or HGNC ID to locus id
+    """
+
+    fixtures = [
+        "gene2phenotype_app/fixtures/locus.json",
+        "gene2phenotype_app/fixtures/attribs.json",
+        "gene2phenotype_app/fixtures/source.json",
+        "gene2phenotype_app/fixtures/sequence.json",
+    ]
+
+    def setUp(self):
+        gene_resolver.clear()
+
+    def tearDown(self):
+        gene_resolver.clear()
+
+    def test_resolve_without_cache(self):
+        self.assertEqual(gene_resolver.get_locus_id("CEP290"), 1)
+        self.assertEqual(gene_resolver.get_locus_id("GS2"), 2)
+        self.assertEqual(gene_resolver.get_locus_id("HGNC:29021"), 1)
+        self.assertIsNone(gene_resolver.get_locus_id("BBBS14"))
+        self.assertIsNone(gene_resolver.get_locus_id("GS2", [gene_resolver.SYMBOL]))
+
+    @override_settings(
+        GENE_RESOLVER_CACHE_SECONDS=60,
+        LOCAL_CACHE_VERSION_CHECK_SECONDS=5,
+        CACHES=DATABASE_CACHES,
+    )
+    def test_resolve_with_cache(self):
+        call_command("createcachetable")
+
+        # One query to read the version and one query per type of name
+        with self.assertNumQueries(4):
+            self.assertEqual(gene_resolver.get_locus_id("CEP290"), 1)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(gene_resolver.get_locus_id("cep290"), 1)
+            self.assertEqual(gene_resolver.get_locus_id("GS2"), 2)
+            self.assertEqual(gene_resolver.get_locus_id("HGNC:29021"), 1)
+            self.assertIsNone(gene_resolver.get_locus_id("BBBS14"))
+
+        # Saving a locus clears the cache of all the processes
+        locus_obj = Locus.objects.get(id=1)
+        locus_obj.name = "CEP290A"
+        locus_obj.save()
+
+        self.assertIsNone(gene_resolver.get_locus_id("CEP290"))
+        self.assertEqual(gene_resolver.get_locus_id("CEP290A"), 1)
+
+    @override_settings(
+        GENE_RESOLVER_CACHE_SECONDS=60, LOCAL_CACHE_VERSION_CHECK_SECONDS=60
+    )
+    def test_resolve_version_check(self):
+        self.assertEqual(gene_resolver.get_locus_id("CEP290"), 1)
+
+        # Another process updates the gene names and the version
+        Locus.objects.filter(id=1).update(name="CEP290A")
+        cache.set(gene_resolver.names.version_key, "new_version")
+
+        # The version is not read again before LOCAL_CACHE_VERSION_CHECK_SECONDS
+        self.assertEqual(gene_resolver.get_locus_id("CEP290"), 1)
+
+        with override_settings(LOCAL_CACHE_VERSION_CHECK_SECONDS=0):
+            self.assertIsNone(gene_resolver.get_locus_id("CEP290"))
+            self.assertEqual(gene_resolver.get_locus_id("CEP290A"), 1)
+
+    @override_settings(GENE_RESOLVER_CACHE_SECONDS=60)
+    def test_resolve_bulk_update(self):
+        self.assertEqual(gene_resolver.get_locus_id("CEP290"), 1)
+
+        # Bulk updates (e.g. gene loaders) do not send signals
+        Locus.objects.filter(id=1).update(name="CEP290A")
+        self.assertEqual(gene_resolver.get_locus_id("CEP290"), 1)
+
+        # The command clears the cache of all the processes
+        out = StringIO()
+        call_command("clear_caches", "--only", "gene_names", stdout=out)
+        self.assertIn("Cleared cache(s): gene_names", out.getvalue())
+
+        self.assertIsNone(gene_resolver.get_locus_id("CEP290"))
+        self.assertEqual(gene_resolver.get_locus_id("CEP290A"), 1)
+
+    def test_clear_caches_invalid_name(self):
+        with self.assertRaisesMessage(CommandError, "Unknown cache(s): bad_cache"):
+            call_command("clear_caches", "--only", "bad_cache")
+
+    @override_settings(GENE_RESOLVER_CACHE_SECONDS=60)
+    def test_gene_endpoint(self):
+        gene_resolver.get_locus_id("CEP290")
+
+        # Locus + function + gene scores, the gene name is resolved from the cache
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                reverse("locus_gene_function", kwargs={"name": "BBS14"})
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["gene_symbol"], "CEP290")
@@ -1,6 +1,12 @@
-from django.test import TestCase
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
+from gene2phenotype_app.catalogues import molecular_mechanisms
+from gene2phenotype_app.models import CVMolecularMechanism
+
 
 class ListMolecularMechanismsEndpoint(TestCase):
     """
@@ -18,8 +24,46 @@ class ListMolecularMechanismsEndpoint(TestCase):
         """
         response = self.client.get(self.url_list_mechanisms)
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data), 4)  # there are 4 types of mechanism data
-        self.assertEqual(len(response.data["mechanism"]), 5)
-        self.assertEqual(len(response.data["mechanism_synopsis"]), 10)
-        self.assertEqual(len(response.data["support"]), 2)
-        self.assertEqual(len(response.data["evidence"]), 4)
+        self.assertEqual(len(response.json()), 4)  # there are 4 types of mechanism data
+        self.assertEqual(len(response.json()["mechanism"]), 5)
+        self.assertEqual(len(response.json()["mechanism_synopsis"]), 10)
+        self.assertEqual(len(response.json()["support"]), 2)
+        self.assertEqual(len(response.json()["evidence"]), 4)
+
+    @override_settings(CATALOGUE_CACHE_SECONDS=60)
+    def test_mechanism_list_etag(self):
+        """
+        Test the mechanism list is cached and returns 304 if the client has the same version
+        """
+        # The catalogue could have been cached by another test
+        molecular_mechanisms.invalidate()
+
+        response = self.client.get(self.url_list_mechanisms)
+        etag = response["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                self.url_list_mechanisms, HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+        # New mechanism: the version is updated
+        CVMolecularMechanism.objects.create(
+            type="support", subtype=None, value="test", description="test"
+        )
+        response = self.client.get(self.url_list_mechanisms, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.json()["support"]), 3)
+
+        # Bulk updates do not send signals, the catalogue is cleared by the command
+        etag = response["ETag"]
+        CVMolecularMechanism.objects.filter(value="test").update(description="new")
+        response = self.client.get(self.url_list_mechanisms, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        call_command("clear_caches", "--only", "molecular_mechanisms", stdout=StringIO())
+        response = self.client.get(self.url_list_mechanisms, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn({"test": "new"}, response.json()["support"])
@@ -0,0 +1,79 @@
+import datetime
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+
+from gene2phenotype_app.catalogues import build_molecular_mechanisms
+from gene2phenotype_app.renderers import FastJSONRenderer
+
+
+class FastJSONRendererTests(TestCase):
+    """
+    Test the orjson renderer returns the same JSON as the default renderer
+    """
+
+    fixtures = [
+        "gene2phenotype_app/fixtures/attribs.json",
+        "gene2phenotype_app/fixtures/cv_molecular_mechanism.json",
+        "gene2phenotype_app/fixtures/disease.json",
+        "gene2phenotype_app/fixtures/disease_synonym.json",
+        "gene2phenotype_app/fixtures/g2p_stable_id.json",
+        "gene2phenotype_app/fixtures/gene_disease.json",
+        "gene2phenotype_app/fixtures/gene_stats.json",
+        "gene2phenotype_app/fixtures/lgd_comment.json",
+        "gene2phenotype_app/fixtures/lgd_cross_cutting_modifier.json",
+        "gene2phenotype_app/fixtures/lgd_mechanism_evidence.json",
+        "gene2phenotype_app/fixtures/lgd_mechanism_synopsis.json",
+        "gene2phenotype_app/fixtures/lgd_panel.json",
+        "gene2phenotype_app/fixtures/lgd_phenotype.json",
+        "gene2phenotype_app/fixtures/lgd_phenotype_summary.json",
+        "gene2phenotype_app/fixtures/lgd_publication.json",
+        "gene2phenotype_app/fixtures/lgd_variant_consequence.json",
+        "gene2phenotype_app/fixtures/lgd_variant_type.json",
+        "gene2phenotype_app/fixtures/lgd_variant_type_comment.json",
+        "gene2phenotype_app/fixtures/lgd_variant_type_description.json",
+        "gene2phenotype_app/fixtures/locus.json",
+        "gene2phenotype_app/fixtures/locus_genotype_disease.json",
+        "gene2phenotype_app/fixtures/ontology_term.json",
+        "gene2phenotype_app/fixtures/publication.json",
+        "gene2phenotype_app/fixtures/sequence.json",
+        "gene2phenotype_app/fixtures/source.json",
+        "gene2phenotype_app/fixtures/uniprot_annotation.json",
+        "gene2phenotype_app/fixtures/user_panels.json",
+    ]
+
+    def test_render(self):
+        data = {
+            "stable_id": "G2P00001",
+            "date": datetime.date(2025, 1, 31),
+            "last_updated": datetime.datetime(
+                2025, 1, 31, 10, 30, 5, 123456, tzinfo=datetime.timezone.utc
+            ),
+            "score": Decimal("0.25"),
+            "comment": "Gene Disease – é",
+            "panels": ["DD", "Eye"],
+            1: None,
+        }
+
+        self.assertEqual(
+            FastJSONRenderer().render(data), JSONRenderer().render(data)
+        )
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    def test_list_mechanisms(self):
+        response = self.client.get(reverse("list_mechanisms"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.content, JSONRenderer().render(build_molecular_mechanisms())
+        )
+
+    def test_lgd_detail(self):
+        # The record endpoint uses FAST_RENDERER_CLASSES
+        response = self.client.get(reverse("lgd", kwargs={"stable_id": "G2P00002"}))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
@@ -0,0 +1,95 @@
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from gene2phenotype_app.db_router import get_lag_from_replica_status
+from gene2phenotype_app.middleware import ReplicaRoutingMiddleware
+from gene2phenotype_app.models import Panel, User
+
+
+@override_settings(REPLICA_ROUTING=True)
+class ReplicaRoutingTests(TestCase):
+    """
+    Test the read replica routing: ReplicaRouter and ReplicaRoutingMiddleware
+    The fixtures are loaded into both databases, the new panel is only in the default database.
+    """
+
+    databases = {"default", "replica"}
+    fixtures = [
+        "gene2phenotype_app/fixtures/user_panels.json",
+        "gene2phenotype_app/fixtures/attribs.json",
+    ]
+
+    def setUp(self):
+        self.url_panels = reverse("list_panels")
+        Panel.objects.create(name="New", description="New panel", is_visible=1)
+
+    def test_anonymous_get_uses_replica(self):
+        response = self.client.get(self.url_panels)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data.get("count"), 4)
+
+    def test_authenticated_get_uses_default(self):
+        user = User.objects.get(email="user5@test.ac.uk")
+        refresh = RefreshToken.for_user(user)
+        self.client.cookies[settings.SIMPLE_JWT["AUTH_COOKIE"]] = str(
+            refresh.access_token
+        )
+
+        response = self.client.get(self.url_panels)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data.get("count"), 6)
+
+    def test_refresh_token_get_uses_default(self):
+        # The access token expired, the user still has a refresh token
+        user = User.objects.get(email="user5@test.ac.uk")
+        refresh = RefreshToken.for_user(user)
+        self.client.cookies[settings.SIMPLE_JWT["REFRESH_COOKIE"]] = str(refresh)
+
+        response = self.client.get(self.url_panels)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data.get("count"), 5)
+
+    def test_read_your_writes(self):
+        user = User.objects.get(email="user5@test.ac.uk")
+        refresh = RefreshToken.for_user(user)
+        self.client.cookies[settings.SIMPLE_JWT["AUTH_COOKIE"]] = str(
+            refresh.access_token
+        )
+        self.client.cookies[settings.SIMPLE_JWT["REFRESH_COOKIE"]] = str(refresh)
+
+        response = self.client.post(reverse("logout"))
+        self.assertEqual(response.status_code, 204)
+        self.assertIn(ReplicaRoutingMiddleware.PIN_COOKIE, response.cookies)
+
+        # The user is now anonymous but reads from the default database
+        self.client.cookies.pop(settings.SIMPLE_JWT["AUTH_COOKIE"], None)
+        response = self.client.get(self.url_panels)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data.get("count"), 5)
+
+    @override_settings(REPLICA_MAX_LAG=-1)
+    def test_replica_lag_uses_default(self):
+        response = self.client.get(self.url_panels)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data.get("count"), 5)
+
+
+class ReplicaLagTests(SimpleTestCase):
+    """
+    Test the lag is read from the replica status of MySQL and MariaDB
+    """
+
+    def test_seconds_behind_source(self):
+        self.assertEqual(get_lag_from_replica_status({"Seconds_Behind_Source": 3}), 3)
+
+    def test_seconds_behind_master(self):
+        self.assertEqual(get_lag_from_replica_status({"Seconds_Behind_Master": 5}), 5)
+
+    def test_not_replicating(self):
+        self.assertIsNone(get_lag_from_replica_status({"Seconds_Behind_Source": None}))
+
+    def test_missing_column(self):
+        with self.assertLogs("gene2phenotype_app.db_router", level="WARNING"):
+            self.assertIsNone(get_lag_from_replica_status({"Replica_IO_State": ""}))
@@ -57,6 +57,19 @@ class SearchTests(TestCase):
         self.assertEqual(response.data["previous"], None)
         self.assertEqual(response.data["results"], self.expected_data)
 
+    def test_search_gene_num_queries(self):
+        """
+        Test the search only runs one query for the records and one for the panels
+        """
+        url_search_gene = f"{self.base_url_search}?type=gene&query=CEP290"
+
+        # Check if there are results, fetch the summaries, fetch the panels
+        with self.assertNumQueries(3):
+            response = self.client.get(url_search_gene)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"], self.expected_data)
+
     def test_search_disease(self):
         """
         Test the response when searching by disease type of search
@@ -0,0 +1,53 @@
+from django.contrib.auth.models import AnonymousUser
+from django.test import TestCase
+
+from gene2phenotype_app.models import User
+from gene2phenotype_app.serializers import UserSerializer
+from gene2phenotype_app.user_context import get_user_context
+
+
+class UserContextTests(TestCase):
+    """
+    Test the user context: permission data shared by the request
+    """
+
+    fixtures = [
+        "gene2phenotype_app/fixtures/user_panels.json",
+        "gene2phenotype_app/fixtures/attribs.json",
+    ]
+
+    def setUp(self):
+        self.user = User.objects.get(email="user5@test.ac.uk")
+
+    def test_user_panels(self):
+        user_context = get_user_context(self.user)
+
+        self.assertTrue(user_context.is_authenticated)
+        self.assertEqual(sorted(user_context.panel_names), ["DD", "Ear", "Eye"])
+        self.assertEqual(
+            sorted(user_context.panel_descriptions),
+            ["Developmental disorders", "Ear disorders", "Eye disorders"],
+        )
+
+        # The panels are only fetched once
+        with self.assertNumQueries(0):
+            get_user_context(self.user).panel_names
+
+    def test_serializer_uses_context(self):
+        get_user_context(self.user).panel_names
+
+        serializer = UserSerializer(self.user, context={"user": self.user})
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                sorted(serializer.panels_names(self.user)), ["DD", "Ear", "Eye"]
+            )
+            self.assertTrue(serializer.check_panel_permission([{"name": "Eye"}]))
+            self.assertFalse(serializer.check_panel_permission([{"name": "Cardiac"}]))
+
+    def test_anonymous_user(self):
+        user_context = get_user_context(AnonymousUser())
+
+        self.assertFalse(user_context.is_authenticated)
+        self.assertFalse(user_context.is_junior_curator)
+        self.assertEqual(user_context.panel_names, [])
+        self.assertEqual(user_context.visible_panel_ids, {1, 3, 4, 5})
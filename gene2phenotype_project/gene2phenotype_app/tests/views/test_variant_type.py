@@ -1,6 +1,10 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 
+from gene2phenotype_app.catalogues import variant_types
+from gene2phenotype_app.models import OntologyTerm
+
 
 class ListVariantTypesEndpoint(TestCase):
     """
@@ -23,8 +27,33 @@ class ListVariantTypesEndpoint(TestCase):
         response = self.client.get(self.url_list_variant_types)
         self.assertEqual(response.status_code, 200)
         # Counts the number of terms by variant type
-        self.assertEqual(len(response.data["NMD_variants"]), 10)
-        self.assertEqual(len(response.data["splice_variants"]), 3)
-        self.assertEqual(len(response.data["protein_changing_variants"]), 7)
-        self.assertEqual(len(response.data["regulatory_variants"]), 3)
-        self.assertEqual(len(response.data["other_variants"]), 8)
+        self.assertEqual(len(response.json()["NMD_variants"]), 10)
+        self.assertEqual(len(response.json()["splice_variants"]), 3)
+        self.assertEqual(len(response.json()["protein_changing_variants"]), 7)
+        self.assertEqual(len(response.json()["regulatory_variants"]), 3)
+        self.assertEqual(len(response.json()["other_variants"]), 8)
+
+    def test_variant_types_invalidate(self):
+        """
+        Test only the variant type terms clear the catalogue
+        """
+        version = cache.get(variant_types.version_key)
+
+        # Disease term
+        disease_term = OntologyTerm.objects.create(
+            accession="MONDO:0000001",
+            term="test disease",
+            source_id=1,
+            group_type_id=51,
+        )
+        disease_term.delete()
+        self.assertEqual(cache.get(variant_types.version_key), version)
+
+        # Variant type term
+        OntologyTerm.objects.create(
+            accession="SO:0000001",
+            term="test variant",
+            source_id=1,
+            group_type_id=53,
+        )
+        self.assertNotEqual(cache.get(variant_types.version_key), version)
@@ -95,6 +95,11 @@ urlpatterns = [
         views.GeneDiseaseView.as_view(),
         name="locus_gene_disease",
     ),
+    path(
+        "gene/<str:name>/full/",
+        views.GeneFull.as_view(),
+        name="locus_gene_full",
+    ),
 
     # Endpoint to update disease cross references
     # It has to be included before the other /disease/ endpoints
@@ -129,6 +134,11 @@ urlpatterns = [
         views.ExternalDisease,
         name="external_disease",
     ),
+    path(
+        "external_disease/",
+        views.ExternalDiseaseList,
+        name="external_disease_list",
+    ),
 
     ### Endpoints to add data ###
     path(
@@ -301,6 +311,11 @@ urlpatterns = [
         views.PublishRecord.as_view(),
         name="publish_record",
     ),
+    path(
+        "curation/publish/status/<int:job_id>/",
+        views.PublishJobStatus.as_view(),
+        name="publish_job_status",
+    ),
 
     ### User management ###
     path(
@@ -384,6 +399,12 @@ urlpatterns = [
         views.RetrieveStableIDsWithSubmissionID.as_view(),
         name="get_gencc_sub",
     ),
+    # Download the GenCC submission file (new, updated and withdrawn records)
+    path(
+        "gencc_submission/",
+        views.GenCCSubmissionPayloadView.as_view(),
+        name="gencc_submission_payload",
+    ),
 
     ### Activity logs ###
     path(
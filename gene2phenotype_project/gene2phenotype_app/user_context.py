@@ -0,0 +1,89 @@
+from functools import cached_property
+
+from .models import Panel, UserPanel
+
+
+class UserContext:
+    """
+    Permission data of the user making the request.
+    The data is only fetched the first time it is used and then reused by the
+    views and serializers of the same request (see get_user_context()).
+
+        - is_authenticated: True if the user is logged in
+        - is_superuser: True if the user is a super user
+        - is_junior_curator: True if the user is in the junior curator group
+        - user_panels: panels the user has permission to edit (name, description, visibility)
+        - visible_panel_ids: ids of the panels the user can see
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.is_authenticated = bool(user is not None and user.is_authenticated)
+        self.is_superuser = self.is_authenticated and bool(user.is_superuser)
+
+    @cached_property
+    def is_junior_curator(self) -> bool:
+        return (
+            self.is_authenticated
+            and self.user.groups.filter(name="junior_curator").exists()
+        )
+
+    @cached_property
+    def user_panels(self) -> list[dict]:
+        if not self.is_authenticated:
+            return []
+
+        return [
+            {
+                "id": panel_id,
+                "name": name,
+                "description": description,
+                "is_visible": is_visible,
+            }
+            for panel_id, name, description, is_visible in UserPanel.objects.filter(
+                user=self.user, is_deleted=0
+            ).values_list(
+                "panel_id", "panel__name", "panel__description", "panel__is_visible"
+            )
+        ]
+
+    @property
+    def panel_names(self) -> list[str]:
+        return [panel["name"] for panel in self.user_panels]
+
+    @property
+    def panel_descriptions(self) -> list[str]:
+        return [panel["description"] for panel in self.user_panels]
+
+    @cached_property
+    def visible_panel_ids(self) -> set[int]:
+        # Authenticated users can see all panels
+        queryset = Panel.objects.all()
+        if not self.is_authenticated:
+            queryset = queryset.filter(is_visible=1)
+
+        return set(queryset.values_list("id", flat=True))
+
+    def is_user(self, user) -> bool:
+        """
+        Returns True if 'user' (User object or id) is the user making the request.
+        """
+        return self.is_authenticated and getattr(user, "pk", user) == self.user.pk
+
+
+def get_user_context(user) -> UserContext:
+    """
+    Returns the context of the user making the request.
+    The context is stored in the user object, which is created for each request,
+    so all the serializers that receive the user share the same context.
+
+    Args:
+        user: the request user (User or AnonymousUser)
+    """
+    if user is None:
+        return UserContext(None)
+
+    if not hasattr(user, "_user_context"):
+        user._user_context = UserContext(user)
+
+    return user._user_context
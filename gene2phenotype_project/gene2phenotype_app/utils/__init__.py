@@ -1,13 +1,15 @@
 from .disease_utils import (
     clean_string,
     get_ontology,
+    get_ontologies,
+    read_mondo_file,
     clean_omim_disease,
     get_ontology_source,
     check_synonyms_disease,
     validate_disease_name,
 )
 from .publication_utils import get_publication, get_authors, clean_title
-from .locus_utils import validate_gene
+from .locus_utils import validate_gene, get_gene_reference
 from .phenotype_utils import validate_phenotype
 from .user_utils import CustomMail
 from .date_utils import get_date_now
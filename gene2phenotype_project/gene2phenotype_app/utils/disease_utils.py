@@ -1,9 +1,15 @@
 #!/usr/bin/env python3
 
 import re
+import json
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from typing import Optional, Union
 
+# Timeout (seconds) of the queries to the Ontology Lookup Service (OLS)
+OLS_TIMEOUT = 30
+
 
 def latin2arab(match: re.Match[str]) -> str:
     """
@@ -129,16 +135,20 @@ def validate_disease_name(name: str) -> bool:
     return flag
 
 
-def get_ontology(id: str, source: str) -> Union[dict, None]:
+def get_ontology(
+    id: str, source: str, session: Optional[requests.Session] = None
+) -> Union[dict, str, None]:
     """
     Query the Ontology Lookup Service (OLS) API for disease ontology information.
 
     Input:
         id (str): The disease identifier to query (e.g. "MONDO:0005148" or "222100")
         source (str): The ontology source. Supported values are: 'Mondo' and 'OMIM'
+        session (requests.Session): Optional session to reuse the connections to OLS
     Output:
-        dict | None:
+        dict | str | None:
             - A dictionary containing the OLS response `doc` if available
+            - "query failed" if OLS cannot be reached
             - None if the source is invalid or no matching record is found
     """
     if source.lower() == "mondo":
@@ -150,7 +160,12 @@ def get_ontology(id: str, source: str) -> Union[dict, None]:
     else:
         return None
 
-    r = requests.get(url, headers={"Content-Type": "application/json"})
+    try:
+        r = (session or requests).get(
+            url, headers={"Content-Type": "application/json"}, timeout=OLS_TIMEOUT
+        )
+    except requests.RequestException:
+        return "query failed"
 
     if not r.ok:
         return None
@@ -168,6 +183,116 @@ def get_ontology(id: str, source: str) -> Union[dict, None]:
     return name
 
 
+def get_ontologies(ids: list[str], source: str, max_workers: int = 8) -> dict:
+    """
+    Query the Ontology Lookup Service (OLS) API for a list of disease identifiers.
+    The queries run in parallel and share one pool of connections.
+
+    Args:
+        ids (list[str]): The disease identifiers to query (e.g. ["MONDO:0005148"])
+        source (str): The ontology source. Supported values are: 'Mondo' and 'OMIM'
+        max_workers (int): Number of parallel queries (default: 8)
+
+    Returns:
+        dict: The result of get_ontology() for each identifier
+    """
+    ids = list(dict.fromkeys(ids))
+
+    if not ids:
+        return {}
+
+    with requests.Session() as session:
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        session.mount("https://", adapter)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(lambda id: get_ontology(id, source, session), ids)
+
+            return dict(zip(ids, results))
+
+
+def read_mondo_file(mondo_file: str) -> dict:
+    """
+    Read a local Mondo release file.
+    Supported formats: OBO (mondo.obo) and OBO Graphs JSON (mondo.json).
+    Obsolete terms are not included, the same as the OLS search.
+
+    Args:
+        mondo_file (str): Mondo file
+
+    Returns:
+        dict: The Mondo terms by ID (e.g. "MONDO:0005148"), each term has the same
+        keys as the OLS response `doc`: 'obo_id', 'label' and 'description'
+    """
+    ontologies = {}
+
+    def is_valid_mondo_term(term):
+        return (
+            term is not None
+            and "obo_id" in term
+            and "label" in term
+            and not term.get("obsolete")
+        )
+
+    if mondo_file.endswith(".json"):
+        with open(mondo_file) as fh:
+            data = json.load(fh)
+
+        for graph in data.get("graphs", []):
+            for node in graph.get("nodes", []):
+                # Example: "http://purl.obolibrary.org/obo/MONDO_0005148"
+                obo_id = node.get("id", "").rsplit("/", 1)[-1].replace("_", ":")
+                meta = node.get("meta", {})
+
+                if not obo_id.startswith("MONDO:") or "lbl" not in node:
+                    continue
+                if meta.get("deprecated"):
+                    continue
+
+                definition = meta.get("definition", {}).get("val")
+                ontologies[obo_id] = {
+                    "obo_id": obo_id,
+                    "label": node["lbl"],
+                    "description": [definition] if definition else [],
+                }
+
+    else:
+        term = None
+
+        with open(mondo_file) as fh:
+            for line in fh:
+                line = line.strip()
+
+                # New stanza - save the previous term
+                if line.startswith("["):
+                    if is_valid_mondo_term(term):
+                        ontologies[term["obo_id"]] = term
+                    term = {"description": []} if line == "[Term]" else None
+
+                elif term is not None and ": " in line:
+                    tag, value = line.split(": ", 1)
+
+                    if tag == "id" and value.startswith("MONDO:"):
+                        term["obo_id"] = value
+                    elif tag == "name":
+                        term["label"] = value
+                    elif tag == "def":
+                        # Example: def: "The definition." [PMID:123]
+                        match = re.match(r'^"((?:[^"\\]|\\.)*)"', value)
+                        if match:
+                            term["description"] = [match.group(1).replace('\\"', '"')]
+                    elif tag == "is_obsolete" and value == "true":
+                        term["obsolete"] = True
+
+        if is_valid_mondo_term(term):
+            ontologies[term["obo_id"]] = term
+
+    for term in ontologies.values():
+        term.pop("obsolete", None)
+
+    return ontologies
+
+
 def get_ontology_source(id: str) -> Optional[str]:
     """
     Method to determine the ontology source from a disease identifier.
@@ -1,23 +1,121 @@
 #!/usr/bin/env python3
 
-import os
-import sys
 import requests
+from requests.adapters import HTTPAdapter
+from typing import Optional
+
+# Timeout (seconds) of the queries to the Ensembl REST API
+ENSEMBL_TIMEOUT = 30
+
+# Session shared by the queries to the Ensembl REST API
+ensembl_session = requests.Session()
+ensembl_session.mount("https://", HTTPAdapter(pool_maxsize=10))
 
 
 def query_ensembl(url):
-    r = requests.get(url, headers={"Content-Type": "application/json"})
+    """
+    Query the Ensembl REST API.
+
+    Raises:
+        requests.RequestException: if the query fails
+    """
+    r = ensembl_session.get(
+        url, headers={"Content-Type": "application/json"}, timeout=ENSEMBL_TIMEOUT
+    )
 
     if not r.ok:
         r.raise_for_status()
-        sys.exit()
 
     decoded = r.json()
 
     return decoded
 
 
-def validate_gene(gene_name):
+def get_gene_reference(gene_name: str) -> Optional[dict]:
+    """
+    Validate the gene against the reference genes imported by the command 'load_gene_reference'.
+    The gene can be the HGNC symbol or a previous/alias symbol of only one gene.
+
+    Args:
+        gene_name (str): gene symbol
+
+    Returns:
+        Optional[dict]: the gene data in the same format as the Ensembl REST API (see validate_gene()),
+        or None if the gene is not a reference gene
+    """
+    # Imported here to avoid a circular import (models use the utils)
+    from ..models import GeneReference, GeneReferenceSynonym
+
+    gene_obj = GeneReference.objects.filter(symbol__iexact=gene_name).first()
+
+    if not gene_obj:
+        gene_ids = list(
+            GeneReferenceSynonym.objects.filter(synonym__iexact=gene_name)
+            .values_list("gene_id", flat=True)
+            .distinct()[:2]
+        )
+        # The synonym is ambiguous
+        if len(gene_ids) != 1:
+            return None
+
+        gene_obj = GeneReference.objects.get(id=gene_ids[0])
+
+    validated = {
+        "primary_id": gene_obj.hgnc_id,
+        "display_id": gene_obj.symbol,
+        "description": gene_obj.name,
+        "synonyms": list(
+            gene_obj.genereferencesynonym_set.values_list("synonym", flat=True)
+        ),
+        "dbname": "HGNC",
+        "db_display_name": "HGNC Symbol",
+    }
+
+    if gene_obj.ensembl_id:
+        validated["ensembl_id"] = gene_obj.ensembl_id
+
+    mim = [
+        {"id": mim_id, "ensembl_id": gene_obj.ensembl_id, "disease": disease}
+        for mim_id, disease in gene_obj.genereferencemim_set.values_list(
+            "mim_id", "disease"
+        )
+    ]
+    if mim:
+        validated["mim"] = mim
+
+    return validated
+
+
+def validate_gene(gene_name, use_ensembl=False):
+    """
+    Validate the gene symbol.
+    The gene is validated against the reference genes (see get_gene_reference()).
+    The Ensembl REST API is only queried if the reference genes are not loaded,
+    or if the gene is not a reference gene and 'use_ensembl' is True.
+
+    Returns:
+        dict | None: the HGNC data of the gene, the Ensembl gene ID ('ensembl_id')
+        and the MIM morbid diseases ('mim'), or None if the gene is invalid
+
+    Raises:
+        requests.RequestException: if the Ensembl REST API cannot be queried
+    """
+    # Imported here to avoid a circular import (models use the utils)
+    from ..models import GeneReference
+
+    if GeneReference.objects.exists():
+        validated = get_gene_reference(gene_name)
+
+        if validated or not use_ensembl:
+            return validated
+
+    return validate_gene_ensembl(gene_name)
+
+
+def validate_gene_ensembl(gene_name):
+    """
+    Validate the gene symbol with the Ensembl REST API.
+    """
     url = f"https://rest.ensembl.org/xrefs/name/human/{gene_name}?content-type=application/json"
     url_symbol = f"https://rest.ensembl.org/xrefs/symbol/homo_sapiens/{gene_name}?content-type=application/json"
     url_phenotype = f"https://rest.ensembl.org/phenotype/gene/homo_sapiens/{gene_name}?content-type=application/json"
@@ -30,6 +128,10 @@ def validate_gene(gene_name):
             if data["db_display_name"] == "HGNC Symbol":
                 validated = data
 
+        # The gene name is not an HGNC symbol
+        if validated is None:
+            return None
+
         decoded_symbol = query_ensembl(url_symbol)
         if len(decoded_symbol) > 0:
             validated["ensembl_id"] = decoded_symbol[0]["id"]
@@ -16,7 +16,7 @@ from .panel import (
     LGDEditPanel,
 )
 
-from .locus import LocusGene, LocusGeneSummary, GeneFunction
+from .locus import LocusGene, LocusGeneSummary, GeneFunction, GeneFull
 
 from .disease import (
     GeneDiseaseView,
@@ -26,6 +26,7 @@ from .disease import (
     UpdateDisease,
     LGDUpdateDisease,
     ExternalDisease,
+    ExternalDiseaseList,
     DiseaseUpdateReferences,
     UpdateDiseaseOntologyTerms,
 )
@@ -36,6 +37,7 @@ from .curation import (
     CurationDataDetail,
     UpdateCurationData,
     PublishRecord,
+    PublishJobStatus,
     DeleteCurationData,
 )
 
@@ -81,6 +83,7 @@ from .gencc_submission import (
     GenCCSubmissionView,
     StableIDsWithLaterReviewDateView,
     RetrieveStableIDsWithSubmissionID,
+    GenCCSubmissionPayloadView,
 )
 
 from .phenotype import (
@@ -9,6 +9,8 @@ from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.views import APIView
 from rest_framework.pagination import PageNumberPagination
 
+from ..user_context import get_user_context
+
 
 class BaseView(generics.ListAPIView):
     """
@@ -189,11 +191,7 @@ class IsNotJuniorCurator(BasePermission):
     """
 
     def has_permission(self, request, view):
-        group_name = "junior_curator"
-        if (
-            request.user.is_authenticated
-            and request.user.groups.filter(name=group_name).exists()
-        ):
+        if get_user_context(request.user).is_junior_curator:
             return False
         return True
 
@@ -4,14 +4,22 @@ from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from jsonschema import validate, exceptions
 from django.conf import settings
+from django.db import transaction
 from rest_framework.views import APIView
 from drf_spectacular.utils import extend_schema
 
 from gene2phenotype_app.serializers import CurationDataSerializer
 
-from gene2phenotype_app.models import G2PStableID, CurationData, LocusGenotypeDisease
+from gene2phenotype_app.models import (
+    G2PStableID,
+    CurationData,
+    LocusGenotypeDisease,
+    PublishJob,
+)
 
-from .base import BaseView, BaseAdd, BaseUpdate, IsNotJuniorCurator
+from gene2phenotype_app.utils import get_date_now
+
+from .base import BaseView, BaseAPIView, BaseAdd, BaseUpdate, IsNotJuniorCurator
 
 
 ### Curation data
@@ -264,6 +272,11 @@ class PublishRecord(APIView):
         If data is published succesfully, it deletes entry from curation list and
         updates the G2P ID status to live.
 
+        The record can be published in the background by calling the endpoint with
+        the parameter 'async=true'. In this case, the record is added to the publish
+        queue and the response returns the job ID. The job is processed by the command
+        'process_publish_jobs' and its status is available in /curation/publish/status/<job_id>/
+
         Args:
             stable_id (string)
 
@@ -271,6 +284,10 @@ class PublishRecord(APIView):
                 Response message
         """
         user = self.request.user
+        publish_async = self.request.query_params.get("async", "").lower() in (
+            "true",
+            "1",
+        )
 
         try:
             # Get curation record
@@ -281,6 +298,9 @@ class PublishRecord(APIView):
             # Check if there is enough data to publish the record
             locus_obj = self.serializer_class().validate_to_publish(curation_obj)
 
+            if publish_async:
+                return self.queue_publish_job(curation_obj)
+
             # Publish record
             try:
                 lgd_obj, check = self.serializer_class(context={"user": user}).publish(
@@ -316,6 +336,99 @@ class PublishRecord(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
+    def queue_publish_job(self, curation_obj):
+        """
+        Add the curation record to the publish queue.
+        If the record is already in the queue, it returns the existing job.
+
+        Args:
+            (CurationData obj) curation_obj: record to be published
+
+        Returns:
+                Response message with the job ID
+        """
+        stable_id = curation_obj.stable_id.stable_id
+
+        with transaction.atomic():
+            # Lock the stable ID to only queue one job per record
+            G2PStableID.objects.select_for_update().get(id=curation_obj.stable_id_id)
+
+            # Jobs stopped before they finished do not block the record
+            PublishJob.fail_stale_jobs(curation_obj.stable_id)
+
+            job_obj = PublishJob.objects.filter(
+                stable_id=curation_obj.stable_id,
+                status__in=["queued", "fetching", "publishing"],
+            ).first()
+
+            if job_obj:
+                return Response(
+                    {
+                        "message": f"Record '{stable_id}' is already queued to be published",
+                        "job_id": job_obj.id,
+                    },
+                    status=status.HTTP_200_OK,
+                )
+
+            job_obj = PublishJob.objects.create(
+                stable_id=curation_obj.stable_id,
+                user=curation_obj.user,
+                status="queued",
+                date_created=get_date_now(),
+            )
+
+        return Response(
+            {
+                "message": f"Record '{stable_id}' queued to be published",
+                "job_id": job_obj.id,
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+@extend_schema(exclude=True)
+class PublishJobStatus(BaseAPIView):
+    http_method_names = ["get", "head"]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, job_id):
+        """
+        Returns the status of a job to publish a record.
+        Users can only access their own jobs.
+
+        Args:
+            job_id (int)
+
+        Returns:
+                Response containing the job status
+                    - job_id
+                    - stable_id
+                    - status: queued, fetching, publishing, completed or failed
+                    - message
+                    - created_on
+                    - started_on
+                    - completed_on
+        """
+        user = self.request.user
+
+        try:
+            job_obj = PublishJob.objects.select_related("stable_id").get(
+                id=job_id, user__email=user
+            )
+        except PublishJob.DoesNotExist:
+            self.handle_no_permission("Publish job", job_id)
+
+        response_data = {
+            "job_id": job_obj.id,
+            "stable_id": job_obj.stable_id.stable_id,
+            "status": job_obj.status,
+            "message": job_obj.message,
+            "created_on": job_obj.date_created,
+            "started_on": job_obj.date_started,
+            "completed_on": job_obj.date_completed,
+        }
+        return Response(response_data)
+
 
 @extend_schema(exclude=True)
 class DeleteCurationData(generics.DestroyAPIView):
@@ -15,23 +15,21 @@ from gene2phenotype_app.serializers import (
     CreateDiseaseSerializer,
     DiseaseOntologyTermSerializer,
     DiseaseOntologyTermListSerializer,
+    DiseaseRename,
+    LGDDiseaseRemap,
 )
 
 from gene2phenotype_app.models import (
-    AttribType,
-    Locus,
     OntologyTerm,
     DiseaseOntologyTerm,
     Disease,
-    DiseaseSynonym,
-    LocusAttrib,
     GeneDisease,
-    LocusGenotypeDisease,
     DiseaseExternal,
 )
 
-from ..utils import clean_omim_disease, validate_disease_name
+from ..utils import clean_omim_disease
 from .base import BaseAPIView, BaseAdd, IsSuperUser
+from ..gene_resolver import gene_resolver
 
 
 @extend_schema(exclude=True)
@@ -40,21 +38,19 @@ class GeneDiseaseView(BaseAPIView):
 
     def get_queryset(self):
         name = self.kwargs["name"]
-        gene_obj = Locus.objects.filter(name=name)
-        queryset = GeneDisease.objects.filter(gene=gene_obj.first())
+        locus_id = gene_resolver.get_locus_id(name, [gene_resolver.SYMBOL])
+        queryset = GeneDisease.objects.filter(gene_id=locus_id)
 
-        if not queryset.exists():
-            # Try to find gene in locus_attrib (gene synonyms)
-            attrib_type = AttribType.objects.filter(code="gene_synonym")
-            queryset = LocusAttrib.objects.filter(
-                value=name, attrib_type=attrib_type.first().id, is_deleted=0
+        if locus_id is None or not queryset.exists():
+            # Try to find gene in the gene synonyms and HGNC IDs
+            locus_id = gene_resolver.get_locus_id(
+                name, [gene_resolver.SYNONYM, gene_resolver.HGNC]
             )
 
-            if not queryset.exists():
+            if locus_id is None:
                 self.handle_no_permission("Gene", name)
 
-            gene_obj = Locus.objects.filter(id=queryset.first().locus.id)
-            queryset = GeneDisease.objects.filter(gene=gene_obj.first())
+            queryset = GeneDisease.objects.filter(gene_id=locus_id)
 
             if not queryset.exists():
                 self.handle_no_permission("Gene-Disease association", name)
@@ -66,7 +62,7 @@ class GeneDiseaseView(BaseAPIView):
         Return gene-disease associations imported from Mondo and OMIM.
 
         Args:
-            name (str): gene symbol or the synonym symbol
+            name (str): gene symbol, the synonym symbol or the HGNC ID
 
         Returns a list of objects where each object has
             results (list):
@@ -77,23 +73,33 @@ class GeneDiseaseView(BaseAPIView):
             count (int): number of diseases associated with the gene
         """
         queryset = self.get_queryset()
-        results = []
-        for gene_disease_obj in queryset:
-            # Return the original disease name and the clean version (without subtype)
-            # In the future, we will import diseases from other sources (Mondo, GenCC)
-            new_disease_name = clean_omim_disease(gene_disease_obj.disease)
-            results.append(
-                {
-                    "original_disease_name": gene_disease_obj.disease,
-                    "disease_name": new_disease_name,
-                    "identifier": gene_disease_obj.identifier,
-                    "source": gene_disease_obj.source.name,
-                }
-            )
+        results = get_gene_disease_results(queryset)
 
         return Response({"results": results, "count": len(results)})
 
 
+def get_gene_disease_results(queryset):
+    """
+    Returns the gene-disease associations (GeneDisease queryset) as a list.
+    Called by: GeneDiseaseView() and GeneFull()
+    """
+    results = []
+    for gene_disease_obj in queryset.select_related("source"):
+        # Return the original disease name and the clean version (without subtype)
+        # In the future, we will import diseases from other sources (Mondo, GenCC)
+        new_disease_name = clean_omim_disease(gene_disease_obj.disease)
+        results.append(
+            {
+                "original_disease_name": gene_disease_obj.disease,
+                "disease_name": new_disease_name,
+                "identifier": gene_disease_obj.identifier,
+                "source": gene_disease_obj.source.name,
+            }
+        )
+
+    return results
+
+
 @extend_schema(exclude=True)
 class DiseaseDetail(BaseAPIView):
     serializer_class = DiseaseDetailSerializer
@@ -253,36 +259,36 @@ def ExternalDisease(request, ext_ids):
         results (list): contains the disease name, identifier ID and the source name
         count (int): number of diseases in the response
     """
-    disease_id_list = ext_ids.split(",")
-    data = []
-    invalid_ids = []
+    return get_external_diseases_response(ext_ids.split(","))
 
-    for disease_id in disease_id_list:
-        if disease_id.startswith("MONDO") or disease_id.isdigit():
-            gene_disease = GeneDisease.objects.filter(identifier=disease_id)
-            if gene_disease.exists():
-                data.append(
-                    {
-                        "disease": gene_disease.first().disease,
-                        "identifier": gene_disease.first().identifier,
-                        "source": gene_disease.first().source.name,
-                    }
-                )
-            else:
-                external_disease = DiseaseExternal.objects.filter(identifier=disease_id)
-                if external_disease.exists():
-                    data.append(
-                        {
-                            "disease": external_disease.first().disease,
-                            "identifier": external_disease.first().identifier,
-                            "source": external_disease.first().source.name,
-                        }
-                    )
-                else:
-                    invalid_ids.append(disease_id)
 
-        else:
-            invalid_ids.append(disease_id)
+@extend_schema(exclude=True)
+@api_view(["POST"])
+def ExternalDiseaseList(request):
+    """
+    Returns the disease information for a long list of external disease IDs.
+    The IDs are sent as a list in the request body: ["MONDO:0012433", "610188"]
+
+    Returns the same response as ExternalDisease.
+    """
+    disease_id_list = request.data
+    if not isinstance(disease_id_list, list) or not all(
+        isinstance(disease_id, str) for disease_id in disease_id_list
+    ):
+        return Response(
+            {"error": "Please provide a list of disease IDs"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    return get_external_diseases_response(disease_id_list)
+
+
+def get_external_diseases_response(disease_id_list):
+    """
+    Returns the response of the external disease endpoints.
+    The response is 404 if one of the IDs is not found.
+    """
+    data, invalid_ids = get_external_diseases(disease_id_list)
 
     if invalid_ids:
         disease_list = ", ".join(invalid_ids)
@@ -297,6 +303,57 @@ def ExternalDisease(request, ext_ids):
     return response
 
 
+def get_external_diseases(disease_id_list):
+    """
+    Fetch the diseases from the gene-disease associations (GeneDisease) or,
+    if not found, from the external diseases (DiseaseExternal).
+    Each table is queried once for all the IDs.
+
+    Args:
+        disease_id_list (list): disease IDs (Mondo or OMIM)
+
+    Returns:
+        data (list): disease name, identifier ID and source name of each ID
+        invalid_ids (list): IDs not found
+    """
+    valid_ids = {
+        disease_id
+        for disease_id in disease_id_list
+        if disease_id.startswith("MONDO") or disease_id.isdigit()
+    }
+
+    diseases = {}
+    for model in (GeneDisease, DiseaseExternal):
+        ids_to_fetch = valid_ids - diseases.keys()
+        if not ids_to_fetch:
+            break
+
+        # Keep the first row of each ID
+        for disease_obj in (
+            model.objects.filter(identifier__in=ids_to_fetch)
+            .select_related("source")
+            .order_by("id")
+        ):
+            diseases.setdefault(
+                disease_obj.identifier,
+                {
+                    "disease": disease_obj.disease,
+                    "identifier": disease_obj.identifier,
+                    "source": disease_obj.source.name,
+                },
+            )
+
+    data = []
+    invalid_ids = []
+    for disease_id in disease_id_list:
+        if disease_id in diseases:
+            data.append(diseases[disease_id])
+        else:
+            invalid_ids.append(disease_id)
+
+    return data, invalid_ids
+
+
 ### Add data
 @extend_schema(exclude=True)
 class AddDisease(BaseAdd):
@@ -347,6 +404,8 @@ class UpdateDisease(BaseAdd):
             ]
 
         Returns a list of updated records and any validation errors.
+        The response also includes the report of each disease of the input
+        (key "report"), in the same order as the input.
         """
         diseases = request.data
 
@@ -356,87 +415,15 @@ class UpdateDisease(BaseAdd):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        updated_diseases = []
-        errors = []
-
-        for disease_data in diseases:
-            disease_id = disease_data.get("id")
-            new_name = disease_data.get("name")
-            add_synonym = disease_data.get("add_synonym", False)
-
-            if not disease_id or not new_name:
-                errors.append({"error": "Both 'id' and 'name' are required."})
-                continue
-
-            if not validate_disease_name(new_name):
-                errors.append(
-                    {
-                        "id": disease_id,
-                        "name": new_name,
-                        "error": f"Invalid disease name '{new_name}'",
-                    }
-                )
-                continue
-
-            # Fetch disease or return 404 if not found
-            disease_obj = get_object_or_404(Disease, id=disease_id)
-
-            # Ensure the new disease does not include leading or trailing whitespaces
-            new_disease_name = new_name.strip()
+        # The diseases are validated and updated in bulk
+        reports = DiseaseRename(request.user).rename(diseases)
 
-            if new_disease_name == disease_obj.name:
-                errors.append(
-                    {
-                        "id": disease_id,
-                        "name": new_disease_name,
-                        "error": "Disease name is already up to date.",
-                    }
-                )
-                continue
-
-            # Ensure the new name is unique
-            check_disease = Disease.objects.filter(name=new_disease_name).exclude(
-                id=disease_id
-            )
-            if check_disease:
-                # If new disease name already exists then flag error
-                errors.append(
-                    {
-                        "id": disease_id,
-                        "name": new_disease_name,
-                        "existing_id": check_disease[0].id,
-                        "error": f"A disease with the name '{new_disease_name}' already exists.",
-                    }
-                )
-            else:
-                # Dot not update the name if disease is associated with multiple records
-                lgd_list = LocusGenotypeDisease.objects.filter(disease=disease_obj)
-                if len(lgd_list) > 1:
-                    errors.append(
-                        {
-                            "id": disease_id,
-                            "name": new_disease_name,
-                            "error": "Disease is associated with multiple records.",
-                        }
-                    )
-                else:
-                    # Disease name is going to be updated
-                    # Save the current name in variable to add it as synonym
-                    current_name = disease_obj.name
-                    # Update disease name and save
-                    disease_obj.name = new_disease_name
-                    disease_obj.save()
-                    updated_diseases.append(
-                        {"id": disease_id, "name": new_disease_name}
-                    )
+        updated_diseases = [
+            updated for report in reports for updated in report["updated"]
+        ]
+        errors = [error for report in reports for error in report["errors"]]
 
-                    # Add the previous name as synonym
-                    if add_synonym:
-                        DiseaseSynonym.objects.get_or_create(
-                            synonym=current_name, disease=disease_obj
-                        )
-
-        response_data = {}
+        response_data = {"report": reports}
         if updated_diseases:
             response_data["updated"] = updated_diseases
 
@@ -616,6 +603,7 @@ class LGDUpdateDisease(BaseAdd):
     http_method_names = ["post", "options"]
     permission_classes = [IsSuperUser]
 
+    @transaction.atomic
     def post(self, request):
         """
         Method to update the disease ID in the main table locus_genotype_disease.
@@ -628,6 +616,9 @@ class LGDUpdateDisease(BaseAdd):
             2) It updates the disease ID for the specific record
             Input example:
                     [{disease_id: 1, new_disease_id: 2, stable_id: G2P00001}]
+
+        The response includes the report of each item of the input (key "report"),
+        in the same order as the input.
         """
         data_to_update = request.data
 
@@ -637,65 +628,15 @@ class LGDUpdateDisease(BaseAdd):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        updated_records = []
-        errors = []
-
-        for disease_to_update in data_to_update:
-            current_disease_id = disease_to_update.get("disease_id")
-            new_disease_id = disease_to_update.get("new_disease_id")
-            stable_id_to_update = disease_to_update.get("stable_id", None)
-
-            if not current_disease_id or not new_disease_id:
-                errors.append(
-                    {"error": "Both 'disease_id' and 'new_disease_id' are required."}
-                )
-                continue
-
-            # Get records that use the disease id
-            if not stable_id_to_update:
-                lgd_list = LocusGenotypeDisease.objects.filter(
-                    disease_id=current_disease_id, is_deleted=0
-                )
-            else:
-                # This list contains only one record
-                lgd_list = LocusGenotypeDisease.objects.filter(
-                    stable_id__stable_id=stable_id_to_update,
-                    disease_id=current_disease_id,
-                    is_deleted=0,
-                )
-
-            if not lgd_list:
-                errors.append(
-                    {
-                        "error": f"No records associated with disease id {current_disease_id}"
-                    }
-                )
-                continue
+        # The records are validated and updated in bulk
+        reports = LGDDiseaseRemap(request.user).remap(data_to_update)
 
-            for lgd_obj in lgd_list:
-                # Check if there is another LGD record linked to the new disease id
-                try:
-                    existing_lgd_obj = LocusGenotypeDisease.objects.get(
-                        locus_id=lgd_obj.locus_id,
-                        disease_id=new_disease_id,
-                        genotype_id=lgd_obj.genotype_id,
-                        mechanism_id=lgd_obj.mechanism_id,
-                    )
-                    errors.append(
-                        {
-                            "disease_id": current_disease_id,
-                            "error": f"Found a different record with same locus, genotype, disease and mechanism: '{existing_lgd_obj.stable_id.stable_id}'",
-                        }
-                    )
-                except LocusGenotypeDisease.DoesNotExist:
-                    # Update record with new disease id
-                    lgd_obj.disease_id = new_disease_id
-                    lgd_obj.save()
-                    updated_records.append(
-                        {"g2p_id": lgd_obj.stable_id.stable_id, "lgd_id": lgd_obj.id}
-                    )
+        updated_records = [
+            updated for report in reports for updated in report["updated"]
+        ]
+        errors = [error for report in reports for error in report["errors"]]
 
-        response_data = {}
+        response_data = {"report": reports}
         if updated_records:
             response_data["Updated records"] = updated_records
 
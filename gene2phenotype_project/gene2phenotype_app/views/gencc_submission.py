@@ -1,14 +1,17 @@
+from django.http import StreamingHttpResponse
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import generics, permissions
 from rest_framework import status
 from drf_spectacular.utils import extend_schema
 from rest_framework.request import Request
+from datetime import datetime
+import csv
 
 from gene2phenotype_app.serializers import (
     GenCCSubmissionSerializer,
-    G2PStableIDSerializer,
     CreateGenCCSubmissionSerializer,
+    GenCCSubmissionPayload,
 )
 
 
@@ -49,8 +52,7 @@ class GenCCSubmissionView(APIView):
             Response: Response containing the status and the serializer.data
         """
         unused_ids = GenCCSubmissionSerializer.fetch_list_of_unsubmitted_stable_id()
-        serializer = G2PStableIDSerializer(unused_ids, many=True)
-        stable_ids = [entry["stable_id"] for entry in serializer.data]
+        stable_ids = list(unused_ids.values_list("stable_id", flat=True))
         return Response(stable_ids, status=status.HTTP_200_OK)
 
 
@@ -67,9 +69,11 @@ class StableIDsWithLaterReviewDateView(APIView):
              the count of stable_ids that fit this criteria
              status
         """
-        stable_ids = GenCCSubmissionSerializer.fetch_stable_ids_with_later_review_date()
+        stable_ids = list(
+            GenCCSubmissionSerializer.fetch_stable_ids_with_later_review_date()
+        )
         return Response(
-            {"ids": list(stable_ids), "count": len(list(stable_ids))},
+            {"ids": stable_ids, "count": len(stable_ids)},
             status=status.HTTP_200_OK,
         )
 
@@ -93,3 +97,35 @@ class RetrieveStableIDsWithSubmissionID(APIView):
         stable_id = GenCCSubmissionSerializer.get_stable_ids(submission_id)
 
         return Response(stable_id, status=status.HTTP_200_OK)
+
+
+class Echo:
+    """Pseudo-buffer: the csv writer returns the rows instead of writing them"""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+@extend_schema(exclude=True)
+class GenCCSubmissionPayloadView(APIView):
+    """Streams the GenCC submission file (new, updated and withdrawn records)"""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request: Request) -> StreamingHttpResponse:
+        """Gets the GenCC submission file
+
+        Returns:
+            StreamingHttpResponse: tab-separated file with one submission per row
+        """
+        date_now = datetime.today().strftime("%Y-%m-%d")
+        filename = f"G2P_GenCC_submission_{date_now}.tsv"
+
+        writer = csv.writer(Echo(), delimiter="\t", lineterminator="\n")
+        rows = GenCCSubmissionPayload().rows()
+
+        return StreamingHttpResponse(
+            (writer.writerow(row) for row in rows),
+            content_type="text/tab-separated-values",
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
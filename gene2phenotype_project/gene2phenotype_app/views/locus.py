@@ -1,45 +1,56 @@
+from django.conf import settings
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiExample
 import textwrap
+import time
 
-from gene2phenotype_app.models import AttribType, Attrib, Locus, LocusAttrib
+from gene2phenotype_app.models import Locus, GeneDisease
 
 from gene2phenotype_app.serializers import LocusGeneSerializer
 
 from .base import BaseAPIView
+from .disease import get_gene_disease_results
+from ..gene_resolver import gene_resolver
 
 
-@extend_schema(exclude=True)
-class LocusGene(BaseAPIView):
-    lookup_field = "name"
-    serializer_class = LocusGeneSerializer
+class GeneMixin:
+    """
+    Fetch the gene from the gene symbol, gene synonym or HGNC ID.
+    Used by the gene endpoints.
+    """
 
-    def get_queryset(self):
-        name = self.kwargs["name"]
-        attrib_type = AttribType.objects.filter(code="locus_type")
-        attrib = Attrib.objects.filter(type=attrib_type.first().id, value="gene")
-        queryset = Locus.objects.filter(name=name, type=attrib.first().id)
+    def get_gene_id(self, name):
+        locus_id = gene_resolver.get_locus_id(name)
+
+        if locus_id is None:
+            self.handle_no_permission("Gene", name)
 
-        if not queryset.exists():
-            # Try to find gene in locus_attrib (gene synonyms)
-            attrib_type = AttribType.objects.filter(code="gene_synonym")
-            queryset = LocusAttrib.objects.filter(
-                value=name, attrib_type=attrib_type.first().id, is_deleted=0
-            )
+        return locus_id
 
-            if not queryset.exists():
-                self.handle_no_permission("Gene", name)
+    def get_gene(self, name):
+        locus_obj = Locus.objects.filter(id=self.get_gene_id(name)).first()
 
-            queryset = Locus.objects.filter(id=queryset.first().locus.id)
+        # The gene names are cached, the gene could have been deleted
+        if locus_obj is None:
+            self.handle_no_permission("Gene", name)
+
+        return locus_obj
+
+
+@extend_schema(exclude=True)
+class LocusGene(GeneMixin, BaseAPIView):
+    lookup_field = "name"
+    serializer_class = LocusGeneSerializer
 
-        return queryset
+    def get_queryset(self):
+        return Locus.objects.filter(id=self.get_gene_id(self.kwargs["name"]))
 
     def get(self, request, *args, **kwargs):
         """
         Fetch information for a specific gene.
 
         Args:
-            name (str): gene symbol or the synonym symbol
+            name (str): gene symbol, the synonym symbol or the HGNC ID
 
         Returns a dictionary with the following values:
                             gene_symbol (str)
@@ -173,7 +184,7 @@ class LocusGene(BaseAPIView):
         )
     },
 )
-class LocusGeneSummary(BaseAPIView):
+class LocusGeneSummary(GeneMixin, BaseAPIView):
     serializer_class = LocusGeneSerializer
 
     def get(self, request, name, *args, **kwargs):
@@ -181,32 +192,18 @@ class LocusGeneSummary(BaseAPIView):
         Return a summary of the G2P entries associated with the gene.
 
         Args:
-            name (str): gene symbol or the synonym symbol
+            name (str): gene symbol, the synonym symbol or the HGNC ID
 
         Returns a dictionary with the following values:
                 gene_symbol (string)
                 records_summary (list)
         """
-        attrib_type = AttribType.objects.filter(code="locus_type")
-        attrib = Attrib.objects.filter(type=attrib_type.first().id, value="gene")
-        queryset = Locus.objects.filter(name=name, type=attrib.first().id)
-
-        if not queryset.exists():
-            # Try to find gene in locus_attrib (gene synonyms)
-            attrib_type = AttribType.objects.filter(code="gene_synonym")
-            queryset = LocusAttrib.objects.filter(
-                value=name, attrib_type=attrib_type.first().id, is_deleted=0
-            )
-
-            if not queryset.exists():
-                self.handle_no_permission("Gene", name)
-
-            queryset = Locus.objects.filter(id=queryset.first().locus.id)
+        locus_obj = self.get_gene(name)
 
         serializer = LocusGeneSerializer
-        summmary = serializer.records_summary(queryset.first(), self.request.user)
+        summmary = serializer.records_summary(locus_obj, self.request.user)
         response_data = {
-            "gene_symbol": queryset.first().name,
+            "gene_symbol": locus_obj.name,
             "records_summary": summmary,
         }
 
@@ -214,7 +211,7 @@ class LocusGeneSummary(BaseAPIView):
 
 
 @extend_schema(exclude=True)
-class GeneFunction(BaseAPIView):
+class GeneFunction(GeneMixin, BaseAPIView):
     serializer_class = LocusGeneSerializer
 
     def get(self, request, name, *args, **kwargs):
@@ -222,36 +219,85 @@ class GeneFunction(BaseAPIView):
         Return the gene product function imported from UniProt.
 
         Args:
-            name (str): gene symbol or the synonym symbol
+            name (str): gene symbol, the synonym symbol or the HGNC ID
 
         Returns a dictionary with the following:
                 gene_symbol (string);
                 function (dict): gene product function from UniProt;
                 gene_stats (dict): gene scores (Badonyi probabilities and gnomAD constraint metrics scores)
         """
-        attrib_type = AttribType.objects.filter(code="locus_type")
-        attrib = Attrib.objects.filter(type=attrib_type.first().id, value="gene")
-        queryset = Locus.objects.filter(name=name, type=attrib.first().id)
+        locus_obj = self.get_gene(name)
+
+        serializer = LocusGeneSerializer
+        summmary = serializer.function(locus_obj)
+        gene_stats = serializer.gene_scores(locus_obj)
+        response_data = {
+            "gene_symbol": locus_obj.name,
+            "function": summmary,
+            "gene_stats": gene_stats,
+        }
+
+        return Response(response_data)
+
+
+@extend_schema(exclude=True)
+class GeneFull(GeneMixin, BaseAPIView):
+    serializer_class = LocusGeneSerializer
 
-        if not queryset.exists():
-            # Try to find gene in locus_attrib (gene synonyms)
-            attrib_type = AttribType.objects.filter(code="gene_synonym")
-            queryset = LocusAttrib.objects.filter(
-                value=name, attrib_type=attrib_type.first().id, is_deleted=0
-            )
+    def get(self, request, name, *args, **kwargs):
+        """
+        Return all the data displayed in the gene page.
+        The gene is fetched once and used by each section. The sections are
+        the responses of the gene endpoints:
+            gene/<name>/, gene/<name>/summary/, gene/<name>/function/ and
+            gene/<name>/disease/
 
-            if not queryset.exists():
-                self.handle_no_permission("Gene", name)
+        Args:
+            name (str): gene symbol, the synonym symbol or the HGNC ID
 
-            queryset = Locus.objects.filter(id=queryset.first().locus.id)
+        Returns a dictionary with the following:
+                gene information (see LocusGene);
+                records_summary (list): summary of the G2P records;
+                function (dict): gene product function from UniProt;
+                gene_stats (dict): gene scores (Badonyi probabilities and gnomAD constraint metrics scores);
+                gene_disease (dict): gene-disease associations imported from Mondo and OMIM;
+                timings (dict): time to fetch each section in milliseconds (only in debug mode)
+        """
+        locus_obj = self.get_gene(name)
 
         serializer = LocusGeneSerializer
-        summmary = serializer.function(queryset.first())
-        gene_stats = serializer.gene_scores(queryset.first())
+        sections = {
+            "gene": lambda: serializer(locus_obj).data,
+            "records_summary": lambda: serializer.records_summary(
+                locus_obj, self.request.user
+            ),
+            "function": lambda: serializer.function(locus_obj),
+            "gene_stats": lambda: serializer.gene_scores(locus_obj),
+            "gene_disease": lambda: get_gene_disease_results(
+                GeneDisease.objects.filter(gene=locus_obj)
+            ),
+        }
+
+        data = {}
+        timings = {}
+        for section, fetch_data in sections.items():
+            start = time.perf_counter()
+            data[section] = fetch_data()
+            timings[section] = round((time.perf_counter() - start) * 1000, 2)
+
+        # The gene information is returned at the top level as in LocusGene
         response_data = {
-            "gene_symbol": queryset.first().name,
-            "function": summmary,
-            "gene_stats": gene_stats,
+            **data["gene"],
+            "records_summary": data["records_summary"],
+            "function": data["function"],
+            "gene_stats": data["gene_stats"],
+            "gene_disease": {
+                "results": data["gene_disease"],
+                "count": len(data["gene_disease"]),
+            },
         }
 
+        if settings.DEBUG:
+            response_data["timings"] = timings
+
         return Response(response_data)
@@ -4,8 +4,9 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.db import transaction, IntegrityError
 from django.db.models import Model, QuerySet
-from django.http import Http404
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
 from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiResponse
 
 import re
@@ -30,12 +31,10 @@ from gene2phenotype_app.serializers import (
 )
 
 from gene2phenotype_app.models import (
-    User,
     Attrib,
     LocusGenotypeDisease,
     OntologyTerm,
     G2PStableID,
-    CVMolecularMechanism,
     LGDCrossCuttingModifier,
     LGDVariantGenccConsequence,
     LGDVariantType,
@@ -52,7 +51,10 @@ from gene2phenotype_app.models import (
 
 from .base import BaseAPIView, BaseUpdate, CustomPermissionAPIView, IsSuperUser
 
+from ..catalogues import molecular_mechanisms, variant_types
+from ..renderers import FAST_RENDERER_CLASSES
 from ..utils import get_date_now
+from ..user_context import get_user_context
 
 
 @extend_schema(
@@ -135,83 +137,36 @@ class ListMolecularMechanisms(APIView):
         Return the molecular mechanisms terms by type and subtype (if applicable).
         Returns a dictionary where the key is the type the value is a list.
         """
-        queryset = (
-            CVMolecularMechanism.objects.all()
-            .values("type", "subtype", "value", "description")
-            .order_by("type", "value")
-        )
-        result = {}
-        for mechanism in queryset:
-            mechanismtype = mechanism["type"]
-            subtype = mechanism["subtype"]
-            value = mechanism["value"]
-            description = mechanism["description"]
-
-            if mechanismtype not in result:
-                result[mechanismtype] = {}
-                # evidence has subtypes
-                if mechanismtype == "evidence":
-                    result[mechanismtype][subtype] = [{value: description}]
-                else:
-                    result[mechanismtype] = [{value: description}]
-            else:
-                if mechanismtype == "evidence":
-                    if subtype not in result[mechanismtype]:
-                        result[mechanismtype][subtype] = [{value: description}]
-                    else:
-                        result[mechanismtype][subtype].append({value: description})
-                else:
-                    result[mechanismtype].append({value: description})
-
-        return Response(result)
+        return get_catalogue_response(request, molecular_mechanisms)
 
 
 @extend_schema(exclude=True)
 class VariantTypesList(APIView):
-    def get_queryset(self):
-        group = Attrib.objects.filter(
-            value="variant_type", type__code="ontology_term_group"
-        )
-        return OntologyTerm.objects.filter(group_type=group.first().id)
-
     def get(self, request, *args, **kwargs):
         """
         Return all variant types by group.
         Returns a dictionary where the key is the variant group and the value is a list of terms.
         """
-        queryset = self.get_queryset()
-        list_nmd = []
-        list_splice = []
-        list_regulatory = []
-        list_protein = []
-        list = []
-
-        for obj in queryset:
-            if "NMD" in obj.term:
-                list_nmd.append({"term": obj.term, "accession": obj.accession})
-            elif "splice_" in obj.term:
-                list_splice.append({"term": obj.term, "accession": obj.accession})
-            elif "regulatory" in obj.term or "UTR" in obj.term:
-                list_regulatory.append({"term": obj.term, "accession": obj.accession})
-            elif (
-                "missense" in obj.term
-                or "frame" in obj.term
-                or "start" in obj.term
-                or "stop" in obj.term
-            ):
-                list_protein.append({"term": obj.term, "accession": obj.accession})
-            else:
-                list.append({"term": obj.term, "accession": obj.accession})
+        return get_catalogue_response(request, variant_types)
 
-        return Response(
-            {
-                "NMD_variants": list_nmd,
-                "splice_variants": list_splice,
-                "regulatory_variants": list_regulatory,
-                "protein_changing_variants": list_protein,
-                "other_variants": list,
-            }
-        )
+
+def get_catalogue_response(request, catalogue):
+    """
+    Returns the JSON of the catalogue with its ETag.
+    If the client already has the same version (If-None-Match) the response
+    is 304 Not Modified without content.
+    """
+    content, etag = catalogue.get()
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(content, content_type="application/json")
+
+    response["ETag"] = etag
+    # The client can keep the catalogue but has to check the ETag
+    response["Cache-Control"] = "no-cache"
+
+    return response
 
 
 @extend_schema(
@@ -418,6 +373,7 @@ class VariantTypesList(APIView):
 )
 class LocusGenotypeDiseaseDetail(BaseAPIView):
     serializer_class = LocusGenotypeDiseaseSerializer
+    renderer_classes = FAST_RENDERER_CLASSES
 
     def get_queryset(self):
         stable_id = self.kwargs["stable_id"]
@@ -533,9 +489,7 @@ class LGDUpdateConfidence(BaseUpdate):
         )
 
         # Check if user has permission to update panel
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user": user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_user_context(user).panel_names
         has_common = serializer.check_user_permission(lgd_obj, user_panel_list)
 
         if has_common is False:
@@ -633,9 +587,7 @@ class LGDUpdateMechanism(BaseUpdate):
         serializer = LocusGenotypeDiseaseSerializer(context={"user": user})
 
         # Check if user has permission to edit this entry
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user": user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_user_context(user).panel_names
         has_common = serializer.check_user_permission(lgd_obj, user_panel_list)
 
         if has_common is False:
@@ -752,9 +704,7 @@ class LGDEditVariantConsequences(CustomPermissionAPIView):
 
         # Check if user has permission to update panel
         user = self.request.user
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user": user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_user_context(user).panel_names
         # Calls method check_user_permission() to check the permissions
         # This method requires user info in the context
         has_common = LocusGenotypeDiseaseSerializer(
@@ -859,9 +809,7 @@ class LGDEditVariantConsequences(CustomPermissionAPIView):
 
         # Check if user has permission to update panel
         user = self.request.user
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user": user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_user_context(user).panel_names
         has_common = LocusGenotypeDiseaseSerializer(
             lgd_obj, context={"user": user}
         ).check_user_permission(lgd_obj, user_panel_list)
@@ -955,9 +903,7 @@ class LGDEditCCM(CustomPermissionAPIView):
 
         # Check if user has permission to update panel
         user = self.request.user
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user": user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_user_context(user).panel_names
         has_common = LocusGenotypeDiseaseSerializer(
             lgd, context={"user": user}
         ).check_user_permission(lgd, user_panel_list)
@@ -1041,9 +987,7 @@ class LGDEditCCM(CustomPermissionAPIView):
         )
 
         # Check if user has permission to update panel
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user": user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_user_context(user).panel_names
         has_common = LocusGenotypeDiseaseSerializer(
             lgd_obj, context={"user": user}
         ).check_user_permission(lgd_obj, user_panel_list)
@@ -1149,9 +1093,7 @@ class LGDEditVariantTypes(CustomPermissionAPIView):
         )
 
         # Check if user has permission to update panel
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user": user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_user_context(user).panel_names
         has_common = LocusGenotypeDiseaseSerializer(
             lgd, context={"user": user}
         ).check_user_permission(lgd, user_panel_list)
@@ -1178,7 +1120,7 @@ class LGDEditVariantTypes(CustomPermissionAPIView):
             for var_type in variant_type_data:
                 # The data is created in LGDVariantTypeSerializer
                 serializer_class = LGDVariantTypeSerializer(
-                    data=var_type, context={"lgd": lgd, "user": user_obj}
+                    data=var_type, context={"lgd": lgd, "user": user}
                 )
 
                 if serializer_class.is_valid():
@@ -1234,9 +1176,7 @@ class LGDEditVariantTypes(CustomPermissionAPIView):
 
         # Check if user has permission to update record
         user = request.user
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user": user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_user_context(user).panel_names
         has_common = LocusGenotypeDiseaseSerializer(
             lgd_obj, context={"user": user}
         ).check_user_permission(lgd_obj, user_panel_list)
@@ -1358,9 +1298,7 @@ class LGDEditVariantTypeDescriptions(CustomPermissionAPIView):
         )
 
         # Check if user has permission to update panel
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user": user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_user_context(user).panel_names
         has_common = LocusGenotypeDiseaseSerializer(
             lgd, context={"user": user}
         ).check_user_permission(lgd, user_panel_list)
@@ -1443,9 +1381,7 @@ class LGDEditVariantTypeDescriptions(CustomPermissionAPIView):
         )
 
         # Check if user has permission to update panel
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user": user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_user_context(user).panel_names
         has_common = LocusGenotypeDiseaseSerializer(
             lgd_obj, context={"user": user}
         ).check_user_permission(lgd_obj, user_panel_list)
@@ -1543,8 +1479,7 @@ class LGDEditComment(APIView):
         lgd_panels = lgd_serializer.get_panels(lgd)
         # Example of lgd_panels:
         # [{'name': 'DD', 'description': 'Developmental disorders'}, {'name': 'Eye', 'description': 'Eye disorders'}]
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        user_serializer = UserSerializer(user_obj, context={"user": user})
+        user_serializer = UserSerializer(user, context={"user": user})
 
         if not user_serializer.check_panel_permission(lgd_panels):
             return Response(
@@ -1568,7 +1503,7 @@ class LGDEditComment(APIView):
             # Add each comment from the input list
             for comment in lgd_comments_data:
                 serializer_class = LGDCommentSerializer(
-                    data=comment, context={"lgd": lgd, "user": user_obj}
+                    data=comment, context={"lgd": lgd, "user": user}
                 )
 
                 if serializer_class.is_valid():
@@ -1623,9 +1558,7 @@ class LGDEditComment(APIView):
         )
 
         # Check if user has permission to update panel
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user": user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_user_context(user).panel_names
         has_common = LocusGenotypeDiseaseSerializer(
             lgd_obj, context={"user": user}
         ).check_user_permission(lgd_obj, user_panel_list)
@@ -1680,9 +1613,8 @@ class LGDEditReview(APIView):
         lgd_panels = LocusGenotypeDiseaseSerializer(
             context={"user": request.user}
         ).get_panels(lgd.id)
-        user_obj = get_object_or_404(User, email=request.user, is_active=1)
         if not UserSerializer(
-            user_obj, context={"user": request.user}
+            request.user, context={"user": request.user}
         ).check_panel_permission(lgd_panels):
             return Response(
                 {"error": f"No permission to edit {stable_id}"},
@@ -1759,9 +1691,7 @@ class LocusGenotypeDiseaseDelete(APIView):
         )
 
         # Check if user has permission to update panel
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user": user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_user_context(user).panel_names
         has_common = LocusGenotypeDiseaseSerializer(
             lgd_obj, context={"user": user}
         ).check_user_permission(lgd_obj, user_panel_list)
@@ -29,6 +29,7 @@ from gene2phenotype_app.models import (
 from gene2phenotype_app.serializers import MetaSerializer
 
 from .base import BaseView, CustomPagination
+from ..renderers import FAST_RENDERER_CLASSES
 
 
 @extend_schema(
@@ -98,6 +99,7 @@ class MetaView(APIView):
 @extend_schema(exclude=True)
 class ActivityLogs(BaseView):
     pagination_class = CustomPagination
+    renderer_classes = FAST_RENDERER_CLASSES
     permission_classes = [permissions.IsAuthenticated]
 
     def list(self, request, *args, **kwargs):
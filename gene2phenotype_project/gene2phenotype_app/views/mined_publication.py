@@ -13,7 +13,6 @@ from gene2phenotype_app.serializers import (
 )
 
 from gene2phenotype_app.models import (
-    User,
     LGDMinedPublication,
     MinedPublication,
     LocusGenotypeDisease,
@@ -70,8 +69,7 @@ class LGDEditMinedPublication(BaseUpdate):
         lgd_panels = lgd_serializer.get_panels(lgd)
         # Example of lgd_panels:
         # [{'name': 'DD', 'description': 'Developmental disorders'}, {'name': 'Eye', 'description': 'Eye disorders'}]
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        user_serializer = UserSerializer(user_obj, context={"user": user})
+        user_serializer = UserSerializer(user, context={"user": user})
 
         if not user_serializer.check_panel_permission(lgd_panels):
             return Response(
@@ -14,7 +14,6 @@ import re
 
 from gene2phenotype_app.models import (
     Panel,
-    User,
     LocusGenotypeDisease,
     LGDVariantType,
     LGDVariantGenccConsequence,
@@ -32,12 +31,13 @@ from gene2phenotype_app.serializers import (
     PanelCreateSerializer,
     PanelDetailSerializer,
     LGDPanelSerializer,
-    UserSerializer,
 )
 
 from .base import BaseAPIView, IsSuperUser, CustomPermissionAPIView
 
+from ..renderers import FAST_RENDERER_CLASSES
 from ..utils import get_date_now
+from ..user_context import get_user_context
 
 
 @extend_schema(exclude=True)
@@ -305,6 +305,7 @@ class PanelDetail(BaseAPIView):
 @extend_schema(exclude=True)
 class PanelRecordsSummary(BaseAPIView):
     serializer_class = PanelDetailSerializer
+    renderer_classes = FAST_RENDERER_CLASSES
 
     def get(self, request, name, *args, **kwargs):
         """
@@ -383,10 +384,8 @@ class LGDEditPanel(CustomPermissionAPIView):
         panel_obj = get_object_or_404(Panel, name=panel_name_input)
 
         # Check if user can update panel
-        user_obj = get_object_or_404(User, email=user)
-        serializer = UserSerializer(user_obj, context={"user": user})
         user_panel_list_lower = [
-            panel.lower() for panel in serializer.panels_names(user_obj)
+            panel.lower() for panel in get_user_context(user).panel_names
         ]
 
         if panel_name_input.lower() not in user_panel_list_lower:
@@ -439,10 +438,8 @@ class LGDEditPanel(CustomPermissionAPIView):
 
         # Check if user can update panel
         user = self.request.user
-        user_obj = get_object_or_404(User, email=user)
-        serializer = UserSerializer(user_obj, context={"user": user})
         user_panel_list_lower = [
-            panel.lower() for panel in serializer.panels_names(user_obj)
+            panel.lower() for panel in get_user_context(user).panel_names
         ]
 
         if panel.lower() not in user_panel_list_lower:
@@ -528,21 +525,15 @@ def PanelDownload(request, name):
     Raises: Invalid panel
     """
 
-    user_email = request.user
+    user_context = get_user_context(request.user)
     panel = None
 
-    # Get user
-    try:
-        user_obj = User.objects.get(email=user_email)
-    except User.DoesNotExist:
-        user_obj = None
-
     all_panels = False  # By default, we don't download all panels
     only_visible_panels = True
     # If name = "all" download all panels taking into account authentication
     if name.lower() == "all":
         all_panels = True
-        if user_obj and user_obj.is_authenticated:
+        if user_context.is_authenticated:
             # Authenticated users can access non-visible panels
             only_visible_panels = False
     else:
@@ -702,7 +693,7 @@ def PanelDownload(request, name):
     # Preload panels
     lgd_panel_data = {}
     # For authenticated users pre-load all available panels
-    if user_obj and user_obj.is_authenticated:
+    if user_context.is_authenticated:
         filter_panels = Q(is_deleted=0)
     else:
         # Non authenticated users only get visible panels
@@ -772,7 +763,7 @@ def PanelDownload(request, name):
         panel
         and (
             panel.is_visible == 1
-            or (user_obj and user_obj.is_authenticated and panel.is_visible == 0)
+            or (user_context.is_authenticated and panel.is_visible == 0)
         )
     ) or all_panels:
         # Download specific panel
@@ -796,10 +787,12 @@ def PanelDownload(request, name):
                     lgdpanel__panel__name="Demo"
                 )
 
-        # Download entries
+        # Download entries sorted by G2P ID
+        # The order does not depend on the indexes used by the database
         queryset_list = (
             LocusGenotypeDisease.objects.filter(filter_query)
             .distinct()
+            .order_by("stable_id__stable_id")
             .select_related(
                 "stable_id",
                 "locus",
@@ -14,7 +14,6 @@ from gene2phenotype_app.serializers import (
     LGDPhenotypeListSerializer,
     LGDPhenotypeSummaryListSerializer,
     LocusGenotypeDiseaseSerializer,
-    UserSerializer,
 )
 
 from gene2phenotype_app.models import (
@@ -22,12 +21,12 @@ from gene2phenotype_app.models import (
     LGDPhenotype,
     LocusGenotypeDisease,
     LGDPhenotypeSummary,
-    User,
 )
 
 from .base import BaseAdd, CustomPermissionAPIView, IsSuperUser
 
 from ..utils import validate_phenotype, get_date_now
+from ..user_context import get_user_context
 
 
 @extend_schema(exclude=True)
@@ -160,9 +159,7 @@ class LGDEditPhenotypes(CustomPermissionAPIView):
         )
 
         # Check if user has permission to update record
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user": user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_user_context(user).panel_names
         has_common = LocusGenotypeDiseaseSerializer(
             lgd, context={"user": user}
         ).check_user_permission(lgd, user_panel_list)
@@ -298,9 +295,7 @@ class LGDEditPhenotypes(CustomPermissionAPIView):
         )
 
         # Check if user has permission to update record
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user": user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_user_context(user).panel_names
         has_common = LocusGenotypeDiseaseSerializer(
             lgd_obj, context={"user": user}
         ).check_user_permission(lgd_obj, user_panel_list)
@@ -400,9 +395,7 @@ class LGDEditPhenotypeSummary(CustomPermissionAPIView):
         )
 
         # Check if user has permission to update record
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user": user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_user_context(user).panel_names
         has_common = LocusGenotypeDiseaseSerializer(
             lgd, context={"user": user}
         ).check_user_permission(lgd, user_panel_list)
@@ -484,9 +477,7 @@ class LGDEditPhenotypeSummary(CustomPermissionAPIView):
         )
 
         # Check if user has permission to update record
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user": user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_user_context(user).panel_names
         has_common = LocusGenotypeDiseaseSerializer(
             lgd_obj, context={"user": user}
         ).check_user_permission(lgd_obj, user_panel_list)
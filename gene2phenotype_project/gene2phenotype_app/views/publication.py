@@ -10,31 +10,22 @@ from gene2phenotype_app.serializers import (
     PublicationSerializer,
     LGDPublicationSerializer,
     LGDPublicationListSerializer,
-    LGDPhenotypeSerializer,
-    LGDVariantTypeSerializer,
-    LGDVariantTypeDescriptionSerializer,
     LocusGenotypeDiseaseSerializer,
     LGDPhenotypeSummarySerializer,
-    UserSerializer,
     LGDMinedPublicationSerializer,
+    LGDBulkEdit,
 )
 
 from gene2phenotype_app.models import (
     Publication,
     LocusGenotypeDisease,
     LGDPublication,
-    LGDPhenotype,
-    LGDPhenotypeSummary,
-    LGDVariantType,
-    LGDVariantTypeDescription,
-    LGDVariantTypeComment,
-    LGDMolecularMechanismEvidence,
-    User,
 )
 
 from .base import BaseAdd, BaseUpdate, IsSuperUser
 
 from ..utils import get_publication, get_authors, clean_title, get_date_now
+from ..user_context import get_user_context
 
 
 @extend_schema(exclude=True)
@@ -255,53 +246,27 @@ class LGDEditPublications(BaseUpdate):
                 "mechanism_evidence", None
             )  # optional
 
-            for publication in publications_data:
-                serializer_class = LGDPublicationSerializer(
-                    data=publication, context={"lgd": lgd, "user": user}
+            # The publications, phenotypes, variant types and variant descriptions
+            # are added in bulk
+            bulk_edit = LGDBulkEdit(lgd, user)
+            try:
+                bulk_edit.add_publications(publications_data)
+                # Add extra data linked to the publication - phenotypes
+                bulk_edit.add_phenotypes(phenotypes_data)
+                # Add extra data linked to the publication - variant types
+                bulk_edit.add_variant_types(variant_types_data)
+                # Add extra data linked to the publication - variant descriptions (HGVS)
+                bulk_edit.add_variant_descriptions(variant_descriptions_data)
+            except serializers.ValidationError as e:
+                error_message = e.detail.get(
+                    "error", f"Could not add publications for ID '{stable_id}'"
                 )
+                # The error is returned as a response, the data already added has to be rolled back
+                transaction.set_rollback(True)
+                return self.handle_update_exception(e, error_message)
 
-                # Insert new publication
-                if serializer_class.is_valid():
-                    serializer_class.save()
-                else:
-                    response = Response(
-                        {"error": serializer_class.errors},
-                        status=status.HTTP_400_BAD_REQUEST,
-                    )
-
-            # Add extra data linked to the publication - phenotypes
-            # Expected structure:
-            #   { "phenotypes": [{ "accession": "HP:0003974", "publication": 1 }] }
+            # Insert the phenotype summary
             for phenotype in phenotypes_data:
-                hpo_terms = phenotype["hpo_terms"]
-                for hpo in hpo_terms:
-                    phenotype_data = {
-                        "accession": hpo["accession"],
-                        "publication": phenotype["pmid"],
-                    }
-                    try:
-                        lgd_phenotype_serializer = LGDPhenotypeSerializer(
-                            data=phenotype_data, context={"lgd": lgd}
-                        )
-                        # Validate the input data
-                        if lgd_phenotype_serializer.is_valid():
-                            # save() is going to call create()
-                            lgd_phenotype_serializer.save()
-                        else:
-                            response = Response(
-                                {"error": lgd_phenotype_serializer.errors},
-                                status=status.HTTP_400_BAD_REQUEST,
-                            )
-                    except Exception as e:
-                        accession = phenotype_data["accession"]
-                        return Response(
-                            {
-                                "error": f"Could not insert phenotype '{accession}' for ID '{stable_id}'"
-                            },
-                            status=status.HTTP_400_BAD_REQUEST,
-                        )
-
-                # Insert the phenotype summary
                 if "summary" in phenotype and phenotype["summary"] != "":
                     try:
                         lgd_phenotype_summary_serializer = (
@@ -322,6 +287,7 @@ class LGDEditPublications(BaseUpdate):
                             # save() is going to call create()
                             lgd_phenotype_summary_serializer.save()
                     except Exception as e:
+                        transaction.set_rollback(True)
                         return Response(
                             {
                                 "error": f"Could not insert phenotype summary for PMID '{phenotype['pmid']}'"
@@ -329,18 +295,6 @@ class LGDEditPublications(BaseUpdate):
                             status=status.HTTP_400_BAD_REQUEST,
                         )
 
-            # Add extra data linked to the publication - variant types
-            for variant_type in variant_types_data:
-                LGDVariantTypeSerializer(context={"lgd": lgd, "user": user}).create(
-                    variant_type
-                )
-
-            # Add extra data linked to the publication - variant descriptions (HGVS)
-            for variant_type_desc in variant_descriptions_data:
-                LGDVariantTypeDescriptionSerializer(context={"lgd": lgd}).create(
-                    variant_type_desc
-                )
-
             # Only mechanism "undetermined" can be updated - the check is done in the LocusGenotypeDiseaseSerializer
             # If mechanism has to be updated, call method update_mechanism() and send new mechanism value
             # plus the synopsis and the new evidence (if applicable)
@@ -357,6 +311,7 @@ class LGDEditPublications(BaseUpdate):
                     and "name" in mechanism_data
                     and mechanism_data["name"] != ""
                 ):
+                    transaction.set_rollback(True)
                     return self.handle_no_update("molecular mechanism", stable_id)
 
                 # If the mechanism support = "evidence" then evidence data has to
@@ -385,8 +340,10 @@ class LGDEditPublications(BaseUpdate):
                     lgd_serializer.update_mechanism(lgd, mechanism_data_input)
                 except serializers.ValidationError as e:
                     error_message = e.detail["error"]
+                    transaction.set_rollback(True)
                     return self.handle_update_exception(e, error_message)
                 except Exception as e:
+                    transaction.set_rollback(True)
                     return self.handle_update_exception(
                         e, "Error while updating molecular mechanism"
                     )
@@ -401,8 +358,10 @@ class LGDEditPublications(BaseUpdate):
                     )
                 except serializers.ValidationError as e:
                     error_message = e.detail["error"]
+                    transaction.set_rollback(True)
                     return self.handle_update_exception(e, error_message)
                 except Exception as e:
+                    transaction.set_rollback(True)
                     return self.handle_update_exception(
                         e, "Error while updating molecular mechanism evidence"
                     )
@@ -414,6 +373,7 @@ class LGDEditPublications(BaseUpdate):
                     lgd, publications_data
                 )
             except Exception as e:
+                transaction.set_rollback(True)
                 return self.handle_update_exception(
                     e, "Error while updating mined publications"
                 )
@@ -458,9 +418,7 @@ class LGDEditPublications(BaseUpdate):
         )
 
         # Check if user has permission to update record
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user": user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_user_context(user).panel_names
         has_common = LocusGenotypeDiseaseSerializer(
             lgd_obj, context={"user": user}
         ).check_user_permission(lgd_obj, user_panel_list)
@@ -503,50 +461,9 @@ class LGDEditPublications(BaseUpdate):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Delete publication from other tables
-        # lgd_phenotype - different phenotypes can be linked to the same publication
-        for phenotype in LGDPhenotype.objects.filter(
-            lgd=lgd_obj, publication=lgd_publication_obj.publication, is_deleted=0
-        ):
-            phenotype.is_deleted = 1
-            phenotype.save()
-
-        # lgd_phenotype_summary - the phenotype summary is directly associated with the LGD record
-        # A LGD record should only have one phenotype summary but to make sure we delete everything correctly
-        # we'll run the filter to catch all objects
-        for phenotype_summary in LGDPhenotypeSummary.objects.filter(
-            lgd=lgd_obj, publication=lgd_publication_obj.publication, is_deleted=0
-        ):
-            phenotype_summary.is_deleted = 1
-            phenotype_summary.save()
-
-        # lgd_variant_type - different variant types can be linked to the same publication
-        for lgd_variant_type in LGDVariantType.objects.filter(
-            lgd=lgd_obj, publication=lgd_publication_obj.publication, is_deleted=0
-        ):
-            # Each variant type can be linked to a LGDVariantTypeComment
-            # Delete these objects too
-            for lgd_var_comment in LGDVariantTypeComment.objects.filter(
-                lgd_variant_type=lgd_variant_type, is_deleted=0
-            ):
-                lgd_var_comment.is_deleted = 1
-                lgd_var_comment.save()
-            lgd_variant_type.is_deleted = 1
-            lgd_variant_type.save()
-
-        # lgd_variant_type_description - different descriptions can be linked to the same publication
-        for lgd_variant_description in LGDVariantTypeDescription.objects.filter(
-            lgd=lgd_obj, publication=lgd_publication_obj.publication, is_deleted=0
-        ):
-            lgd_variant_description.is_deleted = 1
-            lgd_variant_description.save()
-
-        # Delete the mechanism evidence associated with publication that is going to be deleted
-        for lgd_mechanism_evidence in LGDMolecularMechanismEvidence.objects.filter(
-            lgd=lgd_obj, publication=lgd_publication_obj.publication, is_deleted=0
-        ):
-            lgd_mechanism_evidence.is_deleted = 1
-            lgd_mechanism_evidence.save()
+        # Delete publication from other tables: phenotypes, phenotype summary,
+        # variant types (+ comments), variant descriptions and mechanism evidence
+        LGDBulkEdit(lgd_obj, user).delete_publication(publication_obj)
 
         # Update the date of the last update of the record
         lgd_obj.date_review = get_date_now()
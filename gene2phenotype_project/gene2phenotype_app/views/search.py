@@ -1,5 +1,8 @@
 from rest_framework.response import Response
-from django.db.models import Q, F
+from django.db.models import Q
+from collections import defaultdict
+from typing import NamedTuple
+import datetime
 import textwrap, re
 from drf_spectacular.utils import (
     extend_schema,
@@ -23,6 +26,114 @@ from gene2phenotype_app.models import (
 from .base import BaseView, CustomPagination
 
 
+class LGDSummary(NamedTuple):
+    """
+    Summary row of a LGMDE record returned by the search.
+    """
+
+    stable_id: str
+    gene: str
+    genotype: str
+    disease: str
+    mechanism: str
+    panels: list[str]
+    confidence: str
+
+
+class DraftSummary(NamedTuple):
+    """
+    Summary row of a draft record (CurationData) returned by the search.
+    """
+
+    stable_id: str
+    gene: str
+    date_created: datetime.datetime
+    date_last_update: datetime.datetime
+    curator_first: str
+    curator_last_name: str
+    curator_email: str
+    json_data_info: dict
+
+
+def get_lgd_summaries(queryset, user) -> list[LGDSummary]:
+    """
+    Build the summary rows of the LGMDE records in the queryset.
+    Only fetches the columns included in the summary: one query for the records
+    and one query for the panels of all the records.
+    Records without panels (or only non-visible panels for anonymous users) are not returned.
+
+    Args:
+        queryset: LocusGenotypeDisease queryset
+        user: user making the request
+
+    Returns:
+        list[LGDSummary]: summary rows in the same order as the queryset
+    """
+    rows = list(
+        queryset.values_list(
+            "id",
+            "stable_id__stable_id",
+            "locus__name",
+            "genotype__value",
+            "disease__name",
+            "mechanism__value",
+            "confidence__value",
+        )
+    )
+
+    lgdpanel_select = LGDPanel.objects.filter(
+        lgd_id__in=[row[0] for row in rows], is_deleted=0
+    )
+    # If the user is not logged in, only show visible panels
+    if not user.is_authenticated:
+        lgdpanel_select = lgdpanel_select.filter(panel__is_visible=1)
+
+    lgd_panels = defaultdict(list)
+    for lgd_id, panel_name in lgdpanel_select.values_list("lgd_id", "panel__name"):
+        lgd_panels[lgd_id].append(panel_name)
+
+    return [
+        LGDSummary(
+            stable_id, gene, genotype, disease, mechanism, lgd_panels[lgd_id], confidence
+        )
+        for lgd_id, stable_id, gene, genotype, disease, mechanism, confidence in rows
+        if lgd_id in lgd_panels
+    ]
+
+
+def get_draft_summaries(queryset) -> list[DraftSummary]:
+    """
+    Build the summary rows of the draft records in the queryset with a single query.
+    Returns the curator name and email so the curator can see who is curating the record.
+
+    Args:
+        queryset: CurationData queryset
+
+    Returns:
+        list[DraftSummary]: summary rows in the same order as the queryset
+    """
+    rows = queryset.values_list(
+        "stable_id__stable_id",
+        "gene_symbol",
+        "date_created",
+        "date_last_update",
+        "user__first_name",
+        "user__last_name",
+        "user__email",
+        "json_data",
+    )
+
+    curation_serializer = CurationDataSerializer()
+
+    return [
+        DraftSummary(
+            *row[:-1],
+            json_data_info=curation_serializer.get_entry_info_from_json_data(row[-1]),
+        )
+        for row in rows
+    ]
+
+
 @extend_schema(
     tags=["Search records"],
     description=textwrap.dedent("""
@@ -359,52 +470,16 @@ class SearchView(BaseView):
                 .distinct()
             )
 
-            # to extend the queryset being annotated when it is draft,
-            # want to return username so curator can see who is curating
-            # adding the curator email, incase of the notification.
-            queryset = queryset.annotate(
-                first_name=F("user_id__first_name"),
-                last_name=F("user_id__last_name"),
-                user_email=F("user__email"),
-            )
-
-            for obj in queryset:
-                obj.json_data_info = (
-                    CurationDataSerializer.get_entry_info_from_json_data(
-                        self, obj.json_data
-                    )
-                )
-
             if not queryset.exists():
                 self.handle_no_permission("draft", search_query)
 
         else:
             self.handle_no_permission("Search type is not valid", None)
 
-        new_queryset = []
-        if queryset.exists():
-            if search_type != "draft":
-                for lgd in queryset:
-                    # If the user is not logged in, only show visible panels
-                    if user.is_authenticated is False:
-                        lgdpanel_select = LGDPanel.objects.filter(
-                            Q(lgd=lgd, panel__is_visible=1, is_deleted=0)
-                        )
-                    else:
-                        lgdpanel_select = LGDPanel.objects.filter(lgd=lgd, is_deleted=0)
-
-                    lgd_panels = []
-                    for lp in lgdpanel_select:
-                        lgd_panels.append(lp.panel.name)
-
-                    # Add new property to LGD object
-                    lgd.panels = lgd_panels
-                    if lgd_panels:
-                        new_queryset.append(lgd)
-            else:
-                return queryset
+        if search_type == "draft":
+            return get_draft_summaries(queryset)
 
-        return new_queryset
+        return get_lgd_summaries(queryset, user)
 
     def list(self, request, *args, **kwargs):
         """
@@ -453,29 +528,29 @@ class SearchView(BaseView):
         if issubclass(serializer, LocusGenotypeDiseaseSerializer):
             for lgd in queryset:
                 data = {
-                    "stable_id": lgd.stable_id.stable_id,
-                    "gene": lgd.locus.name,
-                    "genotype": lgd.genotype.value,
-                    "disease": lgd.disease.name,
-                    "mechanism": lgd.mechanism.value,
+                    "stable_id": lgd.stable_id,
+                    "gene": lgd.gene,
+                    "genotype": lgd.genotype,
+                    "disease": lgd.disease,
+                    "mechanism": lgd.mechanism,
                     "panel": lgd.panels,
-                    "confidence": lgd.confidence.value,
+                    "confidence": lgd.confidence,
                 }
                 list_output.append(data)
         else:
             for c_data in queryset:
                 data = {
-                    "stable_id": c_data.stable_id.stable_id,
-                    "gene": c_data.gene_symbol,
+                    "stable_id": c_data.stable_id,
+                    "gene": c_data.gene,
                     "date_created": c_data.date_created,
                     "date_last_updated": c_data.date_last_update,
-                    "curator_first": c_data.first_name,
-                    "curator_last_name": c_data.last_name,
+                    "curator_first": c_data.curator_first,
+                    "curator_last_name": c_data.curator_last_name,
                     "genotype": c_data.json_data_info["genotype"],
                     "disease_name": c_data.json_data_info["disease"],
                     "panels": c_data.json_data_info["panel"],
                     "confidence": c_data.json_data_info["confidence"],
-                    "curator_email": c_data.user_email,
+                    "curator_email": c_data.curator_email,
                 }
                 list_output.append(data)
 
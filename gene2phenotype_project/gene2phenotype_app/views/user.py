@@ -3,7 +3,7 @@ from rest_framework import generics, permissions, status
 from rest_framework.exceptions import ParseError, AuthenticationFailed
 from rest_framework_simplejwt.views import TokenRefreshView
 from rest_framework_simplejwt.serializers import TokenRefreshSerializer
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.tokens import RefreshToken, UntypedToken
 from drf_spectacular.utils import extend_schema
 from datetime import timedelta, datetime
 from django.conf import settings
@@ -12,7 +12,10 @@ from django.db.models import F
 
 from .base import BaseView
 
-from gene2phenotype_app.authentication import CustomAuthentication
+from gene2phenotype_app.authentication import (
+    CustomAuthentication,
+    add_blacklisted_token,
+)
 
 from gene2phenotype_app.serializers import (
     UserSerializer,
@@ -343,6 +346,13 @@ class CustomTokenRefreshView(TokenRefreshView):
         # instead of request data, give it the data created
         serializer = TokenRefreshSerializer(data=data)
         serializer.is_valid(raise_exception=True)
+
+        # The old refresh token was blacklisted by the serializer
+        if (
+            settings.SIMPLE_JWT["ROTATE_REFRESH_TOKENS"]
+            and settings.SIMPLE_JWT["BLACKLIST_AFTER_ROTATION"]
+        ):
+            add_blacklisted_token(UntypedToken(data["refresh"]))
         # the validated results sent from the TokenRefreshSerializer
         refresh_token = serializer.validated_data.get("refresh")
         access_token = serializer.validated_data.get("access")
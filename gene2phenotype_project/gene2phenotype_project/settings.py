@@ -97,6 +97,13 @@ MIDDLEWARE = [
     "simple_history.middleware.HistoryRequestMiddleware",
 ]
 
+# Count the new and reused database connections of each endpoint
+DB_CONNECTION_METRICS = config.getboolean(
+    "settings", "DB_CONNECTION_METRICS", fallback=False
+)
+if DB_CONNECTION_METRICS:
+    MIDDLEWARE.append("gene2phenotype_app.middleware.DBConnectionMetricsMiddleware")
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
@@ -106,6 +113,13 @@ REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
+# Use the orjson renderer in all views (see gene2phenotype_app/renderers.py)
+if config.getboolean("settings", "fast_json_renderer", fallback=False):
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = (
+        "gene2phenotype_app.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    )
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Gene2Phenotype (G2P)",
     "DESCRIPTION": (
@@ -156,6 +170,48 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,
 }
 
+# Authentication caches (see gene2phenotype_app/authentication.py), 0 disables the cache
+# Number of seconds between two reads of the blacklisted refresh tokens
+AUTH_BLACKLIST_CACHE_SECONDS = 0 if "test" in sys.argv else 30
+# Number of seconds an authenticated user is cached
+AUTH_USER_CACHE_SECONDS = 0 if "test" in sys.argv else 30
+
+# Cache shared by all the processes, it keeps the version of the in-memory caches
+# (see gene2phenotype_app/local_cache.py). The default cache is the database table
+# 'g2p_cache' (python manage.py createcachetable), the backend can be set in the
+# config section [cache]
+if "test" in sys.argv or "test_coverage" in sys.argv:
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": config.get(
+                "cache",
+                "backend",
+                fallback="django.core.cache.backends.db.DatabaseCache",
+            ),
+            "LOCATION": config.get("cache", "location", fallback="g2p_cache"),
+        }
+    }
+
+# Number of seconds between two reads of the version of the in-memory caches in the
+# shared cache (see gene2phenotype_app/local_cache.py)
+LOCAL_CACHE_VERSION_CHECK_SECONDS = 0 if "test" in sys.argv else 5
+
+# Number of seconds the gene names (symbols, synonyms, HGNC IDs) are cached
+# (see gene2phenotype_app/gene_resolver.py), 0 disables the cache
+GENE_RESOLVER_CACHE_SECONDS = 0 if "test" in sys.argv else 600
+
+# Number of seconds the catalogues of terms (molecular mechanisms, variant types)
+# are cached (see gene2phenotype_app/catalogues.py), 0 disables the cache
+CATALOGUE_CACHE_SECONDS = 0 if "test" in sys.argv else 3600
+
+# Number of seconds after which a publish job that did not finish is set to 'failed'
+# (see PublishJob.fail_stale_jobs), must be longer than the time to publish a record
+PUBLISH_JOB_TIMEOUT_SECONDS = 1800
+
 CORS_ALLOWED_ORIGINS = json.loads(config.get("settings", "CORS_ALLOWED_ORIGINS"))
 CSRF_TRUSTED_ORIGINS = json.loads(config.get("settings", "CSRF_TRUSTED_ORIGINS"))
 CORS_ALLOWED_CREDENTIALS = True
@@ -200,21 +256,75 @@ WSGI_APPLICATION = "gene2phenotype_project.wsgi.application"
 # For testing
 if "test" in sys.argv or "test_coverage" in sys.argv:
     DATABASES = {
-        "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+        "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+        # Only used by the tests of the replica routing
+        "replica": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
     }
 
 else:
+    # External connection pool (e.g. ProxySQL): connect to the pool instead of the
+    # database server, the pool keeps the connections open
+    DB_EXTERNAL_POOL = config.has_option("database", "pool_host")
+
     DATABASES = {
         "default": {
             "ENGINE": "django.db.backends.mysql",
             "NAME": config.get("database", "name"),
             "USER": config.get("database", "user"),
             "PASSWORD": config.get("database", "password"),
-            "HOST": config.get("database", "host"),
-            "PORT": config.get("database", "port"),
+            "HOST": config.get(
+                "database", "pool_host" if DB_EXTERNAL_POOL else "host"
+            ),
+            "PORT": config.get(
+                "database",
+                "pool_port" if DB_EXTERNAL_POOL else "port",
+                fallback=config.get("database", "port"),
+            ),
+            # Persistent connections: number of seconds a connection is reused
+            # between requests (0 closes the connection at the end of each request)
+            "CONN_MAX_AGE": (
+                0
+                if DB_EXTERNAL_POOL
+                else config.getint("database", "conn_max_age", fallback=60)
+            ),
+            # Check that a persistent connection still works before reusing it
+            "CONN_HEALTH_CHECKS": config.getboolean(
+                "database", "conn_health_checks", fallback=True
+            ),
         }
     }
 
+    # Read replica used by the public GET requests (optional)
+    if config.has_section("replica"):
+        DATABASES["replica"] = {
+            **DATABASES["default"],
+            "HOST": config.get("replica", "host"),
+            "PORT": config.get("replica", "port"),
+            "USER": config.get("replica", "user", fallback=DATABASES["default"]["USER"]),
+            "PASSWORD": config.get(
+                "replica", "password", fallback=DATABASES["default"]["PASSWORD"]
+            ),
+        }
+
+# Read replica routing (see gene2phenotype_app/db_router.py)
+REPLICA_DATABASE = "replica"
+# Enabled if the replica is configured, the tests enable it with override_settings
+REPLICA_ROUTING = REPLICA_DATABASE in DATABASES and not (
+    "test" in sys.argv or "test_coverage" in sys.argv
+)
+# Number of seconds the requests of a user use the default database after a write
+REPLICA_PIN_SECONDS = config.getint("replica", "pin_seconds", fallback=30)
+# Maximum replica lag (seconds), the default database is used above this value
+REPLICA_MAX_LAG = config.getint("replica", "max_lag", fallback=10)
+# Number of seconds between two checks of the replica lag
+REPLICA_LAG_CHECK_INTERVAL = 5
+# Endpoints (url names) that read from the replica also for authenticated users
+REPLICA_EXPORT_ENDPOINTS = ["panel_download"]
+
+if REPLICA_DATABASE in DATABASES:
+    DATABASE_ROUTERS = ["gene2phenotype_app.db_router.ReplicaRouter"]
+    MIDDLEWARE.append("gene2phenotype_app.middleware.ReplicaRoutingMiddleware")
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 